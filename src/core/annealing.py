@@ -0,0 +1,326 @@
+import logging
+import math
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.scheduler import ExamScheduler
+
+logger = logging.getLogger(__name__)
+
+SAME_DAY_WEIGHT = 10.0
+LEVEL_ADJACENT_DAY_WEIGHT = 3.0
+ROOM_WEIGHT = 1.0
+
+DEFAULT_MAX_MOVES = 50000
+# Daha uzun Kempe zincirleri nadiren kabul edilir, maliyet farkı ise zincir boyunca büyür
+KEMPE_MAX_CHAIN = 8
+COOLING_RATE = 0.9995
+MIN_TEMPERATURE = 0.01
+
+
+class ScheduleAnnealer:
+    # Tam (uygun) bir çözüm üzerinde tavlama ile yerel arama.
+    # Hareketler: tek dersi taşıma, iki dersi takas, Kempe zinciri takası.
+    # Maliyet farkları ders × gün yük tablosundan artımlı hesaplanır: yük[x][g], g gününe
+    # yerleşmiş derslerin x ile ortak öğrenci sayılarının toplamıdır (x'in o güne gelince
+    # oluşturacağı aynı gün sınav çifti sayısı). Bir hareket sadece taşınan dersin çakışma
+    # komşularını günceller. Önce uygunluk denetlenir, tablolara sadece uygun hareketlerde
+    # dokunulur; reddedilen hareket ters uygulanır.
+
+    def __init__(self, scheduler: 'ExamScheduler', seed: Optional[int] = None,
+                 max_moves: int = DEFAULT_MAX_MOVES):
+        self.scheduler = scheduler
+        self.rng = random.Random(seed)
+        self.max_moves = max_moves
+
+        first_day = min((d.toordinal() for d in scheduler.slot_to_date.values()), default=0)
+        self.slot_days: Dict[int, int] = {
+            slot_idx: slot_date.toordinal() - first_day
+            for slot_idx, slot_date in scheduler.slot_to_date.items()
+        }
+        # Komşu gün erişimlerinde sınır denetimi gerekmesin diye iki uçta boş gün bırakılır
+        self.day_count = max(self.slot_days.values(), default=0) + 2
+        self.slot_ids: List[int] = [slot_idx for _, slot_idx in scheduler.time_slots]
+        # Hareketler dersleri sadece taşır; yerleşik ders kümesi tavlama boyunca değişmez
+        self.course_ids: List[int] = []
+        self.classrooms_by_id: Dict[int, Dict] = {c['id']: c for c in scheduler.classrooms}
+
+        self.course_day_load: Dict[int, List[int]] = {}
+        self.level_day_rows: Dict[str, List[int]] = {}
+        self.cost = 0.0
+
+        self.moves_tried = 0
+        self.moves_accepted = 0
+        self.initial_cost = 0.0
+        self.best_cost = 0.0
+
+    def evaluate(self) -> Dict[str, float]:
+        scheduler = self.scheduler
+        same_day_pairs = 0
+        for student_id, course_ids in scheduler.student_courses.items():
+            per_day: Dict[int, int] = defaultdict(int)
+            for course_id in course_ids:
+                assignment = scheduler.course_assignments.get(course_id)
+                if assignment:
+                    per_day[self.slot_days[assignment['slot_idx']]] += 1
+            same_day_pairs += sum(n * (n - 1) // 2 for n in per_day.values())
+
+        level_days: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        for course_id, assignment in scheduler.course_assignments.items():
+            class_level = scheduler.course_class_levels.get(course_id)
+            if class_level:
+                level_days[class_level][self.slot_days[assignment['slot_idx']]] += 1
+        level_adjacent = sum(
+            count * days.get(day + 1, 0)
+            for days in level_days.values() for day, count in list(days.items())
+        )
+
+        rooms_used = sum(len(a['classroom_ids']) for a in scheduler.course_assignments.values())
+
+        return {
+            'ayni_gun_sinav_cifti': same_day_pairs,
+            'ardisik_gun_seviye_cifti': level_adjacent,
+            'derslik_atamasi': rooms_used,
+            'toplam': (SAME_DAY_WEIGHT * same_day_pairs
+                       + LEVEL_ADJACENT_DAY_WEIGHT * level_adjacent
+                       + ROOM_WEIGHT * rooms_used),
+        }
+
+    def run(self) -> float:
+        scheduler = self.scheduler
+        if len(scheduler.course_assignments) < 2 or len(self.slot_ids) < 2:
+            return 0.0
+
+        # Hareket başına birkaç yerleştir/geri al yapılır, tek bir uygunluk sorgusu yapılır.
+        # Hareket denemelerinin redleri yerleştirme reddi sayılmaz
+        with scheduler._untracked_slot_masks(), scheduler.instrumentation.probing():
+            return self._anneal()
+
+    def _anneal(self) -> float:
+        scheduler = self.scheduler
+
+        self._build_counters()
+        self.course_ids = list(scheduler.course_assignments)
+        self.initial_cost = self.cost
+        self.best_cost = self.cost
+        # Yerleştirme her seferinde yeni atama kaydı oluşturur, kayıtlar yerinde değişmez:
+        # en iyi çözümün sığ kopyası yeterlidir
+        best_snapshot = dict(scheduler.course_assignments)
+
+        temperature = self._initial_temperature()
+        started = time.perf_counter()
+        moves = (self._move_one, self._swap_two, self._kempe_swap)
+
+        while self.moves_tried < self.max_moves and not scheduler._should_stop():
+            self.moves_tried += 1
+            move = moves[self.rng.randrange(len(moves))]
+            if move(temperature):
+                self.moves_accepted += 1
+                if self.cost < self.best_cost - 1e-9:
+                    self.best_cost = self.cost
+                    best_snapshot = dict(scheduler.course_assignments)
+
+            temperature = max(MIN_TEMPERATURE, temperature * COOLING_RATE)
+
+        if self.cost > self.best_cost + 1e-9:
+            scheduler._restore_assignments(best_snapshot)
+
+        elapsed = time.perf_counter() - started
+        rate = self.moves_tried / elapsed if elapsed > 0 else 0
+        logger.info(
+            f"  🔥 Tavlama: maliyet {self.initial_cost:.0f} → {self.best_cost:.0f}, "
+            f"{self.moves_accepted}/{self.moves_tried} hareket kabul edildi ({rate:.0f} hareket/sn)"
+        )
+        return self.initial_cost - self.best_cost
+
+    def _build_counters(self):
+        scheduler = self.scheduler
+        self.course_day_load = {
+            course_id: [0] * (self.day_count + 1) for course_id in scheduler.conflict_graph.nodes
+        }
+        self.level_day_rows = {
+            class_level: [0] * (self.day_count + 1)
+            for class_level in set(scheduler.course_class_levels.values()) if class_level
+        }
+        self.cost = 0.0
+
+        for course_id, assignment in list(scheduler.course_assignments.items()):
+            self.cost += self._count_add(course_id, assignment['slot_idx'])
+            self.cost += ROOM_WEIGHT * len(assignment['classroom_ids'])
+
+    def _initial_temperature(self) -> float:
+        # Ortalama komşu maliyetinin kabaca yarısı ile başlanır
+        return max(1.0, self.cost / max(1, len(self.scheduler.course_assignments)) / 2)
+
+    def _count_add(self, course_id: int, slot_idx: int) -> float:
+        day = self.slot_days[slot_idx] + 1
+        load = self.course_day_load
+        same_day = load[course_id][day]
+
+        for neighbor, shared in self.scheduler.conflict_graph.neighbors(course_id).items():
+            load[neighbor][day] += shared
+
+        delta = SAME_DAY_WEIGHT * same_day
+        class_level = self.scheduler.course_class_levels.get(course_id)
+        if class_level:
+            days = self.level_day_rows[class_level]
+            delta += LEVEL_ADJACENT_DAY_WEIGHT * (days[day - 1] + days[day + 1])
+            days[day] += 1
+
+        return delta
+
+    def _count_remove(self, course_id: int, slot_idx: int) -> float:
+        day = self.slot_days[slot_idx] + 1
+        load = self.course_day_load
+        same_day = load[course_id][day]
+
+        for neighbor, shared in self.scheduler.conflict_graph.neighbors(course_id).items():
+            load[neighbor][day] -= shared
+
+        delta = -SAME_DAY_WEIGHT * same_day
+        class_level = self.scheduler.course_class_levels.get(course_id)
+        if class_level:
+            days = self.level_day_rows[class_level]
+            days[day] -= 1
+            delta -= LEVEL_ADJACENT_DAY_WEIGHT * (days[day - 1] + days[day + 1])
+
+        return delta
+
+    def _unplace(self, course_id: int) -> Tuple[int, List[Dict]]:
+        scheduler = self.scheduler
+        assignment = scheduler.course_assignments[course_id]
+        classrooms = [self.classrooms_by_id[cid] for cid in assignment['classroom_ids']]
+        scheduler._unplace_course(course_id)
+        return assignment['slot_idx'], classrooms
+
+    def _place(self, course_id: int, slot_idx: int, classrooms: List[Dict]):
+        scheduler = self.scheduler
+        scheduler._place_course(
+            course_id, slot_idx, scheduler.time_slots[slot_idx][0], classrooms,
+            scheduler.course_class_levels.get(course_id, ''), scheduler.slot_to_date[slot_idx]
+        )
+
+    def _time_delta(self, course_id: int, old_slot: int, new_slot: int) -> float:
+        if self.slot_days[old_slot] == self.slot_days[new_slot]:
+            return 0.0
+        return self._count_remove(course_id, old_slot) + self._count_add(course_id, new_slot)
+
+    def _undo_time_delta(self, targets: Dict[int, int], old_slots: Dict[int, int]):
+        for course_id, slot_idx in targets.items():
+            self._time_delta(course_id, slot_idx, old_slots[course_id])
+
+    def _relocate(self, targets: Dict[int, int], temperature: float) -> bool:
+        # targets: ders → yeni slot. Uygunsuz ya da reddedilen hareket geri alınır.
+        # Önce hedefler, yerinden oynamayan derslere göre denetlenir: hareketlerin çoğu
+        # burada elenir ve yerleştir/geri al hiç yapılmaz
+        scheduler = self.scheduler
+        for course_id, slot_idx in targets.items():
+            if not scheduler._slot_is_open(course_id, slot_idx, targets):
+                return False
+
+        # Metropolis eşiği baştan çekilir (delta <= -T·ln(u) ⇔ u < e^(-delta/T)); derslik
+        # kazancının üst sınırıyla bile reddedilecek hareket için derslik aranmaz
+        draw = self.rng.random()
+        limit = -temperature * math.log(draw) if draw > 0 else math.inf
+
+        assignments = scheduler.course_assignments
+        old_slots = {course_id: assignments[course_id]['slot_idx'] for course_id in targets}
+        time_delta = sum(
+            self._time_delta(course_id, old_slots[course_id], slot_idx) for course_id, slot_idx in targets.items()
+        )
+        room_saving = ROOM_WEIGHT * sum(len(assignments[course_id]['classroom_ids']) - 1 for course_id in targets)
+        if time_delta - room_saving > limit:
+            self._undo_time_delta(targets, old_slots)
+            return False
+
+        previous: Dict[int, Tuple[int, List[Dict]]] = {}
+        for course_id in targets:
+            previous[course_id] = self._unplace(course_id)
+
+        placed: Dict[int, int] = {}
+        for course_id, slot_idx in targets.items():
+            classrooms = scheduler._feasible_classrooms(course_id, slot_idx)
+            if not classrooms:
+                self._undo_time_delta(targets, old_slots)
+                self._revert(placed, previous)
+                return False
+            self._place(course_id, slot_idx, classrooms)
+            placed[course_id] = len(classrooms) - len(previous[course_id][1])
+
+        delta = time_delta + ROOM_WEIGHT * sum(placed.values())
+        if delta <= limit:
+            self.cost += delta
+            return True
+
+        self._undo_time_delta(targets, old_slots)
+        self._revert(placed, previous)
+        return False
+
+    def _revert(self, placed: Dict[int, int], previous: Dict[int, Tuple[int, List[Dict]]]):
+        for course_id in placed:
+            self.scheduler._unplace_course(course_id)
+        for course_id, (slot_idx, classrooms) in previous.items():
+            self._place(course_id, slot_idx, classrooms)
+
+    def _random_course(self) -> int:
+        return self.rng.choice(self.course_ids)
+
+    def _move_one(self, temperature: float) -> bool:
+        course_id = self._random_course()
+        current = self.scheduler.course_assignments[course_id]['slot_idx']
+        target = self.rng.choice(self.slot_ids)
+        if target == current:
+            return False
+        return self._relocate({course_id: target}, temperature)
+
+    def _swap_two(self, temperature: float) -> bool:
+        course_a = self._random_course()
+        course_b = self._random_course()
+        assignments = self.scheduler.course_assignments
+        slot_a = assignments[course_a]['slot_idx']
+        slot_b = assignments[course_b]['slot_idx']
+        if slot_a == slot_b:
+            return False
+        return self._relocate({course_a: slot_b, course_b: slot_a}, temperature)
+
+    def _kempe_swap(self, temperature: float) -> bool:
+        scheduler = self.scheduler
+        assignments = scheduler.course_assignments
+        course_id = self._random_course()
+        shift = self.rng.choice(self.slot_ids) - assignments[course_id]['slot_idx']
+        if not shift:
+            return False
+
+        # Kempe zinciri: zincirdeki dersin yeni aralığıyla çakışan (ya da min gün penceresine
+        # giren) komşular ters yöne kaydırılır; iki zaman bloğundaki dersler yer değiştirir.
+        # Sadece hedefin pencere günlerine yerleşmiş derslere bakılır
+        quanta = scheduler.course_quanta
+        min_days = scheduler.min_days_between
+        chain = {course_id: shift}
+        frontier = [course_id]
+        while frontier:
+            current = frontier.pop()
+            direction = chain[current]
+            target = assignments[current]['slot_idx'] + direction
+            if target not in self.slot_days:
+                return False
+
+            neighbors = scheduler.conflict_graph.neighbors(current)
+            target_end = target + quanta.get(current, 1)
+            for other_date in scheduler.window_dates[scheduler.slot_to_date[target]]:
+                for other in scheduler.date_usage.get(other_date, ()):
+                    if other in chain or other not in neighbors:
+                        continue
+                    other_slot = assignments[other]['slot_idx']
+                    if min_days or (other_slot < target_end and target < other_slot + quanta.get(other, 1)):
+                        chain[other] = -direction
+                        frontier.append(other)
+            if len(chain) > KEMPE_MAX_CHAIN:
+                return False
+
+        return self._relocate(
+            {cid: assignments[cid]['slot_idx'] + direction for cid, direction in chain.items()}, temperature
+        )
@@ -0,0 +1,326 @@
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.scheduler import ExamScheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_NODES = 50000
+# Komşuluk aramalarının her biri serbest ders başına bu kadar düğüm kullanabilir
+NEIGHBORHOOD_NODES_PER_COURSE = 100
+
+
+class BacktrackingSearch:
+    # İleri kontrol + çakışma yönlendirmeli geri atlama (FC-CBJ).
+    # Her dersin uygun slotları bir tamsayı bit maskesinde tutulur; bir ders
+    # yerleştiğinde komşularının ve aynı sınıf seviyesindeki derslerin maskeleri
+    # daraltılır. Eski maske değerleri iz (trail) yığınına yazılır, geri alma
+    # sadece bu tamsayıların geri yazılmasıdır.
+    # Mevcut (açgözlü) yerleşim tohum olarak kullanılır: her yerleşemeyen ders, onu
+    # engelleyen derslerle birlikte aranır, diğer dersler yerinde kalır; komşuluk
+    # yetmezse genişletilir, en sonda kalan bütçeyle sıfırdan tam arama yapılır.
+
+    def __init__(self, scheduler: 'ExamScheduler', max_nodes: int = DEFAULT_MAX_NODES):
+        self.scheduler = scheduler
+        self.max_nodes = max_nodes
+        self.node_limit = max_nodes
+        self.nodes = 0
+        self.backjumps = 0
+
+        graph = scheduler.conflict_graph
+        total_capacity = sum(c['capacity'] for c in scheduler.classrooms)
+
+        self.course_ids: List[int] = [
+            c['id'] for c in scheduler.courses
+            if scheduler.course_student_counts.get(c['id'], 0) <= total_capacity
+        ]
+        searchable = set(self.course_ids)
+
+        self.neighbors: Dict[int, List[int]] = {
+            course_id: [n for n in graph.neighbors(course_id) if n in searchable]
+            for course_id in self.course_ids
+        }
+
+        same_level: Dict[str, List[int]] = defaultdict(list)
+        for course_id in self.course_ids:
+            class_level = scheduler.course_class_levels.get(course_id)
+            if class_level:
+                same_level[class_level].append(course_id)
+        self.same_level: Dict[int, List[int]] = {
+            course_id: [
+                other for other in same_level.get(scheduler.course_class_levels.get(course_id), [])
+                if other != course_id
+            ]
+            for course_id in self.course_ids
+        }
+
+        self.quanta: Dict[int, int] = {
+            course_id: scheduler.course_quanta.get(course_id, 1) for course_id in self.course_ids
+        }
+        self.day_masks: Dict[int, int] = {
+            slot_idx: scheduler.day_slot_masks[scheduler.slot_to_date[slot_idx]]
+            for _, slot_idx in scheduler.time_slots
+        }
+
+        self.domains: Dict[int, int] = {}
+        self.past_fc: Dict[int, Set[int]] = {}
+        self.conf_set: Dict[int, Set[int]] = {}
+        self.level_of: Dict[int, int] = {}
+        self.trail: List[Tuple[int, int, int]] = []
+
+    def run(self) -> bool:
+        # Arama kendi alan maskelerini tuttuğu için zamanlayıcının maskelerine ihtiyaç duymaz
+        with self.scheduler._untracked_slot_masks():
+            return self._run()
+
+    def _run(self) -> bool:
+        scheduler = self.scheduler
+        unplaced = [course_id for course_id in self.course_ids if course_id not in scheduler.course_assignments]
+        if not unplaced:
+            return True
+
+        if scheduler.course_assignments:
+            # Önce mevcut yerleşim onarılır: her yerleşemeyen ders için sadece onu engelleyen dersler serbest kalır
+            unplaced = self._repair_unplaced(unplaced)
+            if not unplaced:
+                return True
+            if self.nodes >= self.max_nodes or scheduler._should_stop():
+                return False
+
+        # Onarım yetmezse kalan bütçeyle sıfırdan tam arama; bulamazsa onarılmış yerleşim korunur
+        best = scheduler._snapshot_assignments()
+        self.node_limit = self.max_nodes
+        scheduler._reset_assignments()
+        if self._search(set(self.course_ids)):
+            return True
+
+        if len(scheduler.course_assignments) < len(best):
+            scheduler._restore_assignments(best)
+        return False
+
+    def _repair_unplaced(self, unplaced: List[int]) -> List[int]:
+        scheduler = self.scheduler
+        seed = scheduler._snapshot_assignments()
+        remaining = []
+
+        for course_id in sorted(unplaced, key=lambda c: scheduler._course_start_mask(c).bit_count()):
+            placed = False
+            for free in self._neighborhoods(course_id):
+                if self.nodes >= self.max_nodes or scheduler._should_stop():
+                    break
+                self.node_limit = min(self.max_nodes, self.nodes + NEIGHBORHOOD_NODES_PER_COURSE * len(free))
+                if self._search(free):
+                    placed = True
+                    break
+                scheduler._restore_assignments(seed)
+
+            if placed:
+                seed = scheduler._snapshot_assignments()
+            else:
+                remaining.append(course_id)
+
+        logger.info(
+            f"  🔎 Komşuluk onarımı: {len(unplaced) - len(remaining)}/{len(unplaced)} ders yerleşti "
+            f"({self.nodes} düğüm)"
+        )
+        return remaining
+
+    def _neighborhoods(self, course_id: int):
+        # Dersin günleri, o günü kapatan yerleşik derslerin sayısına göre sıralanır; en az engelli
+        # günlerin engelleyicileri serbest bırakılır, her turda gün sayısı ikiye katlanır
+        blockers = self._blockers_by_day(course_id)
+        width = 1
+        free: Set[int] = set()
+        while True:
+            ring = {course_id}.union(*blockers[:width])
+            if ring != free:
+                free = ring
+                yield free
+            if width >= len(blockers):
+                return
+            width *= 2
+
+    def _blockers_by_day(self, course_id: int) -> List[Set[int]]:
+        scheduler = self.scheduler
+        assignments = scheduler.course_assignments
+        start_mask = scheduler._course_start_mask(course_id)
+        own_quanta = self.quanta[course_id]
+
+        blockers: Dict[date, Set[int]] = {
+            slot_date: set() for slot_date, day_mask in scheduler.day_slot_masks.items() if start_mask & day_mask
+        }
+        for neighbor in self.neighbors[course_id]:
+            assignment = assignments.get(neighbor)
+            if not assignment:
+                continue
+            window = scheduler._neighbor_window(assignment['slot_idx'], self.quanta[neighbor], own_quanta)
+            for slot_date, day_blockers in blockers.items():
+                if window & scheduler.day_slot_masks[slot_date]:
+                    day_blockers.add(neighbor)
+
+        for other in self.same_level[course_id]:
+            assignment = assignments.get(other)
+            if assignment:
+                day_blockers = blockers.get(scheduler.slot_to_date[assignment['slot_idx']])
+                if day_blockers is not None:
+                    day_blockers.add(other)
+
+        return sorted(blockers.values(), key=len)
+
+    def _search(self, free: Set[int]) -> bool:
+        # free dışındaki yerleşik dersler sabittir; alanlar onlara göre daraltılmış başlar
+        scheduler = self.scheduler
+        for course_id in free:
+            if course_id in scheduler.course_assignments:
+                scheduler._unplace_course(course_id)
+
+        if not free:
+            return True
+
+        self.domains = {course_id: scheduler.feasible_slot_mask(course_id) for course_id in free}
+        self.past_fc = {course_id: set() for course_id in free}
+        self.conf_set = {course_id: set() for course_id in free}
+        self.level_of = {}
+        self.trail = []
+
+        unassigned: Set[int] = set(free)
+        # Yığın girdisi: [ders, denenecek slot maskesi, iz başlangıcı]
+        stack: List[list] = []
+
+        first = self._select_variable(unassigned)
+        stack.append([first, self.domains[first], len(self.trail)])
+        self.conf_set[first] = set()
+
+        while stack:
+            if self.nodes >= self.node_limit or scheduler._should_stop():
+                logger.info(f"  ⏹️ Geri izleme sınırı: {self.nodes} düğüm, {self.backjumps} geri atlama")
+                return False
+
+            entry = stack[-1]
+            course_id = entry[0]
+
+            if self._try_next_value(entry, unassigned):
+                if not unassigned:
+                    logger.info(f"  ✓ Geri izleme tamamlandı: {self.nodes} düğüm, {self.backjumps} geri atlama")
+                    return True
+
+                next_course = self._select_variable(unassigned)
+                self.conf_set[next_course] = set()
+                stack.append([next_course, self.domains[next_course], len(self.trail)])
+                continue
+
+            # Değer kalmadı: çakışma kümesindeki en derin seviyeye geri atla
+            conflicts = self.conf_set[course_id] | self.past_fc[course_id]
+            stack.pop()
+            if not conflicts:
+                return False
+
+            target = max(conflicts, key=lambda c: self.level_of[c])
+            target_level = self.level_of[target]
+            self.backjumps += 1
+
+            while len(stack) - 1 > target_level:
+                popped = stack.pop()
+                self._unassign(popped[0], popped[2], unassigned)
+                self.conf_set[popped[0]] = set()
+
+            self._unassign(target, stack[-1][2], unassigned)
+            self.conf_set[target] |= conflicts - {target}
+
+        return False
+
+    def _select_variable(self, unassigned: Set[int]) -> int:
+        graph = self.scheduler.conflict_graph
+        return min(
+            unassigned,
+            key=lambda c: (self.domains[c].bit_count(), -graph.degree(c), -graph.size(c), c)
+        )
+
+    def _try_next_value(self, entry: list, unassigned: Set[int]) -> bool:
+        scheduler = self.scheduler
+        course_id = entry[0]
+        student_count = scheduler.course_student_counts.get(course_id, 0)
+        quanta = self.quanta[course_id]
+
+        while entry[1]:
+            candidates = entry[1]
+            low_bit = candidates & -candidates
+            entry[1] = candidates ^ low_bit
+            slot_idx = low_bit.bit_length() - 1
+
+            self.nodes += 1
+            scheduler.total_attempts += 1
+
+            classrooms = scheduler._find_suitable_classrooms(slot_idx, student_count, quanta)
+            if not classrooms:
+                # Derslikleri tutan dersler o gün yerleşmiş dersler arasındadır (sabit olanlara atlanamaz)
+                self.conf_set[course_id].update(
+                    other for other in scheduler.date_usage.get(scheduler.slot_to_date[slot_idx], ())
+                    if other in self.level_of
+                )
+                continue
+
+            slot_datetime = scheduler.time_slots[slot_idx][0]
+            scheduler._place_course(
+                course_id, slot_idx, slot_datetime, classrooms,
+                scheduler.course_class_levels.get(course_id, ''),
+                scheduler.slot_to_date[slot_idx]
+            )
+            self.level_of[course_id] = len(self.level_of)
+            unassigned.discard(course_id)
+            entry[2] = len(self.trail)
+
+            wiped_out = self._forward_check(course_id, slot_idx, unassigned)
+            if wiped_out is None:
+                return True
+
+            self.conf_set[course_id] |= self.past_fc[wiped_out] - {course_id}
+            self._unassign(course_id, entry[2], unassigned)
+            if scheduler.min_days_between:
+                # min gün kuralında budamalar gün bazlıdır: aynı günün diğer slotları da aynı şekilde tükenir
+                entry[1] &= ~self.day_masks[slot_idx]
+
+        return False
+
+    def _forward_check(self, course_id: int, slot_idx: int, unassigned: Set[int]) -> Optional[int]:
+        prunes: Dict[int, int] = {}
+        scheduler = self.scheduler
+        quanta = self.quanta[course_id]
+        for neighbor in self.neighbors[course_id]:
+            if neighbor in unassigned:
+                prunes[neighbor] = scheduler._neighbor_window(slot_idx, quanta, self.quanta[neighbor])
+
+        day_mask = self.day_masks[slot_idx]
+        for other in self.same_level[course_id]:
+            if other in unassigned:
+                prunes[other] = prunes.get(other, 0) | day_mask
+
+        wiped_out = None
+        for other, mask in prunes.items():
+            old_domain = self.domains[other]
+            new_domain = old_domain & ~mask
+            if new_domain == old_domain:
+                continue
+
+            self.trail.append((other, old_domain, course_id))
+            self.domains[other] = new_domain
+            self.past_fc[other].add(course_id)
+            if not new_domain:
+                wiped_out = other
+                break
+
+        return wiped_out
+
+    def _unassign(self, course_id: int, trail_mark: int, unassigned: Set[int]):
+        while len(self.trail) > trail_mark:
+            other, old_domain, assigner = self.trail.pop()
+            self.domains[other] = old_domain
+            self.past_fc[other].discard(assigner)
+
+        if course_id in self.scheduler.course_assignments:
+            self.scheduler._unplace_course(course_id)
+        self.level_of.pop(course_id, None)
+        unassigned.add(course_id)
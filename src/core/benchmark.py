@@ -0,0 +1,254 @@
+import argparse
+import csv
+import logging
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from src.config import APP_VERSION, DATA_DIR, OUTPUT_DIR
+from src.core.db_raw import Database
+from src.core.instrumentation import peak_memory_mb
+from src.core.joint_scheduler import JointScheduler
+from src.core.seating_manager import SeatingManager
+from src.core.synthetic import generate_university
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_SIZES = (1000, 10000, 50000)
+# Katalog öğrenci sayısıyla büyür: her STUDENTS_PER_DEPARTMENT öğrenci için bir bölüm. Seviye kuralı
+# bölümler arasında ortak olduğundan her bölüm ayrı sınav programıdır; programlar derslikleri paylaşır
+STUDENTS_PER_DEPARTMENT = 1000
+COURSES_PER_LEVEL = 10
+BENCHMARK_DIR = DATA_DIR / "benchmark"
+BENCHMARK_CSV = OUTPUT_DIR / "benchmark.csv"
+BENCHMARK_START_DATE = date(2026, 1, 5)
+BENCHMARK_DAYS = 28
+# Programın izin verdiği günler (hafta içi); sentetik derslik havuzu bu gün sayısına göre boyutlanır
+BENCHMARK_EXAM_DAYS = sum(
+    1 for offset in range(BENCHMARK_DAYS) if (BENCHMARK_START_DATE + timedelta(days=offset)).weekday() < 5
+)
+
+CSV_FIELDS = [
+    'tarih', 'surum', 'tohum', 'ogrenci', 'ders', 'kayit', 'derslik',
+    'adim', 'adet', 'duvar_sn', 'cpu_sn', 'tepe_bellek_mb', 'sonuc',
+]
+
+
+def _timed(fn: Callable, *args, **kwargs) -> Tuple[object, float, float]:
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+
+def _fresh_database(path: Path) -> Database:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()
+    db = Database(db_path=path)
+    db.create_tables()
+    return db
+
+
+def _create_schedules(db: Database, department_ids: Sequence[int]) -> Dict[int, List[int]]:
+    # Bölüm başına bir sınav programı: program → bölümün dersleri
+    user_id = db.execute(
+        """INSERT INTO users (email, password_hash, full_name, role, is_active)
+           VALUES ('benchmark@exam.com', '!', 'Benchmark', 'admin', 1)"""
+    )
+    schedule_courses: Dict[int, List[int]] = {}
+    for i, department_id in enumerate(department_ids, 1):
+        schedule_id = db.execute("""
+            INSERT INTO exam_schedules
+            (name, start_date, end_date, allowed_days, default_exam_duration, default_break_duration, created_by)
+            VALUES (?, ?, ?, '0,1,2,3,4', 75, 15, ?)
+        """, (
+            f"Benchmark Sınavı {i}",
+            BENCHMARK_START_DATE.isoformat(),
+            (BENCHMARK_START_DATE + timedelta(days=BENCHMARK_DAYS - 1)).isoformat(),
+            user_id
+        ))
+        schedule_courses[schedule_id] = [
+            row['id'] for row in db.fetch_all(
+                "SELECT id FROM courses WHERE department_id = ? ORDER BY id", (department_id,)
+            )
+        ]
+    return schedule_courses
+
+
+def _write_excel_inputs(db: Database, department_id: int, directory: Path) -> Tuple[Path, Path]:
+    # ExcelImporter'ın beklediği düzende ders ve öğrenci listeleri (üretilen veriden)
+    from openpyxl import Workbook
+
+    courses_path = directory / "dersler.xlsx"
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["DERS KODU", "DERSİN ADI", "DERSİ VEREN ÖĞR. ELEMANI"])
+    courses = db.fetch_all(
+        "SELECT * FROM courses WHERE department_id = ? ORDER BY class_level, is_mandatory DESC, id",
+        (department_id,)
+    )
+    current = None
+    for course in courses:
+        section = (course['class_level'], course['is_mandatory'])
+        if section != current:
+            title = f"{course['class_level']}. Sınıf" if course['is_mandatory'] else "SEÇMELİ DERSLER"
+            sheet.append([title, None, None])
+            current = section
+        sheet.append([course['code'], course['name'], course['instructor']])
+    workbook.save(courses_path)
+
+    students_path = directory / "ogrenciler.xlsx"
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["Öğrenci No", "Ad Soyad", "Sınıf", "Ders"])
+    rows = db.fetch_all("""
+        SELECT s.student_number, s.full_name, s.class_level, c.code
+        FROM students s
+        JOIN student_courses sc ON sc.student_id = s.id
+        JOIN courses c ON c.id = sc.course_id
+        WHERE s.department_id = ?
+        ORDER BY s.id, c.id
+    """, (department_id,))
+    for row in rows:
+        sheet.append([row['student_number'], row['full_name'], row['class_level'], row['code']])
+    workbook.save(students_path)
+
+    return courses_path, students_path
+
+
+def benchmark_size(students: int, seed: int = 42, strategy: str = 'greedy',
+                   seating_exams: Optional[int] = 5, excel: bool = True,
+                   time_limit_seconds: int = 300, departments: Optional[int] = None,
+                   courses_per_level: int = COURSES_PER_LEVEL) -> List[Dict]:
+    departments = departments or max(1, round(students / STUDENTS_PER_DEPARTMENT))
+    logger.info(f"\n⏱️ Benchmark: {students} öğrenci, {departments} bölüm")
+    directory = BENCHMARK_DIR / f"ogrenci_{students}"
+    db = _fresh_database(directory / "benchmark.db")
+
+    summary, wall, cpu = _timed(
+        generate_university, db, students=students, departments=departments,
+        courses_per_level=courses_per_level, exam_days=BENCHMARK_EXAM_DAYS, seed=seed
+    )
+    base = {
+        'tarih': datetime.now().isoformat(timespec='seconds'),
+        'surum': APP_VERSION,
+        'tohum': seed,
+        'ogrenci': summary['ogrenci'],
+        'ders': summary['ders'],
+        'kayit': summary['kayit'],
+        'derslik': summary['derslik'],
+    }
+    rows: List[Dict] = []
+
+    def record(step: str, count: int, wall: float, cpu: float, result):
+        rows.append({
+            **base, 'adim': step, 'adet': count, 'duvar_sn': round(wall, 4), 'cpu_sn': round(cpu, 4),
+            'tepe_bellek_mb': peak_memory_mb(), 'sonuc': result,
+        })
+        logger.info(f"  ✓ {step}: {wall:.3f} sn ({count} adet)")
+
+    record('synthetic.generate_university', summary['kayit'], wall, cpu, 'ok')
+
+    schedule_courses = _create_schedules(db, summary['bolum_idleri'])
+    classroom_ids = [row['id'] for row in db.fetch_all("SELECT id FROM classrooms ORDER BY id")]
+
+    joint = JointScheduler(db, schedule_courses, classroom_ids)
+    _, wall, cpu = _timed(joint.prepare_data)
+    record('JointScheduler.prepare_data', summary['ders'], wall, cpu, f"{len(schedule_courses)} program")
+
+    success, wall, cpu = _timed(joint.solve, time_limit_seconds=time_limit_seconds, strategy=strategy)
+    placed = sum(len(scheduler.course_assignments) for scheduler in joint.schedulers.values())
+    record('JointScheduler.solve', placed, wall, cpu, 'OPTIMAL' if success else 'PARTIAL')
+
+    _, wall, cpu = _timed(joint.save_solution)
+    saved = db.fetch_one("SELECT COUNT(*) AS n FROM exams")['n']
+    record('JointScheduler.save_solution', saved, wall, cpu, 'ok')
+
+    # Oturma planı en kalabalık sınavlar üzerinde ölçülür; seating_exams=None hepsini alır
+    exam_rows = db.fetch_all("SELECT id FROM exams ORDER BY student_count DESC, id")
+    exam_ids = [row['id'] for row in exam_rows][:seating_exams]
+    seating = SeatingManager(db)
+    results, wall, cpu = _timed(lambda: [seating.generate_seating_for_exam(exam_id) for exam_id in exam_ids])
+    seated = sum(result['assigned_students'] for result in results)
+    record('SeatingManager.generate_seating_for_exam', len(exam_ids), wall, cpu,
+           f"{seated} öğrenci" if all(result['success'] for result in results) else 'eksik')
+
+    if excel:
+        from src.core.excel_importer import ExcelImporter
+
+        department_id = summary['bolum_idleri'][0]
+        courses_path, students_path = _write_excel_inputs(db, department_id, directory)
+
+        import_db = _fresh_database(directory / "import.db")
+        import_department_id = import_db.execute(
+            "INSERT INTO departments (code, name, is_active) VALUES ('SA', 'Sentetik Bölüm 1', 1)"
+        )
+        importer = ExcelImporter()
+        importer.db = import_db
+
+        (imported, failed, _), wall, cpu = _timed(importer.import_courses, str(courses_path), import_department_id)
+        record('ExcelImporter.import_courses', imported, wall, cpu, 'ok' if not failed else f"{failed} hata")
+
+        (imported, failed, _), wall, cpu = _timed(importer.import_students, str(students_path), import_department_id)
+        record('ExcelImporter.import_students', imported, wall, cpu, 'ok' if not failed else f"{failed} hata")
+
+    return rows
+
+
+def append_results(rows: List[Dict], output_path: Path = BENCHMARK_CSV):
+    # Sonuçlar sürümler arası karşılaştırma için aynı dosyanın sonuna eklenir
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    write_header = not output_path.exists() or output_path.stat().st_size == 0
+    with open(output_path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        if write_header:
+            writer.writeheader()
+        writer.writerows(rows)
+    logger.info(f"📄 Benchmark sonuçları yazıldı: {output_path}")
+
+
+def run_benchmark(sizes: Sequence[int] = BENCHMARK_SIZES, output_path: Path = BENCHMARK_CSV,
+                  seed: int = 42, strategy: str = 'greedy', seating_exams: Optional[int] = 5,
+                  excel: bool = True, departments: Optional[int] = None,
+                  courses_per_level: int = COURSES_PER_LEVEL) -> List[Dict]:
+    rows: List[Dict] = []
+    for students in sizes:
+        size_rows = benchmark_size(students, seed=seed, strategy=strategy,
+                                   seating_exams=seating_exams, excel=excel,
+                                   departments=departments, courses_per_level=courses_per_level)
+        append_results(size_rows, output_path)
+        rows.extend(size_rows)
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Sınav zamanlayıcı benchmark'ı")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(BENCHMARK_SIZES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--strategy', default='greedy')
+    parser.add_argument('--seating-exams', type=int, default=5,
+                        help="Oturma planı ölçülecek sınav sayısı (0: hepsi)")
+    parser.add_argument('--departments', type=int, default=None,
+                        help=f"Bölüm sayısı (verilmezse her {STUDENTS_PER_DEPARTMENT} öğrenciye bir bölüm)")
+    parser.add_argument('--courses-per-level', type=int, default=COURSES_PER_LEVEL)
+    parser.add_argument('--skip-excel', action='store_true')
+    parser.add_argument('--output', type=Path, default=BENCHMARK_CSV)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    # Yerleştirme ayrıntıları ölçümü boğmasın
+    logging.getLogger('src.core.scheduler').setLevel(logging.WARNING)
+    logging.getLogger('src.core.joint_scheduler').setLevel(logging.WARNING)
+    logging.getLogger('src.core.seating_manager').setLevel(logging.WARNING)
+
+    run_benchmark(
+        sizes=args.sizes, output_path=args.output, seed=args.seed, strategy=args.strategy,
+        seating_exams=args.seating_exams or None, excel=not args.skip_excel,
+        departments=args.departments, courses_per_level=args.courses_per_level
+    )
+
+
+if __name__ == "__main__":
+    main()
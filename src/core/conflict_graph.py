@@ -0,0 +1,260 @@
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from src.config import DATA_DIR
+
+try:
+    import numpy as np
+    from scipy import sparse
+    HAS_SCIPY = True
+except ImportError:
+    np = None
+    sparse = None
+    HAS_SCIPY = False
+
+logger = logging.getLogger(__name__)
+
+CONFLICT_GRAPH_DIR = DATA_DIR / "conflict_graphs"
+
+
+def conflict_graph_path(exam_schedule_id: int) -> Path:
+    return CONFLICT_GRAPH_DIR / f"schedule_{exam_schedule_id}.json"
+
+
+def enrollment_matrix(student_courses: Mapping[int, Iterable[int]], course_ids: Iterable[int]):
+    # Öğrenci × ders CSR seyrek matrisi; SciPy yoksa None döner
+    if not HAS_SCIPY:
+        return None, []
+
+    course_index = {course_id: i for i, course_id in enumerate(course_ids)}
+    rows: List[int] = []
+    cols: List[int] = []
+    for row_idx, courses in enumerate(student_courses.values()):
+        for course_id in set(courses):
+            col = course_index.get(course_id)
+            if col is None:
+                col = course_index[course_id] = len(course_index)
+            rows.append(row_idx)
+            cols.append(col)
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(len(student_courses), len(course_index))
+    )
+    return matrix, list(course_index)
+
+
+def overlap_matrix(student_courses: Mapping[int, Iterable[int]], course_ids: Iterable[int]):
+    # Ders × ders ortak öğrenci matrisi tek bir Aᵀ·A çarpımıdır; köşegen ders mevcududur
+    matrix, index_to_course = enrollment_matrix(student_courses, course_ids)
+    if matrix is None:
+        return None, []
+    return (matrix.T @ matrix).tocsr(), index_to_course
+
+
+class ConflictGraph:
+
+    def __init__(self, course_ids: Iterable[int] = ()):
+        self.course_sizes: Dict[int, int] = {course_id: 0 for course_id in course_ids}
+        self.edges: Dict[int, Dict[int, int]] = {course_id: {} for course_id in self.course_sizes}
+
+    @classmethod
+    def from_student_courses(cls, student_courses: Mapping[int, Iterable[int]],
+                             course_ids: Optional[Iterable[int]] = None,
+                             use_sparse: bool = True) -> 'ConflictGraph':
+        if use_sparse and HAS_SCIPY:
+            return cls.from_overlap_matrix(*overlap_matrix(student_courses, list(course_ids or ())))
+        if use_sparse:
+            logger.debug("SciPy bulunamadı, çakışma grafı saf Python ile hesaplanıyor")
+        return cls._from_student_courses_python(student_courses, course_ids)
+
+    @classmethod
+    def from_overlap_matrix(cls, overlap, index_to_course: List[int]) -> 'ConflictGraph':
+        graph = cls(index_to_course)
+        sizes = overlap.diagonal().tolist()
+        for i, course_id in enumerate(index_to_course):
+            graph.course_sizes[course_id] = int(sizes[i])
+
+        coo = overlap.tocoo()
+        off_diagonal = coo.row != coo.col
+        for row, col, shared in zip(coo.row[off_diagonal].tolist(),
+                                    coo.col[off_diagonal].tolist(),
+                                    coo.data[off_diagonal].tolist()):
+            graph.edges[index_to_course[row]][index_to_course[col]] = shared
+
+        return graph
+
+    @classmethod
+    def _from_student_courses_python(cls, student_courses: Mapping[int, Iterable[int]],
+                                     course_ids: Optional[Iterable[int]] = None) -> 'ConflictGraph':
+        graph = cls(course_ids or ())
+        sizes = graph.course_sizes
+        edges = graph.edges
+
+        # Tek geçiş: her öğrencinin dersleri kendi aralarında kenar ağırlığını artırır
+        for courses in student_courses.values():
+            unique_courses = sorted(set(courses))
+            for course_id in unique_courses:
+                sizes[course_id] = sizes.get(course_id, 0) + 1
+                edges.setdefault(course_id, {})
+
+            for i, course_a in enumerate(unique_courses):
+                neighbors_a = edges[course_a]
+                for course_b in unique_courses[i + 1:]:
+                    neighbors_a[course_b] = neighbors_a.get(course_b, 0) + 1
+                    neighbors_b = edges[course_b]
+                    neighbors_b[course_a] = neighbors_b.get(course_a, 0) + 1
+
+        return graph
+
+    @property
+    def nodes(self) -> List[int]:
+        return list(self.course_sizes)
+
+    def neighbors(self, course_id: int) -> Dict[int, int]:
+        return self.edges.get(course_id, {})
+
+    def weight(self, course_a: int, course_b: int) -> int:
+        return self.edges.get(course_a, {}).get(course_b, 0)
+
+    def degree(self, course_id: int) -> int:
+        return len(self.edges.get(course_id, ()))
+
+    def weighted_degree(self, course_id: int) -> int:
+        return sum(self.edges.get(course_id, {}).values())
+
+    def size(self, course_id: int) -> int:
+        return self.course_sizes.get(course_id, 0)
+
+    def edge_count(self) -> int:
+        return sum(len(neighbors) for neighbors in self.edges.values()) // 2
+
+    def max_degree(self) -> int:
+        return max((len(neighbors) for neighbors in self.edges.values()), default=0)
+
+    def density(self) -> float:
+        n = len(self.course_sizes)
+        if n < 2:
+            return 0.0
+        return self.edge_count() / (n * (n - 1) / 2)
+
+    def components(self, groups: Iterable[Iterable[int]] = ()) -> List[List[int]]:
+        # Bağlı bileşenler (union-find); groups içindeki düğümler de aynı bileşene bağlanır
+        parent = {course_id: course_id for course_id in self.course_sizes}
+
+        def find(course_id: int) -> int:
+            root = course_id
+            while parent[root] != root:
+                root = parent[root]
+            while parent[course_id] != root:
+                parent[course_id], course_id = root, parent[course_id]
+            return root
+
+        def union(course_a: int, course_b: int):
+            root_a, root_b = find(course_a), find(course_b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        for course_a, neighbors in self.edges.items():
+            parent.setdefault(course_a, course_a)
+            for course_b in neighbors:
+                parent.setdefault(course_b, course_b)
+                union(course_a, course_b)
+        for group in groups:
+            group = list(group)
+            for course_id in group:
+                parent.setdefault(course_id, course_id)
+            for course_id in group[1:]:
+                union(group[0], course_id)
+
+        members: Dict[int, List[int]] = {}
+        for course_id in parent:
+            members.setdefault(find(course_id), []).append(course_id)
+        return sorted(members.values(), key=len, reverse=True)
+
+    def greedy_clique(self, max_starts: Optional[int] = None) -> List[int]:
+        # Büyük bir klik (alt sınır için yeterli): her başlangıç düğümünden, adaylar arasında
+        # en yüksek dereceli düğüm eklenip aday kümesi komşuluklarla kesiştirilir
+        order = sorted(self.edges, key=lambda course_id: -len(self.edges[course_id]))
+        best: List[int] = order[:1]
+
+        for start in order[:max_starts]:
+            if len(self.edges[start]) + 1 <= len(best):
+                break
+            clique = [start]
+            candidates = set(self.edges[start])
+            while candidates:
+                if len(clique) + len(candidates) <= len(best):
+                    break
+                course_id = max(candidates, key=lambda c: (len(self.edges[c]), -c))
+                clique.append(course_id)
+                candidates.intersection_update(self.edges[course_id])
+            if len(clique) > len(best):
+                best = clique
+
+        return best
+
+    def iter_edges(self) -> Iterable[Tuple[int, int, int]]:
+        for course_a, neighbors in self.edges.items():
+            for course_b, shared in neighbors.items():
+                if course_a < course_b:
+                    yield course_a, course_b, shared
+
+    def to_sparse(self):
+        # Raporlama için ders × ders ağırlık matrisi (SciPy gerekli)
+        if not HAS_SCIPY:
+            return None, []
+
+        index_to_course = list(self.course_sizes)
+        course_index = {course_id: i for i, course_id in enumerate(index_to_course)}
+        rows, cols, data = [], [], []
+        for course_id, size in self.course_sizes.items():
+            rows.append(course_index[course_id])
+            cols.append(course_index[course_id])
+            data.append(size)
+        for course_a, neighbors in self.edges.items():
+            for course_b, shared in neighbors.items():
+                rows.append(course_index[course_a])
+                cols.append(course_index[course_b])
+                data.append(shared)
+
+        n = len(index_to_course)
+        return sparse.csr_matrix((data, (rows, cols)), shape=(n, n)), index_to_course
+
+    def to_dict(self) -> Dict:
+        return {
+            'nodes': {str(course_id): size for course_id, size in self.course_sizes.items()},
+            'edges': [[course_a, course_b, shared] for course_a, course_b, shared in self.iter_edges()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ConflictGraph':
+        graph = cls(int(course_id) for course_id in data.get('nodes', {}))
+        for course_id, size in data.get('nodes', {}).items():
+            graph.course_sizes[int(course_id)] = size
+
+        for course_a, course_b, shared in data.get('edges', []):
+            graph.edges.setdefault(course_a, {})[course_b] = shared
+            graph.edges.setdefault(course_b, {})[course_a] = shared
+
+        return graph
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, payload: str) -> 'ConflictGraph':
+        return cls.from_dict(json.loads(payload))
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_json(), encoding='utf-8')
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['ConflictGraph']:
+        path = Path(path)
+        if not path.exists():
+            return None
+        return cls.from_json(path.read_text(encoding='utf-8'))
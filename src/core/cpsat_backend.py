@@ -0,0 +1,195 @@
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+try:
+    from ortools.sat.python import cp_model
+    HAS_ORTOOLS = True
+except ImportError:
+    cp_model = None
+    HAS_ORTOOLS = False
+
+if TYPE_CHECKING:
+    from src.core.scheduler import ExamScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class CpSatEncoding:
+    # Zaman ekseni: gün d'nin dilimi q → d * stride + q. Günler arasında en uzun sınav (+ ara) kadar boşluk
+    # bırakılır; böylece gün sonunu taşan aralar ertesi sabahın sınavlarıyla çakışmış sayılmaz
+
+    def __init__(self, scheduler: 'ExamScheduler'):
+        self.scheduler = scheduler
+        self.model = cp_model.CpModel()
+        self.days = sorted(scheduler.day_first_slot)
+        self.stride = scheduler.quanta_per_day + max(scheduler.course_quanta.values(), default=1)
+        self.course_ids = [c['id'] for c in scheduler.courses]
+
+        # Slot atama booleanları dersin günüdür (y[c][d]); gün içi başlangıç start[c] tamsayısıdır.
+        # Ders yerleşmeyebilir (placed[c] = 0); amaç yerleşen ders sayısını en büyütmektir
+        self.day_vars: Dict[int, List] = {}
+        self.placed: Dict[int, object] = {}
+        self.starts: Dict[int, object] = {}
+        self.intervals: Dict[int, object] = {}
+
+        self._add_assignment_variables()
+        self._add_student_conflicts()
+        self._add_class_levels()
+        self._add_room_capacity()
+        self.model.Maximize(sum(self.placed.values()))
+
+    def _add_assignment_variables(self):
+        model = self.model
+        scheduler = self.scheduler
+        horizon = len(self.days) * self.stride
+        for course_id in self.course_ids:
+            last_start = scheduler.quanta_per_day - scheduler.course_exam_quanta.get(course_id, 1)
+            quanta = scheduler.course_quanta.get(course_id, 1)
+            start = model.NewIntVar(0, max(horizon - 1, 0), f"t{course_id}")
+            day_vars = []
+            for d in range(len(self.days)):
+                y = model.NewBoolVar(f"y{course_id}_{d}")
+                if last_start < 0:
+                    model.Add(y == 0)
+                else:
+                    model.Add(start >= d * self.stride).OnlyEnforceIf(y)
+                    model.Add(start <= d * self.stride + last_start).OnlyEnforceIf(y)
+                day_vars.append(y)
+            placed = model.NewBoolVar(f"p{course_id}")
+            model.Add(sum(day_vars) == placed)
+            self.day_vars[course_id] = day_vars
+            self.placed[course_id] = placed
+            self.starts[course_id] = start
+            self.intervals[course_id] = model.NewOptionalFixedSizeIntervalVar(start, quanta, placed, f"i{course_id}")
+            if course_id in scheduler.reserved_start_masks:
+                self._restrict_starts(course_id)
+
+    def _restrict_starts(self, course_id: int):
+        # Öğrencileri başka programlarda sınavda olan dersin başlangıçları açık slotlarla sınırlanır
+        scheduler = self.scheduler
+        day_index = {day: d for d, day in enumerate(self.days)}
+        mask = scheduler._course_start_mask(course_id)
+        allowed = []
+        while mask:
+            low_bit = mask & -mask
+            mask ^= low_bit
+            slot_idx = low_bit.bit_length() - 1
+            allowed.append(day_index[scheduler.slot_to_date[slot_idx]] * self.stride + scheduler.slot_quanta[slot_idx])
+        if not allowed:
+            self.model.Add(self.placed[course_id] == 0)
+            return
+        self.model.AddLinearExpressionInDomain(
+            self.starts[course_id], cp_model.Domain.FromValues(allowed)
+        ).OnlyEnforceIf(self.placed[course_id])
+
+    def _add_student_conflicts(self):
+        model = self.model
+        scheduler = self.scheduler
+        graph = scheduler.conflict_graph
+        min_days = scheduler.min_days_between
+        ordinals = [day.toordinal() for day in self.days]
+
+        for course_a, course_b, _ in graph.iter_edges():
+            if course_a not in self.starts or course_b not in self.starts:
+                continue
+            if not min_days:
+                model.AddNoOverlap([self.intervals[course_a], self.intervals[course_b]])
+                continue
+            # Aralarında min_days günden az olan günler birlikte seçilemez
+            days_a, days_b = self.day_vars[course_a], self.day_vars[course_b]
+            for d, ordinal in enumerate(ordinals):
+                window = [days_b[e] for e, other in enumerate(ordinals) if abs(other - ordinal) < min_days]
+                model.Add(days_a[d] + sum(window) <= 1)
+
+    def _add_class_levels(self):
+        # Aynı sınıf seviyesinden günde en fazla bir sınav
+        levels: Dict[str, List[int]] = defaultdict(list)
+        for course_id in self.course_ids:
+            class_level = self.scheduler.course_class_levels.get(course_id)
+            if class_level:
+                levels[class_level].append(course_id)
+        for course_ids in levels.values():
+            if len(course_ids) < 2:
+                continue
+            for d in range(len(self.days)):
+                self.model.AddAtMostOne([self.day_vars[course_id][d] for course_id in course_ids])
+
+    def _add_room_capacity(self):
+        # Derslik kapasitesi kümülatif kaynak olarak gevşetilir (koltuk toplamı ve derslik sayısı);
+        # derslikler çözümden sonra pack_rooms ile seçilir. Başka programların rezervasyonları sabit aralıklardır
+        model = self.model
+        scheduler = self.scheduler
+        capacities = {c['id']: c['capacity'] for c in scheduler.classrooms}
+        total_capacity = sum(capacities.values())
+        day_index = {day: d for d, day in enumerate(self.days)}
+
+        reserved_seats: Dict[int, int] = defaultdict(int)
+        reserved_rooms: Dict[int, int] = defaultdict(int)
+        for (classroom_id, day), mask in scheduler.reserved_room_busy.items():
+            d = day_index.get(day)
+            if d is None or classroom_id not in capacities:
+                continue
+            while mask:
+                low_bit = mask & -mask
+                mask ^= low_bit
+                t = d * self.stride + low_bit.bit_length() - 1
+                reserved_seats[t] += capacities[classroom_id]
+                reserved_rooms[t] += 1
+
+        intervals = [self.intervals[course_id] for course_id in self.course_ids]
+        seat_demands = [scheduler.course_student_counts.get(course_id, 0) for course_id in self.course_ids]
+        room_demands = [1] * len(intervals)
+        for t in sorted(reserved_seats):
+            fixed = model.NewFixedSizeIntervalVar(t, 1, f"r{t}")
+            intervals.append(fixed)
+            seat_demands.append(reserved_seats[t])
+            room_demands.append(reserved_rooms[t])
+
+        model.AddCumulative(intervals, seat_demands, total_capacity)
+        model.AddCumulative(intervals, room_demands, len(capacities))
+
+    def add_hint(self, assignments: Dict[int, int]):
+        # Başlangıç çözümü (ör. açgözlü yerleşim): ders → slot indeksi
+        day_index = {day: d for d, day in enumerate(self.days)}
+        for course_id, day_vars in self.day_vars.items():
+            slot_idx = assignments.get(course_id)
+            d = day_index[self.scheduler.slot_to_date[slot_idx]] if slot_idx is not None else None
+            self.model.AddHint(self.placed[course_id], d is not None)
+            for e, y in enumerate(day_vars):
+                self.model.AddHint(y, e == d)
+            if d is not None:
+                self.model.AddHint(self.starts[course_id], d * self.stride + self.scheduler.slot_quanta[slot_idx])
+
+    def slot_of(self, start_value: int) -> int:
+        d, quantum = divmod(start_value, self.stride)
+        return self.scheduler.day_first_slot[self.days[d]] + quantum
+
+
+def solve_cpsat(scheduler: 'ExamScheduler', time_limit_seconds: Optional[float] = None,
+                workers: Optional[int] = None, hint: Optional[Dict[int, int]] = None) -> Tuple[Dict[int, int], str]:
+    # Yerleşen ders → slot indeksi; çözüm bulunamazsa boş sözlük. İkinci değer çözücü durumudur
+    encoding = CpSatEncoding(scheduler)
+    if hint:
+        encoding.add_hint(hint)
+    logger.info(
+        f"  🧮 CP-SAT modeli: {len(encoding.model.Proto().variables)} değişken, "
+        f"{len(encoding.model.Proto().constraints)} kısıt"
+    )
+
+    solver = cp_model.CpSolver()
+    if time_limit_seconds:
+        solver.parameters.max_time_in_seconds = float(time_limit_seconds)
+    solver.parameters.num_workers = workers or 0
+
+    status = solver.Solve(encoding.model)
+    status_name = solver.StatusName(status)
+    logger.info(f"  🧮 CP-SAT durumu: {status_name} ({solver.WallTime():.2f} sn)")
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return {}, status_name
+
+    return {
+        course_id: encoding.slot_of(solver.Value(start))
+        for course_id, start in encoding.starts.items()
+        if solver.Value(encoding.placed[course_id])
+    }, status_name
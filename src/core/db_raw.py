@@ -231,12 +231,66 @@ class Database:
                     imported_at TEXT DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+
+            # Program silinirken ON DELETE CASCADE zinciri tablo taraması yapmasın
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_exams_schedule ON exams(schedule_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_exam_sessions_exam ON exam_sessions(exam_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_exam_proctors_session ON exam_proctors(exam_session_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_seating_session ON seating_assignments(exam_session_id)")
+
+            # Çözüm önbelleği: aynı girdilerle yeniden çalıştırmada çözüm tekrar aranmaz
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS solution_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    course_count INTEGER DEFAULT 0,
+                    hit_count INTEGER DEFAULT 0,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    last_used_at REAL NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS solution_cache_courses (
+                    cache_key TEXT NOT NULL,
+                    course_id INTEGER NOT NULL,
+                    PRIMARY KEY (cache_key, course_id),
+                    FOREIGN KEY (cache_key) REFERENCES solution_cache(cache_key) ON DELETE CASCADE
+                )
+            """)
+
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_solution_cache_lru ON solution_cache(last_used_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_solution_cache_courses_course ON solution_cache_courses(course_id)")
+
+            # Kayıt değişince sadece o dersi içeren önbellek girdileri silinir
+            for event, row in (('INSERT', 'NEW'), ('DELETE', 'OLD')):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_solution_cache_enrollment_{event.lower()}
+                    AFTER {event} ON student_courses
+                    BEGIN
+                        DELETE FROM solution_cache WHERE cache_key IN (
+                            SELECT cache_key FROM solution_cache_courses WHERE course_id = {row}.course_id
+                        );
+                    END
+                """)
+
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_solution_cache_enrollment_update
+                AFTER UPDATE ON student_courses
+                BEGIN
+                    DELETE FROM solution_cache WHERE cache_key IN (
+                        SELECT cache_key FROM solution_cache_courses
+                        WHERE course_id IN (OLD.course_id, NEW.course_id)
+                    );
+                END
+            """)
             
             conn.commit()
             print("[OK] Tüm tablolar oluşturuldu (Raw SQL)")
     
     def drop_all_tables(self):
         tables = [
+            'solution_cache_courses', 'solution_cache',
             'import_logs', 'seating_assignments', 'exam_proctors', 'exam_sessions', 'exams',
             'exam_schedules', 'student_courses', 'students', 
             'courses', 'classrooms', 'departments', 'users'
@@ -0,0 +1,91 @@
+import logging
+from collections import defaultdict
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.scheduler import ExamScheduler
+
+logger = logging.getLogger(__name__)
+
+
+def max_spaced_days(day_ordinals: List[int], min_days: int) -> int:
+    # Aralarında en az min_days gün olan en fazla gün sayısı (sıralı günlerde açgözlü seçim en iyidir)
+    count = 0
+    last = None
+    for day in day_ordinals:
+        if last is None or day - last >= min_days:
+            count += 1
+            last = day
+    return count
+
+
+def check_feasibility(scheduler: 'ExamScheduler') -> List[str]:
+    # Çözmeden önce ucuz alt sınırlar: herhangi biri tutmazsa hiçbir yerleşim tüm dersleri kapsayamaz
+    from src.core.scheduler import TIME_QUANTUM_MINUTES
+
+    reasons: List[str] = []
+    courses_by_id = {c['id']: c for c in scheduler.courses}
+    if not courses_by_id:
+        return reasons
+
+    exam_days = len(scheduler.day_first_slot)
+    if not scheduler.time_slots:
+        return ["Seçilen tarih aralığında sınav yapılabilecek gün yok"]
+
+    def code(course_id: int) -> str:
+        return courses_by_id[course_id].get('code', str(course_id))
+
+    # Gün içine sığmayan sınavlar
+    day_minutes = scheduler.quanta_per_day * TIME_QUANTUM_MINUTES
+    for course_id in courses_by_id:
+        if scheduler.course_exam_quanta.get(course_id, 1) > scheduler.quanta_per_day:
+            reasons.append(
+                f"{code(course_id)} sınavı ({scheduler._course_duration_minutes(course_id)} dk) "
+                f"bir güne ({day_minutes} dk) sığmıyor"
+            )
+
+    # En kalabalık ders, seçili dersliklerin toplam kapasitesini aşamaz
+    total_capacity = sum(c['capacity'] for c in scheduler.classrooms)
+    largest_id = max(courses_by_id, key=lambda course_id: scheduler.course_student_counts.get(course_id, 0))
+    largest = scheduler.course_student_counts.get(largest_id, 0)
+    if largest > total_capacity:
+        reasons.append(
+            f"{code(largest_id)} dersinin {largest} öğrencisi var, seçili dersliklerin toplam kapasitesi {total_capacity}"
+        )
+
+    # Aynı sınıf seviyesinden günde en fazla bir sınav
+    level_courses: Dict[str, List[int]] = defaultdict(list)
+    for course_id in courses_by_id:
+        class_level = scheduler.course_class_levels.get(course_id)
+        if class_level:
+            level_courses[class_level].append(course_id)
+    for class_level, course_ids in sorted(level_courses.items(), key=lambda item: (len(item[0]), item[0])):
+        if len(course_ids) > exam_days:
+            reasons.append(
+                f"{class_level}. sınıfın {len(course_ids)} sınavı var "
+                f"({code(course_ids[0])}, ...), ancak sadece {exam_days} sınav günü var (günde en fazla bir sınav)"
+            )
+
+    # Çakışma grafındaki klikteki dersler zamanca ayrık olmak zorundadır
+    clique = [course_id for course_id in scheduler.conflict_graph.greedy_clique() if course_id in courses_by_id]
+    if len(clique) > 1:
+        min_days = scheduler.min_days_between
+        if min_days:
+            available_days = max_spaced_days(scheduler.exam_day_ordinals, min_days)
+            if len(clique) > available_days:
+                reasons.append(
+                    f"Ortak öğrencisi olan {len(clique)} ders ({', '.join(code(c) for c in clique[:5])}"
+                    f"{', ...' if len(clique) > 5 else ''}) en az {min_days} gün arayla "
+                    f"sadece {available_days} güne yerleştirilebilir"
+                )
+        else:
+            needed = sum(scheduler.course_exam_quanta.get(course_id, 1) for course_id in clique)
+            available = exam_days * scheduler.quanta_per_day
+            if needed > available:
+                reasons.append(
+                    f"Ortak öğrencisi olan {len(clique)} dersin toplam sınav süresi "
+                    f"({needed * TIME_QUANTUM_MINUTES} dk) sınav günlerinin toplamını "
+                    f"({available * TIME_QUANTUM_MINUTES} dk) aşıyor"
+                )
+
+    return reasons
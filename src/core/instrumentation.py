@@ -0,0 +1,109 @@
+import json
+import logging
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.config import LOG_DIR
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+REJECTION_REASONS = ('sinif_seviyesi', 'ogrenci_cakismasi', 'min_gun', 'kapasite')
+
+
+def solver_trace_path(exam_schedule_id: int) -> Path:
+    return LOG_DIR / f"solver_trace_{exam_schedule_id}.json"
+
+
+def peak_memory_mb() -> Optional[float]:
+    # Sürecin en yüksek bellek kullanımı; resource modülü yoksa (Windows) ölçülmez
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt döner
+    if sys.platform == 'darwin':
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+class SolverInstrumentation:
+
+    def __init__(self):
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.rejections: Dict[str, int] = defaultdict(int)
+        # Tavlama ön kontrolleri yerleştirme reddi değildir: ayrı sayılır
+        self.probe_rejections: Dict[str, int] = defaultdict(int)
+        self._probing = 0
+        self.events: List[Dict] = []
+        self._started_at = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            stats = self.phases.setdefault(name, {'cagri': 0, 'duvar_sn': 0.0, 'cpu_sn': 0.0})
+            stats['cagri'] += 1
+            stats['duvar_sn'] += time.perf_counter() - wall_start
+            stats['cpu_sn'] += time.process_time() - cpu_start
+            self.event('faz', ad=name, duvar_sn=round(time.perf_counter() - wall_start, 6))
+
+    @contextmanager
+    def probing(self):
+        self._probing += 1
+        try:
+            yield
+        finally:
+            self._probing -= 1
+
+    def reject(self, reason: str, count: int = 1):
+        if count:
+            (self.probe_rejections if self._probing else self.rejections)[reason] += count
+
+    def merge(self, rejections: Dict[str, int], probe_rejections: Dict[str, int]):
+        # İşçi süreçlerin sayaçları ana sürecinkine eklenir
+        for reason, count in rejections.items():
+            self.rejections[reason] += count
+        for reason, count in probe_rejections.items():
+            self.probe_rejections[reason] += count
+
+    def event(self, kind: str, **fields):
+        self.events.append({'t': round(time.perf_counter() - self._started_at, 6), 'tur': kind, **fields})
+
+    def to_dict(self) -> Dict:
+        return {
+            'fazlar': {
+                name: {
+                    'cagri': stats['cagri'],
+                    'duvar_sn': round(stats['duvar_sn'], 6),
+                    'cpu_sn': round(stats['cpu_sn'], 6),
+                }
+                for name, stats in self.phases.items()
+            },
+            'red_nedenleri': {reason: self.rejections.get(reason, 0) for reason in REJECTION_REASONS},
+            'tavlama_red_nedenleri': {reason: self.probe_rejections.get(reason, 0) for reason in REJECTION_REASONS},
+            'tepe_bellek_mb': peak_memory_mb(),
+        }
+
+    def write_trace(self, path: Path, summary: Optional[Dict] = None) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'olusturulma': datetime.now().isoformat(timespec='seconds'),
+            **self.to_dict(),
+            'ozet': summary or {},
+            'olaylar': self.events,
+        }
+        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2, default=str), encoding='utf-8')
+        logger.info(f"🧾 Çözücü izi yazıldı: {path}")
+        return path
@@ -0,0 +1,168 @@
+import logging
+import threading
+import time as time_module
+from datetime import timedelta
+from typing import Dict, List, Mapping, Optional, Tuple
+from src.core.db_raw import Database
+from src.core.room_occupancy import RoomOccupancy, StudentOccupancy
+from src.core.scheduler import ExamScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class JointScheduler:
+    # Birden fazla bölümün programı ortak derslik havuzunda, derslik talebi büyükten küçüğe sırayla çözülür.
+    # Her program çözülürken öncekilerin ve kayıtlı diğer programların derslik-zaman rezervasyonları dolu,
+    # ortak öğrencilerinin sınavda olduğu dilimler (min gün kuralında günler) o öğrencilerin derslerine kapalıdır
+
+    def __init__(self, db: Database, schedule_courses: Mapping[int, List[int]], classroom_ids: List[int]):
+        self.db = db
+        self.schedule_courses = {schedule_id: list(course_ids) for schedule_id, course_ids in schedule_courses.items()}
+        self.classroom_ids = list(classroom_ids)
+        self.schedulers: Dict[int, ExamScheduler] = {
+            schedule_id: ExamScheduler(db, schedule_id) for schedule_id in self.schedule_courses
+        }
+        self.occupancy = RoomOccupancy()
+        self.students = StudentOccupancy()
+        self.external_bookings = 0
+        self.results: Dict[int, bool] = {}
+        self.solve_order: List[int] = []
+        self.cancel_event = threading.Event()
+        self.elapsed = 0.0
+
+    def prepare_data(self, course_durations: Optional[Dict[int, int]] = None):
+        logger.info(f"🏛️ Ortak zamanlama: {len(self.schedulers)} program, {len(self.classroom_ids)} derslik")
+        for schedule_id, scheduler in self.schedulers.items():
+            scheduler.cancel_event = self.cancel_event
+            scheduler.prepare_data(self.schedule_courses[schedule_id], self.classroom_ids, course_durations)
+
+        # Ortak çözüme girmeyen programların kayıtlı sınavları baştan rezervasyondur
+        schedules = [scheduler.exam_schedule for scheduler in self.schedulers.values()]
+        start_date = min(ExamScheduler._to_date(s['start_date']) for s in schedules) if schedules else None
+        end_date = max(ExamScheduler._to_date(s['end_date']) for s in schedules) if schedules else None
+        self.occupancy = RoomOccupancy.from_database(
+            self.db,
+            classroom_ids=self.classroom_ids,
+            start_date=start_date,
+            end_date=end_date,
+            exclude_schedule_ids=list(self.schedulers)
+        )
+        self.external_bookings = self.occupancy.booking_count
+
+        # Öğrenci sınavlarına min gün kuralı yüzünden dönem sınırının ötesinde de bakılır
+        if schedules:
+            min_days = max(s.get('min_days_between_exams') or 0 for s in schedules)
+            margin = timedelta(days=max(min_days - 1, 0))
+            start_date, end_date = start_date - margin, end_date + margin
+        self.students = StudentOccupancy.from_database(
+            self.db,
+            start_date=start_date,
+            end_date=end_date,
+            exclude_schedule_ids=list(self.schedulers)
+        )
+
+    def room_demand(self, schedule_id: int) -> int:
+        # Derslik-zaman talebi: öğrenci × dilim; talebi büyük program derslikleri önce alır
+        scheduler = self.schedulers[schedule_id]
+        return sum(
+            scheduler.course_student_counts.get(c['id'], 0) * scheduler.course_quanta.get(c['id'], 1)
+            for c in scheduler.courses
+        )
+
+    def solve(self, time_limit_seconds: int = 300, strategy: str = 'greedy',
+              backtracking: bool = True, anneal: bool = False, workers: int = 1) -> bool:
+        started_at = time_module.perf_counter()
+        deadline = time_module.monotonic() + time_limit_seconds if time_limit_seconds else None
+        self.solve_order = sorted(self.schedulers, key=lambda schedule_id: (-self.room_demand(schedule_id), schedule_id))
+        self.results = {}
+
+        for i, schedule_id in enumerate(self.solve_order, 1):
+            scheduler = self.schedulers[schedule_id]
+            if self.cancel_event.is_set():
+                break
+
+            remaining = None
+            if deadline is not None:
+                remaining = max(int(deadline - time_module.monotonic()), 1)
+            logger.info(
+                f"\n🏛️ [{i}/{len(self.solve_order)}] {scheduler.exam_schedule['name']}: "
+                f"{len(scheduler.courses)} ders"
+            )
+
+            scheduler.reserve_rooms(self.occupancy.busy)
+            scheduler.reserve_students(self.students.busy)
+            groups = scheduler.parallel_groups() if workers > 1 else []
+            if len(groups) > 1:
+                success = scheduler.solve_decomposed(
+                    workers=workers, time_limit_seconds=remaining, strategy=strategy,
+                    backtracking=backtracking, anneal=anneal, groups=groups
+                )
+            else:
+                success = scheduler.solve(
+                    time_limit_seconds=remaining, strategy=strategy,
+                    backtracking=backtracking, anneal=anneal
+                )
+            self.occupancy.add_assignments(scheduler)
+            self.students.add_assignments(scheduler)
+            self.results[schedule_id] = success
+
+        self.elapsed = time_module.perf_counter() - started_at
+        success = len(self.results) == len(self.schedulers) and all(self.results.values())
+        placed = sum(len(s.course_assignments) for s in self.schedulers.values())
+        total = sum(len(s.courses) for s in self.schedulers.values())
+        if success:
+            logger.info(f"\n✨ Ortak zamanlama tamamlandı: {placed} ders, {self.elapsed:.2f} saniye")
+        else:
+            logger.error(f"\n❌ Ortak zamanlama eksik: {total - placed} ders yerleştirilemedi")
+        return success
+
+    def save_solution(self):
+        for schedule_id in self.solve_order:
+            if self.results.get(schedule_id):
+                self.schedulers[schedule_id].save_solution()
+
+    def get_statistics(self) -> Dict:
+        schedules = {schedule_id: scheduler.get_statistics() for schedule_id, scheduler in self.schedulers.items()}
+        return {
+            'program_sayisi': len(self.schedulers),
+            'toplam_ders': sum(stats['toplam_ders'] for stats in schedules.values()),
+            'yerlestirildi': sum(stats['yerlestirildi'] for stats in schedules.values()),
+            'toplam_derslik': len(self.classroom_ids),
+            'dis_rezervasyon': self.external_bookings,
+            'cozum_sirasi': list(self.solve_order),
+            'cozum_suresi': self.elapsed,
+            'programlar': schedules,
+            'durum': 'OPTIMAL' if self.results and all(self.results.values())
+                     and len(self.results) == len(self.schedulers) else 'PARTIAL',
+        }
+
+
+def schedule_departments(
+    db: Database,
+    schedule_courses: Mapping[int, List[int]],
+    classroom_ids: List[int],
+    time_limit_seconds: int = 300,
+    strategy: str = 'greedy',
+    anneal: bool = False,
+    workers: int = 1,
+    course_durations: Optional[Dict[int, int]] = None,
+    cancel_event: Optional[threading.Event] = None
+) -> Tuple[bool, Optional[Dict]]:
+
+    try:
+        joint = JointScheduler(db, schedule_courses, classroom_ids)
+        if cancel_event is not None:
+            joint.cancel_event = cancel_event
+        joint.prepare_data(course_durations)
+        success = joint.solve(
+            time_limit_seconds=time_limit_seconds,
+            strategy=strategy,
+            anneal=anneal,
+            workers=workers
+        )
+        joint.save_solution()
+        return success, joint.get_statistics()
+
+    except Exception as e:
+        logger.error(f"Ortak zamanlama hatası: {e}", exc_info=True)
+        return False, None
@@ -0,0 +1,153 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import CancelledError, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.scheduler import ExamScheduler
+
+logger = logging.getLogger(__name__)
+
+_worker_snapshot: Optional[Dict] = None
+_worker_stop_event = None
+
+
+def _quiet_worker(stop_event=None):
+    # İptal olayı süreç oluşturulurken devralınır; çalışan işçinin arama döngüleri onu denetler
+    global _worker_stop_event
+    _worker_stop_event = stop_event
+    logging.getLogger('src.core').setLevel(logging.WARNING)
+
+
+def _init_worker(snapshot: Dict, stop_event=None):
+    # Kayıt verisi her işçiye bir kez gönderilir; görevler sadece tohum taşır
+    global _worker_snapshot
+    _worker_snapshot = snapshot
+    _quiet_worker(stop_event)
+
+
+def _worker_scheduler(snapshot: Dict) -> 'ExamScheduler':
+    from src.core.scheduler import ExamScheduler
+
+    scheduler = ExamScheduler.from_snapshot(snapshot)
+    if _worker_stop_event is not None:
+        scheduler.cancel_event = _worker_stop_event
+    return scheduler
+
+
+def _solve_worker(seed: Optional[int], solve_options: Dict) -> Dict:
+    scheduler = _worker_scheduler(_worker_snapshot)
+    scheduler.solve(seed=seed, **solve_options)
+    return export_result(scheduler, seed)
+
+
+def _solve_component_worker(snapshot: Dict, solve_options: Dict) -> Dict:
+    scheduler = _worker_scheduler(snapshot)
+    scheduler.solve(**solve_options)
+    return export_result(scheduler, None)
+
+
+def export_result(scheduler: 'ExamScheduler', seed: Optional[int]) -> Dict:
+    return {
+        'seed': seed,
+        'score': scheduler.result_score(),
+        'assignments': {
+            course_id: (a['slot_idx'], list(a['classroom_ids']))
+            for course_id, a in scheduler.course_assignments.items()
+        },
+        'total_attempts': scheduler.total_attempts,
+        'rejections': dict(scheduler.instrumentation.rejections),
+        'probe_rejections': dict(scheduler.instrumentation.probe_rejections),
+    }
+
+
+def run_multi_start(scheduler: 'ExamScheduler', workers: Optional[int] = None,
+                    starts: Optional[int] = None, **solve_options) -> Tuple[Optional[Dict], List[Dict]]:
+    workers = workers or os.cpu_count() or 1
+    starts = starts or workers
+    snapshot = scheduler.to_snapshot()
+
+    logger.info(f"🧵 Çoklu başlangıç: {starts} deneme, {workers} işçi süreç")
+
+    results: List[Dict] = []
+    best: Optional[Dict] = None
+
+    stop_event = multiprocessing.get_context().Event()
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(snapshot, stop_event))
+    try:
+        # İlk deneme tohumsuz (deterministik) sıradır, diğerleri sarsılmış sıralar
+        seeds = [None] + list(range(1, starts))
+        pending = {executor.submit(_solve_worker, seed, solve_options) for seed in seeds}
+
+        while pending:
+            if scheduler.cancel_event.is_set() and not stop_event.is_set():
+                logger.warning("⏹️ Çoklu başlangıç iptal edildi, çalışan denemelerin o ana kadarki sonuçları kullanılacak")
+                _stop_workers(stop_event, pending)
+
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except CancelledError:
+                    continue
+                except Exception as e:
+                    logger.error(f"İşçi süreç hatası: {e}", exc_info=True)
+                    continue
+
+                results.append(result)
+                if best is None or result['score'] > best['score']:
+                    best = result
+                    logger.info(
+                        f"  ✓ Tohum {result['seed']}: {len(result['assignments'])}/{len(scheduler.courses)} ders "
+                        f"(en iyi)"
+                    )
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return best, results
+
+
+def run_components(scheduler: 'ExamScheduler', groups: List[List[int]], workers: Optional[int] = None,
+                   **solve_options) -> List[Dict]:
+    # Ortak öğrencisi olmayan ders grupları ayrı süreçlerde çözülür;
+    # seviye günü ve derslik çakışmaları çağıran tarafta uzlaştırılır
+    workers = min(workers or os.cpu_count() or 1, len(groups))
+    logger.info(f"🧩 {len(groups)} bağımsız ders grubu, {workers} işçi süreç")
+
+    results: List[Dict] = []
+    stop_event = multiprocessing.get_context().Event()
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_quiet_worker, initargs=(stop_event,))
+    try:
+        # Büyük gruplar önce gönderilir: en uzun iş en erken başlar
+        pending = {
+            executor.submit(_solve_component_worker, scheduler.to_snapshot(set(group)), solve_options)
+            for group in sorted(groups, key=len, reverse=True)
+        }
+
+        while pending:
+            if scheduler.cancel_event.is_set() and not stop_event.is_set():
+                logger.warning("⏹️ Bileşen çözümü iptal edildi, grupların o ana kadarki yerleşimleri kullanılacak")
+                _stop_workers(stop_event, pending)
+
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results.append(future.result())
+                except CancelledError:
+                    continue
+                except Exception as e:
+                    logger.error(f"İşçi süreç hatası: {e}", exc_info=True)
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return results
+
+
+def _stop_workers(stop_event, pending):
+    # Başlamamış görevler iptal edilir; çalışanlar olayı ilk denetimde görüp kısmi sonuçlarını döndürür
+    stop_event.set()
+    for future in pending:
+        future.cancel()
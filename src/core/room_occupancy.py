@@ -0,0 +1,281 @@
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+from src.core.db_raw import Database
+
+if TYPE_CHECKING:
+    from src.core.scheduler import ExamScheduler
+
+logger = logging.getLogger(__name__)
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def quantum_span(start_time, minutes: int) -> int:
+    # Gün başlangıcından itibaren 15 dakikalık dilim bitleri; ızgaraya oturmayan saatler dışa yuvarlanır
+    from src.core.scheduler import DAY_START_TIME, TIME_QUANTUM_MINUTES
+
+    if not isinstance(start_time, time):
+        start_time = time.fromisoformat(str(start_time))
+    offset = (start_time.hour * 60 + start_time.minute) - (DAY_START_TIME.hour * 60 + DAY_START_TIME.minute)
+    first = max(offset // TIME_QUANTUM_MINUTES, 0)
+    last = -(-(offset + minutes) // TIME_QUANTUM_MINUTES)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def blocked_start_ranges(busy_ranges, duration: int, wait_duration: int):
+    # [s, e) meşgul aralığı, d dakikalık bir sınavın (s - d, e + bekleme) açık aralığındaki başlangıçlarını kapatır;
+    # kesişen aralıklar birleştirilir (uç noktaları eşit olanlar birleşmez, o an serbesttir)
+    lows, highs = [], []
+    for start, end in sorted(busy_ranges):
+        low, high = start - duration, end + wait_duration
+        if highs and low < highs[-1]:
+            if high > highs[-1]:
+                highs[-1] = high
+        else:
+            lows.append(low)
+            highs.append(high)
+    return lows, highs
+
+
+def earliest_free_start(lows, highs, minute: int) -> int:
+    # minute kapalı bir aralıktaysa aralığın sonu, değilse kendisi
+    idx = bisect_left(lows, minute) - 1
+    if idx >= 0 and minute < highs[idx]:
+        return highs[idx]
+    return minute
+
+
+def first_blocked_step(lows, highs, minute: int, step: int, latest: int):
+    # minute + k * step (k >= 1, en geç latest) adımlarından kapalı bir aralığa düşen ilki
+    for idx in range(bisect_right(highs, minute + step), len(lows)):
+        low, high = lows[idx], highs[idx]
+        candidate = minute + step * max(1, (low - minute) // step + 1)
+        if candidate > latest:
+            return None
+        if candidate < high:
+            return candidate
+    return None
+
+
+class RoomOccupancy:
+    # (derslik, gün) → dolu dilim bitleri; tüm programlar aynı gün içi ızgarayı kullandığından
+    # farklı programların rezervasyonları tek indekste birleşir ve kesişim tek AND işlemidir
+
+    def __init__(self):
+        self.busy: Dict[Tuple[int, date], int] = {}
+        self.booking_count = 0
+
+    @classmethod
+    def from_database(cls, db: Database, classroom_ids: Optional[Iterable[int]] = None,
+                      start_date=None, end_date=None,
+                      exclude_schedule_ids: Iterable[int] = ()) -> 'RoomOccupancy':
+        # Kayıtlı programların derslik oturumları (sınav süresi + programın arası) indekse yüklenir
+        query = """
+            SELECT es.classroom_id, e.exam_date, e.start_time, e.duration,
+                   COALESCE(s.default_break_duration, 0) AS break_duration
+            FROM exam_sessions es
+            JOIN exams e ON e.id = es.exam_id
+            JOIN exam_schedules s ON s.id = e.schedule_id
+            WHERE e.exam_date IS NOT NULL AND e.start_time IS NOT NULL
+        """
+        params: List = []
+        if start_date is not None:
+            query += " AND e.exam_date >= ?"
+            params.append(_to_date(start_date).isoformat())
+        if end_date is not None:
+            query += " AND e.exam_date <= ?"
+            params.append(_to_date(end_date).isoformat())
+        exclude_schedule_ids = list(exclude_schedule_ids)
+        if exclude_schedule_ids:
+            query += f" AND e.schedule_id NOT IN ({','.join('?' * len(exclude_schedule_ids))})"
+            params.extend(exclude_schedule_ids)
+        if classroom_ids is not None:
+            classroom_ids = list(classroom_ids)
+            if not classroom_ids:
+                return cls()
+            query += f" AND es.classroom_id IN ({','.join('?' * len(classroom_ids))})"
+            params.extend(classroom_ids)
+
+        occupancy = cls()
+        for row in db.fetch_all(query, tuple(params)):
+            occupancy.add(
+                row['classroom_id'], _to_date(row['exam_date']),
+                quantum_span(row['start_time'], (row['duration'] or 0) + row['break_duration'])
+            )
+
+        logger.info(
+            f"  ✓ Derslik doluluk indeksi: {occupancy.booking_count} oturum, "
+            f"{len(occupancy.busy)} derslik-gün"
+        )
+        return occupancy
+
+    def add(self, classroom_id: int, day: date, mask: int):
+        if not mask:
+            return
+        key = (classroom_id, day)
+        self.busy[key] = self.busy.get(key, 0) | mask
+        self.booking_count += 1
+
+    def reserve(self, classroom_id: int, day, start_time, minutes: int):
+        self.add(classroom_id, _to_date(day), quantum_span(start_time, minutes))
+
+    def add_assignments(self, scheduler: 'ExamScheduler'):
+        # Çözülen programın yerleşimleri sonraki programlar için rezervasyon olur
+        for course_id, assignment in scheduler.course_assignments.items():
+            slot_idx = assignment['slot_idx']
+            span = scheduler._room_span(slot_idx, scheduler.course_quanta.get(course_id, 1))
+            slot_date = scheduler.slot_to_date[slot_idx]
+            for classroom_id in assignment['classroom_ids']:
+                self.add(classroom_id, slot_date, span)
+
+    def mask(self, classroom_id: int, day) -> int:
+        return self.busy.get((classroom_id, _to_date(day)), 0)
+
+    def is_free(self, classroom_id: int, day, start_time, minutes: int) -> bool:
+        return not self.mask(classroom_id, day) & quantum_span(start_time, minutes)
+
+    def free_classrooms(self, classroom_ids: Iterable[int], day, start_time, minutes: int) -> List[int]:
+        day = _to_date(day)
+        span = quantum_span(start_time, minutes)
+        return [
+            classroom_id for classroom_id in classroom_ids
+            if not self.busy.get((classroom_id, day), 0) & span
+        ]
+
+
+class StudentOccupancy:
+    # öğrenci → gün → sınavda olduğu dilim bitleri (sınav süresi + programın arası). Başka programlarda
+    # sınavı olan öğrencilerin bu dilimleri, aynı öğrencilerin bu programdaki sınavlarına kapalıdır
+
+    def __init__(self):
+        self.busy: Dict[int, Dict[date, int]] = {}
+        self.exam_count = 0
+
+    @classmethod
+    def from_database(cls, db: Database, start_date=None, end_date=None,
+                      exclude_schedule_ids: Iterable[int] = ()) -> 'StudentOccupancy':
+        # Kayıtlı programların sınavları, derse kayıtlı her öğrenci için indekse yüklenir
+        query = """
+            SELECT sc.student_id, e.exam_date, e.start_time, e.duration,
+                   COALESCE(s.default_break_duration, 0) AS break_duration
+            FROM exams e
+            JOIN student_courses sc ON sc.course_id = e.course_id
+            JOIN exam_schedules s ON s.id = e.schedule_id
+            WHERE e.exam_date IS NOT NULL AND e.start_time IS NOT NULL
+        """
+        params: List = []
+        if start_date is not None:
+            query += " AND e.exam_date >= ?"
+            params.append(_to_date(start_date).isoformat())
+        if end_date is not None:
+            query += " AND e.exam_date <= ?"
+            params.append(_to_date(end_date).isoformat())
+        exclude_schedule_ids = list(exclude_schedule_ids)
+        if exclude_schedule_ids:
+            query += f" AND e.schedule_id NOT IN ({','.join('?' * len(exclude_schedule_ids))})"
+            params.extend(exclude_schedule_ids)
+
+        occupancy = cls()
+        for row in db.fetch_all(query, tuple(params)):
+            occupancy.add(
+                row['student_id'], _to_date(row['exam_date']),
+                quantum_span(row['start_time'], (row['duration'] or 0) + row['break_duration'])
+            )
+
+        logger.info(f"  ✓ Öğrenci doluluk indeksi: {len(occupancy.busy)} öğrencinin {occupancy.exam_count} sınavı")
+        return occupancy
+
+    def add(self, student_id: int, day: date, mask: int):
+        if not mask:
+            return
+        days = self.busy.setdefault(student_id, {})
+        days[day] = days.get(day, 0) | mask
+        self.exam_count += 1
+
+    def add_assignments(self, scheduler: 'ExamScheduler'):
+        # Çözülen programın öğrencileri sonraki programlarda o dilimlerde meşguldür
+        for course_id, assignment in scheduler.course_assignments.items():
+            slot_idx = assignment['slot_idx']
+            span = scheduler._room_span(slot_idx, scheduler.course_quanta.get(course_id, 1))
+            slot_date = scheduler.slot_to_date[slot_idx]
+            for student_id in scheduler.course_students.get(course_id, ()):
+                self.add(student_id, slot_date, span)
+
+
+class RoomCalendar:
+    # Dakika hassasiyetinde gün → başlangıca göre sıralı rezervasyonlar (başlangıç, bitiş, derslikler).
+    # Bir rezervasyon en fazla max_length sürdüğünden [t, t + d) ile kesişenler başlangıcı
+    # (t - max_length, t + d) aralığında olanlardır; derslik listesi taranmaz
+
+    def __init__(self, capacities: Dict[int, int]):
+        self.capacities = dict(capacities)
+        self.total_capacity = sum(self.capacities.values())
+        self.starts: Dict[date, List[int]] = {}
+        self.bookings: Dict[date, List[Tuple[int, int, Tuple[int, ...]]]] = {}
+        self.ends: Dict[date, List[int]] = {}
+        self.max_length = 0
+
+    def book(self, day: date, start: int, end: int, classroom_ids: Iterable[int]):
+        starts = self.starts.setdefault(day, [])
+        idx = bisect_right(starts, start)
+        starts.insert(idx, start)
+        self.bookings.setdefault(day, []).insert(idx, (start, end, tuple(classroom_ids)))
+        ends = self.ends.setdefault(day, [])
+        ends.insert(bisect_right(ends, end), end)
+        self.max_length = max(self.max_length, end - start)
+
+    def _overlapping(self, day: date, start: int, end: int):
+        starts = self.starts.get(day)
+        if not starts:
+            return
+        bookings = self.bookings[day]
+        for idx in range(bisect_right(starts, start - self.max_length), bisect_left(starts, end)):
+            if bookings[idx][1] > start:
+                yield bookings[idx]
+
+    def busy_classrooms(self, day: date, start: int, end: int) -> Set[int]:
+        busy: Set[int] = set()
+        for _, _, classroom_ids in self._overlapping(day, start, end):
+            busy.update(classroom_ids)
+        return busy
+
+    def free_capacity(self, day: date, start: int, end: int) -> int:
+        return self.total_capacity - sum(
+            self.capacities.get(classroom_id, 0) for classroom_id in self.busy_classrooms(day, start, end)
+        )
+
+    def next_free_start(self, day: date, start: int, duration: int, seats: int,
+                        step: int, latest: int) -> Optional[int]:
+        # start + k * step (k >= 1, en geç latest) başlangıçlarından boş kapasitesi seats'i karşılayan ilki.
+        # Pencereden rezervasyon yalnızca bitişinde çıkar; iki bitiş arasında kapasite artmadığından
+        # yalnızca ilk adım ve bitişlerin ızgaraya yuvarlandığı adımlar denenir
+        first = start + step
+        candidates = [first]
+        ends = self.ends.get(day, [])
+        for end in ends[bisect_right(ends, first):]:
+            candidate = start + -(-(end - start) // step) * step
+            if candidate > latest:
+                break
+            if candidate != candidates[-1]:
+                candidates.append(candidate)
+
+        for candidate in candidates:
+            if candidate > latest:
+                break
+            if self.free_capacity(day, candidate, candidate + duration) >= seats:
+                return candidate
+        return None
+
+    def earliest_end_covering(self, day: date, minute: int) -> Optional[int]:
+        # minute anında süren rezervasyonların en erken bitişi
+        return min((end for _, end, _ in self._overlapping(day, minute, minute + 1)), default=None)
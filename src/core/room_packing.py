@@ -0,0 +1,73 @@
+import logging
+from collections import defaultdict
+from typing import Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def pack_rooms(rooms: Sequence[Dict], student_count: int) -> List[Dict]:
+    # Öğrencileri sığdıran derslik alt kümesi: önce en az derslik, eşitlikte en az boş koltuk.
+    # Aynı kapasiteli derslikler tek kovada toplanır; arama her kovadan kaç derslik
+    # alınacağını seçer ve kalan seçimlerin en büyük/en küçük toplamlarıyla budanır.
+    need = max(student_count, 1)
+
+    buckets: Dict[int, List[Dict]] = defaultdict(list)
+    for room in rooms:
+        if room['capacity'] > 0:
+            buckets[room['capacity']].append(room)
+
+    capacities = sorted(buckets, reverse=True)
+    counts = [len(buckets[capacity]) for capacity in capacities]
+
+    # Kapasiteler büyükten küçüğe düz dizi ve önek toplamları: sınırlar O(1) hesaplanır
+    flat: List[int] = []
+    bucket_start: List[int] = []
+    for capacity, count in zip(capacities, counts):
+        bucket_start.append(len(flat))
+        flat.extend([capacity] * count)
+    prefix = [0]
+    for capacity in flat:
+        prefix.append(prefix[-1] + capacity)
+
+    if prefix[-1] < need:
+        return []
+
+    # En az derslik sayısı: en büyük derslikler sırayla alınarak bulunur
+    room_count = next(k for k in range(1, len(flat) + 1) if prefix[k] >= need)
+
+    total_rooms = len(flat)
+    bucket_count = len(capacities)
+    best_total = prefix[room_count] + 1
+    best_takes: List[int] = []
+    takes = [0] * bucket_count
+
+    def search(bucket: int, remaining: int, total: int):
+        nonlocal best_total, best_takes
+        if remaining == 0:
+            if need <= total < best_total:
+                best_total = total
+                best_takes = list(takes)
+            return
+
+        start = bucket_start[bucket] if bucket < bucket_count else total_rooms
+        if total_rooms - start < remaining:
+            return
+        if total + prefix[start + remaining] - prefix[start] < need:
+            return
+        if total + prefix[total_rooms] - prefix[total_rooms - remaining] >= best_total:
+            return
+
+        capacity = capacities[bucket]
+        for take in range(min(counts[bucket], remaining), -1, -1):
+            takes[bucket] = take
+            search(bucket + 1, remaining - take, total + take * capacity)
+            if best_total == need:
+                break
+        takes[bucket] = 0
+
+    search(0, room_count, 0)
+
+    selected: List[Dict] = []
+    for capacity, take in zip(capacities, best_takes):
+        selected.extend(buckets[capacity][:take])
+    return selected
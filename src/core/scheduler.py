@@ -1,13 +1,41 @@
 import logging
-from datetime import datetime, timedelta, time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, time
 from collections import defaultdict
-from typing import List, Dict, Tuple, Optional, Set
+from typing import Callable, Collection, List, Dict, Tuple, Optional, Set, FrozenSet, Mapping
+from pathlib import Path
+import heapq
+from bisect import bisect_left, bisect_right
 import random
 import itertools
+import threading
+import time as time_module
 from src.core.db_raw import Database
+from src.core.conflict_graph import ConflictGraph, conflict_graph_path
+from src.core.backtracking import BacktrackingSearch
+from src.core.annealing import ScheduleAnnealer, DEFAULT_MAX_MOVES
+from src.core.parallel_solver import run_components, run_multi_start
+from src.core.room_packing import pack_rooms
+from src.core.instrumentation import SolverInstrumentation, solver_trace_path
+from src.core.solution_cache import SolutionCache
+from src.core.feasibility import check_feasibility
+from src.core.room_occupancy import RoomOccupancy, StudentOccupancy
+from src.core.cpsat_backend import HAS_ORTOOLS, solve_cpsat
 
 logger = logging.getLogger(__name__)
 
+SOLVE_STRATEGIES = ('greedy', 'dsatur', 'cpsat')
+ANYTIME_STALL_ITERATIONS = 200
+PRIORITY_JITTER = 0.15
+COMPONENT_MIN_COURSES = 20
+PROGRESS_INTERVAL_SECONDS = 0.1
+
+# Zaman ekseni: her gün DAY_START_TIME - DAY_END_TIME arası TIME_QUANTUM_MINUTES'lık dilimler
+TIME_QUANTUM_MINUTES = 15
+DAY_START_TIME = time(9, 0)
+DAY_END_TIME = time(21, 0)
+DEFAULT_EXAM_DURATION = 75
+
 
 class ExamScheduler:
     
@@ -23,26 +51,142 @@ class ExamScheduler:
             raise ValueError(f"ExamSchedule ID {exam_schedule_id} bulunamadı")
         
         self.exam_schedule = dict(exam_schedule_row)
-        
+        self._init_state()
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict, db: Optional[Database] = None) -> 'ExamScheduler':
+        # Veritabanına gitmeden, to_snapshot() çıktısından zamanlayıcı kurar (işçi süreçler için)
+        scheduler = cls.__new__(cls)
+        scheduler.db = db
+        scheduler.exam_schedule = dict(snapshot['exam_schedule'])
+        scheduler._init_state()
+
+        scheduler.courses = [dict(c) for c in snapshot['courses']]
+        scheduler.classrooms = [dict(c) for c in snapshot['classrooms']]
+        scheduler.custom_durations = dict(snapshot.get('course_durations', {}))
+        scheduler._generate_time_slots()
+        for student_id, course_ids in snapshot['student_courses'].items():
+            scheduler.student_courses[student_id] = list(course_ids)
+        scheduler._build_course_index()
+        scheduler._build_conflict_graph()
+        scheduler._calculate_student_counts()
+        scheduler._calculate_course_lengths()
+        scheduler.reserve_rooms(snapshot.get('reserved_room_busy', {}))
+        scheduler.reserved_start_masks = dict(snapshot.get('reserved_start_masks', {}))
+        return scheduler
+
+    def to_snapshot(self, course_ids: Optional[Set[int]] = None) -> Dict:
+        # course_ids verilirse sadece o derslerin alt problemi (bileşen çözümü için)
+        if course_ids is None:
+            return {
+                'exam_schedule': dict(self.exam_schedule),
+                'courses': [dict(c) for c in self.courses],
+                'classrooms': [dict(c) for c in self.classrooms],
+                'student_courses': {sid: list(cids) for sid, cids in self.student_courses.items()},
+                'course_durations': dict(self.custom_durations),
+                'reserved_room_busy': dict(self.reserved_room_busy),
+                'reserved_start_masks': dict(self.reserved_start_masks),
+            }
+
+        student_courses = {}
+        for sid, cids in self.student_courses.items():
+            selected = [course_id for course_id in cids if course_id in course_ids]
+            if selected:
+                student_courses[sid] = selected
+        return {
+            'exam_schedule': dict(self.exam_schedule),
+            'courses': [dict(c) for c in self.courses if c['id'] in course_ids],
+            'classrooms': [dict(c) for c in self.classrooms],
+            'student_courses': student_courses,
+            'course_durations': {
+                course_id: duration for course_id, duration in self.custom_durations.items() if course_id in course_ids
+            },
+            'reserved_room_busy': dict(self.reserved_room_busy),
+            'reserved_start_masks': {
+                course_id: mask for course_id, mask in self.reserved_start_masks.items() if course_id in course_ids
+            },
+        }
+
+    def _init_state(self):
         self.courses: List[Dict] = []
         self.classrooms: List[Dict] = []
         self.time_slots: List[Tuple[datetime, int]] = []
         self.student_courses: Dict[int, List[int]] = defaultdict(list)
+        self.course_students: Dict[int, FrozenSet[int]] = {}
+        self.conflict_graph: ConflictGraph = ConflictGraph()
         self.course_student_counts: Dict[int, int] = {}
         self.course_class_levels: Dict[int, str] = {}
         self.slot_to_date: Dict[int, datetime] = {}
+        self.date_to_slots: Dict[date, List[int]] = defaultdict(list)
+
+        # Süreler: dersin sınav süresi ve (ara dahil) kapladığı dilim sayısı
+        self.custom_durations: Dict[int, int] = {}
+        self.exam_durations: Dict[int, int] = {}
+        self.course_exam_quanta: Dict[int, int] = {}
+        self.course_quanta: Dict[int, int] = {}
+        self.quanta_per_day = 0
+        self.slot_quanta: Dict[int, int] = {}
+        self.day_first_slot: Dict[date, int] = {}
         
         self.course_assignments: Dict[int, Dict] = {}
         self.slot_usage: Dict[int, Set[int]] = defaultdict(set)
+        # Aynı slotta sınava başlayan öğrencilerin birleşimi (aynı başlangıçlı çakışma tek küme testi)
+        self.slot_students: Dict[int, Set[int]] = defaultdict(set)
+        self.date_usage: Dict[date, Set[int]] = defaultdict(set)
         self.classroom_slot_usage: Dict[Tuple[int, int], int] = {}
+        self.room_busy: Dict[Tuple[int, date], int] = {}
+        # Başka programların derslik rezervasyonları: yerleşimler sıfırlansa da korunur
+        self.reserved_room_busy: Dict[Tuple[int, date], int] = {}
+        # Başka programlarda sınavı olan öğrenciler yüzünden dersin kapalı başlangıç slotları
+        self.reserved_start_masks: Dict[int, int] = {}
         self.date_class_level_usage: Dict[Tuple, Set[int]] = defaultdict(set)
+
+        # Slot uygunluk bit maskeleri: bit i = slot (dilim başlangıcı) i
+        self.min_days_between = 0
+        self.exam_day_ordinals: List[int] = []
+        self.day_slot_masks: Dict[date, int] = {}
+        self.window_dates: Dict[date, List[date]] = {}
+        self.day_window_masks: Dict[date, int] = {}
+        self.start_masks: Dict[int, int] = {}
+        self._window_cache: Dict[Tuple[int, int, int], int] = {}
+        self.slot_block_sources: Dict[int, Dict[Tuple[int, int], int]] = {}
+        self.blocked_slot_masks: Dict[int, int] = defaultdict(int)
+        self.level_blocked_masks: Dict[str, int] = defaultdict(int)
+        self.track_slot_masks = True
         
         self.start_time = None
         self.end_time = None
         self.total_attempts = 0
+
+        self.cancel_event = threading.Event()
+        self.progress_callback: Optional[Callable[[Dict], None]] = None
+        self._last_progress_at = 0.0
+        self.deadline: Optional[float] = None
+        self.timed_out = False
+        self.iterations = 0
+        self.improvements: List[Dict] = []
+        self.placement_order: List[Dict] = []
+        self._solve_started_at: Optional[float] = None
+        self.annealing_stats: Dict = {}
+        self.soft_cost: Dict[str, float] = {}
+        self.multi_start_stats: Dict = {}
+        self.decomposition_stats: Dict = {}
+        self._priority_jitter: Dict[int, float] = {}
+        self.repair_stats: Dict = {}
+        self.instrumentation = SolverInstrumentation()
+        self.cache_key: Optional[str] = None
+        self.cache_hit = False
+        self.infeasibility_reasons: List[str] = []
         
-    def prepare_data(self, course_ids: List[int], classroom_ids: List[int]):
+    def prepare_data(self, course_ids: List[int], classroom_ids: List[int],
+                     course_durations: Optional[Dict[int, int]] = None):
+        with self.instrumentation.phase('veri_hazirlama'):
+            self._prepare_data(course_ids, classroom_ids, course_durations)
+
+    def _prepare_data(self, course_ids: List[int], classroom_ids: List[int],
+                      course_durations: Optional[Dict[int, int]]):
         logger.info("📊 Zamanlama verileri hazırlanıyor...")
+        self.custom_durations = dict(course_durations or {})
 
         if course_ids:
             placeholders = ','.join('?' * len(course_ids))
@@ -76,7 +220,93 @@ class ExamScheduler:
         self._load_student_courses()
         logger.info(f"  ✓ {len(self.student_courses)} öğrencinin ders kayıtları yüklendi")
 
+        self._build_conflict_graph()
         self._calculate_student_counts()
+        self._calculate_course_lengths()
+
+    def reserve_rooms(self, room_busy: Mapping[Tuple[int, date], int]):
+        # Dersliklerin bu programın günlerindeki dolu dilimleri; slot arayışında dolu sayılır
+        classroom_ids = {c['id'] for c in self.classrooms}
+        self.reserved_room_busy = {
+            key: mask for key, mask in room_busy.items()
+            if mask and key[0] in classroom_ids and key[1] in self.date_to_slots
+        }
+        for key, mask in self.reserved_room_busy.items():
+            self.room_busy[key] = self.room_busy.get(key, 0) | mask
+        if self.reserved_room_busy:
+            logger.info(f"  ✓ {len(self.reserved_room_busy)} derslik-gün başka programlarca kısmen dolu")
+
+    def reserve_shared_rooms(self):
+        # Aynı dersliklerde kayıtlı diğer programların sınavları
+        occupancy = RoomOccupancy.from_database(
+            self.db,
+            classroom_ids=[c['id'] for c in self.classrooms],
+            start_date=self.exam_schedule['start_date'],
+            end_date=self.exam_schedule['end_date'],
+            exclude_schedule_ids=[self.exam_schedule['id']]
+        )
+        self.reserve_rooms(occupancy.busy)
+
+    def reserve_students(self, student_busy: Mapping[int, Mapping[date, int]]):
+        # Öğrencinin başka programdaki sınavıyla kesişen başlangıçlar (min gün kuralında pencere günleri)
+        # o öğrencinin derslerine kapatılır
+        self.reserved_start_masks = {}
+        for course in self.courses:
+            course_id = course['id']
+            busy_days: Dict[date, int] = defaultdict(int)
+            for student_id in self.course_students.get(course_id, ()):
+                for day, mask in student_busy.get(student_id, {}).items():
+                    busy_days[day] |= mask
+
+            quanta = self.course_quanta.get(course_id, 1)
+            blocked = 0
+            for day, mask in busy_days.items():
+                blocked |= self._reserved_starts(day, mask, quanta)
+            if blocked:
+                self.reserved_start_masks[course_id] = blocked
+        if self.reserved_start_masks:
+            logger.info(f"  ✓ {len(self.reserved_start_masks)} dersin öğrencileri başka programlarda sınavda")
+
+    def _reserved_starts(self, day: date, busy_mask: int, quanta: int) -> int:
+        if self.min_days_between:
+            ordinal = day.toordinal()
+            return sum(
+                self.day_slot_masks[slot_date] for slot_date in self.date_to_slots
+                if abs(slot_date.toordinal() - ordinal) < self.min_days_between
+            )
+        first_slot = self.day_first_slot.get(day)
+        if first_slot is None:
+            return 0
+        # quanta dilimlik sınav [q, q + quanta) dolu bir dilimle kesişiyorsa q başlangıcı kapalıdır
+        starts = 0
+        for shift in range(quanta):
+            starts |= busy_mask >> shift
+        return (starts << first_slot) & self.day_slot_masks[day]
+
+    def reserve_shared_students(self):
+        # Diğer programlarda kayıtlı sınavı olan öğrenciler; min gün kuralı dönem sınırının ötesine de bakar
+        margin = timedelta(days=max(self.min_days_between - 1, 0))
+        occupancy = StudentOccupancy.from_database(
+            self.db,
+            start_date=self._to_date(self.exam_schedule['start_date']) - margin,
+            end_date=self._to_date(self.exam_schedule['end_date']) + margin,
+            exclude_schedule_ids=[self.exam_schedule['id']]
+        )
+        self.reserve_students(occupancy.busy)
+
+    def _build_conflict_graph(self):
+        self.conflict_graph = ConflictGraph.from_student_courses(
+            self.student_courses,
+            course_ids=[c['id'] for c in self.courses]
+        )
+        logger.info(
+            f"  ✓ Çakışma grafı: {self.conflict_graph.edge_count()} kenar, "
+            f"en yüksek derece {self.conflict_graph.max_degree()}"
+        )
+
+    def overlap_matrix(self):
+        # Ders × ders ortak öğrenci matrisi (CSR) ve satır → ders id eşlemesi; SciPy yoksa (None, [])
+        return self.conflict_graph.to_sparse()
         
     def _generate_time_slots(self):
         try:
@@ -86,49 +316,173 @@ class ExamScheduler:
             if not start_date or not end_date:
                 raise ValueError("Başlangıç ve bitiş tarihleri belirtilmemiş!")
 
+            start_date = self._to_date(start_date)
+            end_date = self._to_date(end_date)
+
             if not self.exam_schedule.get('allowed_days'):
                 logger.warning("allowed_days belirtilmemiş, varsayılan: Pazartesi-Cuma")
                 allowed_days = [0, 1, 2, 3, 4]
             else:
                 allowed_days = [int(d) for d in self.exam_schedule['allowed_days'].split(',')]
 
-            slot_times = [
-                time(9, 0),
-                time(13, 30)
-            ]
+            day_minutes = (
+                (DAY_END_TIME.hour * 60 + DAY_END_TIME.minute)
+                - (DAY_START_TIME.hour * 60 + DAY_START_TIME.minute)
+            )
+            self.quanta_per_day = day_minutes // TIME_QUANTUM_MINUTES
+            quantum = timedelta(minutes=TIME_QUANTUM_MINUTES)
             
             current_date = start_date
             slot_index = 0
             
+            # Her gün ardışık slot indeksleri alır: gün içi aralıklar bit kaydırmayla ifade edilir
             while current_date <= end_date:
                 if current_date.weekday() in allowed_days:
-                    for time_slot in slot_times:
-                        slot_datetime = datetime.combine(current_date, time_slot)
+                    self.day_first_slot[current_date] = slot_index
+                    day_start = datetime.combine(current_date, DAY_START_TIME)
+                    for quantum_idx in range(self.quanta_per_day):
+                        slot_datetime = day_start + quantum_idx * quantum
                         self.time_slots.append((slot_datetime, slot_index))
-                        self.slot_to_date[slot_index] = current_date.date()
+                        self.slot_to_date[slot_index] = current_date
+                        self.date_to_slots[current_date].append(slot_index)
+                        self.slot_quanta[slot_index] = quantum_idx
                         slot_index += 1
                 
                 current_date += timedelta(days=1)
+
+            self._build_slot_masks()
                 
         except Exception as e:
             logger.error(f"Zaman slotları oluşturma hatası: {str(e)}", exc_info=True)
             raise
+
+    def _build_slot_masks(self):
+        self.min_days_between = self.exam_schedule.get('min_days_between_exams') or 0
+        self.exam_day_ordinals = sorted(slot_date.toordinal() for slot_date in self.date_to_slots)
+        self.day_slot_masks = {
+            slot_date: sum(1 << slot_idx for slot_idx in slots)
+            for slot_date, slots in self.date_to_slots.items()
+        }
+        # min gün kuralında bir sınavın komşularına kapattığı günler
+        self.window_dates = {
+            slot_date: self._min_days_window(slot_date) for slot_date in self.date_to_slots
+        }
+        self.day_window_masks = {
+            slot_date: sum(self.day_slot_masks[other_date] for other_date in window)
+            for slot_date, window in self.window_dates.items()
+        }
+        self.start_masks = {}
+        self._window_cache = {}
+
+    def _calculate_course_lengths(self):
+        break_minutes = self.exam_schedule.get('default_break_duration') or 0
+        default_minutes = self.exam_schedule.get('default_exam_duration') or DEFAULT_EXAM_DURATION
+
+        for course in self.courses:
+            course_id = course['id']
+            minutes = (
+                self.custom_durations.get(course_id)
+                or course.get('default_duration')
+                or default_minutes
+            )
+            self.exam_durations[course_id] = minutes
+            self.course_exam_quanta[course_id] = -(-minutes // TIME_QUANTUM_MINUTES)
+            self.course_quanta[course_id] = -(-(minutes + break_minutes) // TIME_QUANTUM_MINUTES)
+
+    def _course_duration_minutes(self, course_id: int) -> int:
+        return self.exam_durations.get(course_id) or self.exam_schedule.get('default_exam_duration') or DEFAULT_EXAM_DURATION
+
+    def _course_start_mask(self, course_id: int) -> int:
+        # Sınavın gün bitmeden sona erdiği başlangıç slotları
+        exam_quanta = self.course_exam_quanta.get(course_id, 1)
+        mask = self.start_masks.get(exam_quanta)
+        if mask is None:
+            mask = 0
+            last_start = self.quanta_per_day - exam_quanta
+            if last_start >= 0:
+                day_starts = (1 << (last_start + 1)) - 1
+                for first_slot in self.day_first_slot.values():
+                    mask |= day_starts << first_slot
+            self.start_masks[exam_quanta] = mask
+        reserved = self.reserved_start_masks.get(course_id)
+        return mask & ~reserved if reserved else mask
+
+    def _neighbor_window(self, slot_idx: int, placed_quanta: int, other_quanta: int) -> int:
+        # slot_idx'te placed_quanta dilim süren sınav, other_quanta süren komşusuna hangi başlangıçları kapatır
+        key = (slot_idx, placed_quanta, other_quanta)
+        mask = self._window_cache.get(key)
+        if mask is None:
+            if self.min_days_between:
+                mask = self.day_window_masks[self.slot_to_date[slot_idx]]
+            else:
+                mask = self._overlap_window(slot_idx, placed_quanta, other_quanta)
+            self._window_cache[key] = mask
+        return mask
+
+    def _overlap_window(self, slot_idx: int, placed_quanta: int, other_quanta: int) -> int:
+        # Aralıklar kesişir: other_start ∈ [slot - other_quanta + 1, slot + placed_quanta - 1]
+        slot_date = self.slot_to_date[slot_idx]
+        low = max(slot_idx - other_quanta + 1, self.day_first_slot[slot_date])
+        span = slot_idx + placed_quanta - low
+        return (((1 << span) - 1) << low) & self.day_slot_masks[slot_date]
+
+    def _room_span(self, slot_idx: int, quanta: int) -> int:
+        return ((1 << quanta) - 1) << self.slot_quanta[slot_idx]
+
+    @staticmethod
+    def _to_date(value) -> date:
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return date.fromisoformat(str(value)[:10])
     
     def _load_student_courses(self):
-        student_course_rows = self.db.fetch_all("SELECT * FROM student_courses")
-        
-        course_ids_set = {c['id'] for c in self.courses}
-        for row in student_course_rows:
-            record = dict(row)
-            if record['course_id'] in course_ids_set:
-                self.student_courses[record['student_id']].append(record['course_id'])
+        # Ders filtresi SQL tarafında (geçici tablo ile birleştirme); satırlar imleçten akıtılır
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS selected_courses (id INTEGER PRIMARY KEY)")
+            cursor.execute("DELETE FROM selected_courses")
+            cursor.executemany(
+                "INSERT OR IGNORE INTO selected_courses (id) VALUES (?)",
+                ((c['id'],) for c in self.courses)
+            )
+
+            cursor.execute("""
+                SELECT sc.student_id, sc.course_id
+                FROM student_courses sc
+                JOIN selected_courses t ON t.id = sc.course_id
+            """)
+            for student_id, course_id in cursor:
+                self.student_courses[student_id].append(course_id)
+
+            cursor.execute("""
+                SELECT sc.course_id, COUNT(*)
+                FROM student_courses sc
+                JOIN selected_courses t ON t.id = sc.course_id
+                GROUP BY sc.course_id
+            """)
+            self.course_student_counts = {course_id: count for course_id, count in cursor}
+
+        self._build_course_index()
+
+    def _build_course_index(self):
+        # Ders → öğrenci ters indeksi: çakışma kontrolleri öğrenci listesini taramaz
+        course_students: Dict[int, Set[int]] = defaultdict(set)
+        for student_id, course_ids in self.student_courses.items():
+            for course_id in course_ids:
+                course_students[course_id].add(student_id)
+
+        self.course_students = {
+            c['id']: frozenset(course_students.get(c['id'], ()))
+            for c in self.courses
+        }
     
     def _calculate_student_counts(self):
         for course in self.courses:
-            student_count = sum(
-                1 for students in self.student_courses.values()
-                if course['id'] in students
-            )
+            student_count = self.course_student_counts.get(course['id'])
+            if student_count is None:
+                student_count = len(self.course_students.get(course['id'], ()))
             self.course_student_counts[course['id']] = student_count
             self.course_class_levels[course['id']] = course.get('class_level', '')
             logger.info(f"    • {course['code']} (Sınıf: {course.get('class_level', 'N/A')}): {student_count} öğrenci")
@@ -136,31 +490,69 @@ class ExamScheduler:
         total_students = sum(self.course_student_counts.values())
         logger.info(f"  ✓ Toplam {total_students} ders-öğrenci eşleşmesi")
     
-    def solve(self, time_limit_seconds: int = 300) -> bool:
+    def solve(self, time_limit_seconds: int = 300, strategy: str = 'greedy',
+              anytime: bool = False, seed: Optional[int] = None,
+              backtracking: bool = True, anneal: bool = False,
+              anneal_moves: int = DEFAULT_MAX_MOVES, precheck: bool = True,
+              search_workers: Optional[int] = None) -> bool:
+        if strategy not in SOLVE_STRATEGIES:
+            raise ValueError(f"Bilinmeyen zamanlama stratejisi: {strategy}")
+        if strategy == 'cpsat' and not HAS_ORTOOLS:
+            logger.warning("⚠️ OR-Tools kurulu değil, açgözlü çözücü kullanılıyor")
+            strategy = 'greedy'
+
         logger.info("🚀 Manuel zamanlama algoritması başlatılıyor...")
         logger.info(f"  📚 Ders sayısı: {len(self.courses)}")
         logger.info(f"  ⏰ Slot sayısı: {len(self.time_slots)}")
         logger.info(f"  🏫 Derslik sayısı: {len(self.classrooms)}")
+        logger.info(f"  🧭 Strateji: {strategy}{' (anytime)' if anytime else ''}")
         
         self.start_time = datetime.now()
+        self._solve_started_at = time_module.perf_counter()
+        self.deadline = time_module.monotonic() + time_limit_seconds if time_limit_seconds else None
+        self.timed_out = False
+        self.iterations = 0
+        self.improvements = []
 
-        sorted_courses = self._sort_courses_by_priority()
+        if precheck:
+            self._check_feasibility()
 
-        success = True
-        failed_courses = []
-        
-        for i, course in enumerate(sorted_courses, 1):
-            logger.info(f"\n[{i}/{len(sorted_courses)}] Ders yerleştiriliyor: {course['code']} ({course.get('name', 'N/A')})")
-            
-            if not self._assign_course_to_slot(course):
-                logger.error(f"  ❌ Ders yerleştirilemedi: {course['code']}")
-                failed_courses.append(course)
-                success = False
+        # Tohum verilirse öncelik anahtarları hafifçe sarsılır (rastgele açgözlü sıralama)
+        jitter_rng = random.Random(seed)
+        self._priority_jitter = {} if seed is None else {
+            c['id']: 1 + jitter_rng.uniform(-PRIORITY_JITTER, PRIORITY_JITTER) for c in self.courses
+        }
+
+        # Alt fazlar (siralama, geri_izleme, tavlama) cozum fazının içinde ayrıca ölçülür
+        with self.instrumentation.phase('cozum'):
+            if strategy == 'dsatur':
+                failed_courses = self._solve_dsatur()
+            elif strategy == 'cpsat':
+                failed_courses = self._solve_cpsat(search_workers)
             else:
-                logger.info(f"  ✅ Yerleştirildi")
+                failed_courses = self._solve_greedy(self._sort_courses_by_priority())
+            self._record_improvement()
+
+            if failed_courses and backtracking and not self._should_stop():
+                with self.instrumentation.phase('geri_izleme'):
+                    failed_courses = self._solve_backtracking(failed_courses)
+
+            if anytime:
+                failed_courses = self._improve_until_deadline(failed_courses, random.Random(seed))
+
+            success = not failed_courses
+
+            if success and anneal and not self._should_stop():
+                with self.instrumentation.phase('tavlama'):
+                    self._improve_with_annealing(seed, anneal_moves)
         
         self.end_time = datetime.now()
         elapsed = (self.end_time - self.start_time).total_seconds()
+
+        if self.cancel_event.is_set():
+            logger.warning("⏹️ Zamanlama iptal edildi, bulunan en iyi çözüm korunuyor")
+        elif self.timed_out:
+            logger.warning(f"⏰ Süre sınırı ({time_limit_seconds} sn) doldu, bulunan en iyi çözüm korunuyor")
         
         if success:
             logger.info(f"\n✨ BAŞARILI! Tüm dersler yerleştirildi")
@@ -173,9 +565,545 @@ class ExamScheduler:
                 logger.error(f"  • {course['code']} - {course.get('name', 'N/A')}")
             return False
     
+    def restore_from_cache(self, cache: SolutionCache, **solve_options) -> bool:
+        # Girdiler (dersler, derslikler, program parametreleri, kayıtlar) aynıysa kayıtlı çözüm geri yüklenir
+        with self.instrumentation.phase('onbellek'):
+            self.start_time = datetime.now()
+            self.cache_key = cache.key_for(self, **solve_options)
+            self.cache_hit = cache.restore(self.cache_key, self)
+            self.end_time = datetime.now()
+        return self.cache_hit and len(self.course_assignments) == len(self.courses)
+
+    def _check_feasibility(self) -> bool:
+        # Ön kontrol tavsiye niteliğindedir: alt sınırlardan biri tutmazsa tam çözüm olmadığı nedeniyle
+        # bildirilir, arama yine de yerleştirilebilen en çok dersi bulmak için çalışır
+        with self.instrumentation.phase('on_kontrol'):
+            self.infeasibility_reasons = check_feasibility(self)
+        if not self.infeasibility_reasons:
+            return True
+
+        logger.warning("\n⛔ Bu yapılandırma tam çözülemez, en iyi kısmi çözüm aranıyor:")
+        for reason in self.infeasibility_reasons:
+            logger.warning(f"  • {reason}")
+        return False
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _should_stop(self) -> bool:
+        if self.cancel_event.is_set():
+            return True
+        if self.deadline is not None and time_module.monotonic() >= self.deadline:
+            self.timed_out = True
+            return True
+        return False
+
+    def _solve_greedy(self, sorted_courses: List[Dict], verbose: bool = True) -> List[Dict]:
+        failed_courses = []
+        self.placement_order = list(sorted_courses)
+
+        for i, course in enumerate(sorted_courses, 1):
+            if self._should_stop():
+                failed_courses.extend(sorted_courses[i - 1:])
+                break
+
+            if verbose:
+                logger.info(f"\n[{i}/{len(sorted_courses)}] Ders yerleştiriliyor: {course['code']} ({course.get('name', 'N/A')})")
+            
+            if not self._assign_course_to_slot(course):
+                if verbose:
+                    logger.error(f"  ❌ Ders yerleştirilemedi: {course['code']}")
+                failed_courses.append(course)
+            elif verbose:
+                logger.info(f"  ✅ Yerleştirildi")
+            self._report_progress()
+
+        return failed_courses
+
+    def _solve_backtracking(self, failed_courses: List[Dict]) -> List[Dict]:
+        logger.info(f"\n🔍 {len(failed_courses)} ders yerleşemedi, geri izlemeli arama başlatılıyor...")
+
+        before_score = self._solution_score()
+        before_snapshot = self._snapshot_assignments()
+
+        search = BacktrackingSearch(self)
+        search.run()
+
+        if self._solution_score() > before_score:
+            self._record_improvement()
+            logger.info(
+                f"  ✅ Geri izleme: {len(self.course_assignments)}/{len(self.courses)} ders yerleşti "
+                f"({search.nodes} düğüm, {search.backjumps} geri atlama)"
+            )
+            return [c for c in self.courses if c['id'] not in self.course_assignments]
+
+        self._restore_assignments(before_snapshot)
+        logger.info("  ⊙ Geri izleme daha iyi bir çözüm bulamadı")
+        return failed_courses
+
+    def _improve_with_annealing(self, seed: Optional[int], max_moves: int):
+        logger.info("\n🔥 Tavlama ile yumuşak kısıt iyileştirmesi başlatılıyor...")
+        annealer = ScheduleAnnealer(self, seed=seed, max_moves=max_moves)
+        annealer.run()
+        self.annealing_stats = {
+            'baslangic_maliyeti': annealer.initial_cost,
+            'en_iyi_maliyet': annealer.best_cost,
+            'denenen_hareket': annealer.moves_tried,
+            'kabul_edilen_hareket': annealer.moves_accepted,
+        }
+        # Ayrıntılı maliyet O(kayıt) tutar; istatistikler için tavlama sonunda bir kez hesaplanır
+        self.soft_cost = annealer.evaluate()
+
+    def _improve_until_deadline(self, failed_courses: List[Dict], rng: random.Random) -> List[Dict]:
+        # Anytime arama: ilk çözümden sonra, yerleşemeyen dersleri öne alan
+        # (squeaky wheel) ve sırayı hafifçe karıştıran yeniden denemeler yapılır.
+        # Süre dolduğunda ya da iptal edildiğinde en iyi çözüme geri dönülür.
+        best_score = self._solution_score()
+        best_snapshot = self._snapshot_assignments()
+        best_failed = list(failed_courses)
+        order = list(self.placement_order)
+        stall = 0
+
+        while not self._should_stop():
+            if not best_failed and stall >= ANYTIME_STALL_ITERATIONS:
+                break
+
+            self.iterations += 1
+            order = self._perturbed_order(order, {c['id'] for c in failed_courses}, rng)
+            self._reset_assignments()
+            failed_courses = self._solve_greedy(order, verbose=False)
+
+            score = self._solution_score()
+            if score > best_score:
+                best_score = score
+                best_snapshot = self._snapshot_assignments()
+                best_failed = list(failed_courses)
+                stall = 0
+                self._record_improvement()
+                logger.info(
+                    f"  🔁 İyileştirme #{len(self.improvements)} (iterasyon {self.iterations}): "
+                    f"{len(self.course_assignments)}/{len(self.courses)} ders yerleşti"
+                )
+            else:
+                stall += 1
+
+        self._restore_assignments(best_snapshot)
+        return best_failed
+
+    def _perturbed_order(self, order: List[Dict], failed_ids: Set[int], rng: random.Random) -> List[Dict]:
+        failed = [c for c in order if c['id'] in failed_ids]
+        rest = [c for c in order if c['id'] not in failed_ids]
+        rng.shuffle(failed)
+
+        for _ in range(max(1, len(rest) // 20)):
+            if len(rest) < 2:
+                break
+            i = rng.randrange(len(rest) - 1)
+            rest[i], rest[i + 1] = rest[i + 1], rest[i]
+
+        return failed + rest
+
+    def solve_multi_start(self, workers: Optional[int] = None, starts: Optional[int] = None,
+                          time_limit_seconds: int = 300, strategy: str = 'greedy',
+                          anytime: bool = False, backtracking: bool = True,
+                          anneal: bool = False) -> bool:
+        # Farklı tohumlarla rastgele eşitlik bozma sıraları işçi süreçlerde çözülür,
+        # en iyi puanlı atama bu nesneye geri yüklenir
+        self.start_time = datetime.now()
+        self._check_feasibility()
+
+        with self.instrumentation.phase('cozum'):
+            best, results = run_multi_start(
+                self, workers=workers, starts=starts,
+                time_limit_seconds=time_limit_seconds, strategy=strategy,
+                anytime=anytime, backtracking=backtracking, anneal=anneal, precheck=False
+            )
+
+        if best:
+            self._restore_assignments({
+                course_id: {
+                    'slot_idx': slot_idx,
+                    'datetime': self.time_slots[slot_idx][0],
+                    'classroom_ids': classroom_ids,
+                }
+                for course_id, (slot_idx, classroom_ids) in best['assignments'].items()
+            })
+        self.total_attempts = sum(r['total_attempts'] for r in results)
+        for result in results:
+            self.instrumentation.merge(result.get('rejections', {}), result.get('probe_rejections', {}))
+
+        self.multi_start_stats = {
+            'baslangic_sayisi': len(results),
+            'en_iyi_tohum': best['seed'] if best else None,
+            'yerlestirilen_dagilimi': sorted(len(r['assignments']) for r in results),
+        }
+        self.end_time = datetime.now()
+
+        success = len(self.course_assignments) == len(self.courses)
+        if success:
+            logger.info(f"\n✨ BAŞARILI! Tüm dersler yerleştirildi (tohum {best['seed']})")
+        else:
+            logger.error(
+                f"\n❌ BAŞARISIZ! {len(self.courses) - len(self.course_assignments)} ders yerleştirilemedi"
+            )
+        return success
+
+    def independent_components(self) -> List[List[int]]:
+        # Bileşenler yalnız öğrenci çakışma grafiğinden bulunur; seviye kuralı bölümleri birbirine
+        # bağladığından bileşenlere katılırsa gerçek veride tek parça kalır. Seviye günleri ve
+        # derslikler çözüm sonrası uzlaştırmada düzeltilir
+        return self.conflict_graph.components()
+
+    def parallel_groups(self, min_component_size: int = COMPONENT_MIN_COURSES) -> List[List[int]]:
+        # Büyük bileşenler ayrı görevdir; küçükler tek bir görevde toplanır
+        components = self.independent_components()
+        groups = [component for component in components if len(component) >= min_component_size]
+        small = [course_id for component in components if len(component) < min_component_size for course_id in component]
+        if small:
+            groups.append(small)
+        return groups
+
+    def solve_decomposed(self, workers: Optional[int] = None, min_component_size: int = COMPONENT_MIN_COURSES,
+                         time_limit_seconds: int = 300, strategy: str = 'greedy',
+                         backtracking: bool = True, anneal: bool = False,
+                         groups: Optional[List[List[int]]] = None) -> bool:
+        # groups verilirse (çağıran zaten hesapladıysa) bileşenler yeniden bulunmaz
+        if groups is None:
+            groups = self.parallel_groups(min_component_size)
+        if len(groups) < 2:
+            logger.info("🧩 Bağımsız ders grubu yok, problem tek parça çözülüyor")
+            return self.solve(time_limit_seconds=time_limit_seconds, strategy=strategy,
+                              backtracking=backtracking, anneal=anneal)
+
+        self.start_time = datetime.now()
+        self._solve_started_at = time_module.perf_counter()
+        self.deadline = time_module.monotonic() + time_limit_seconds if time_limit_seconds else None
+        self._check_feasibility()
+
+        with self.instrumentation.phase('cozum'):
+            results = run_components(
+                self, groups, workers=workers,
+                time_limit_seconds=time_limit_seconds, strategy=strategy,
+                backtracking=backtracking, anneal=anneal, precheck=False
+            )
+
+        self.total_attempts = sum(r['total_attempts'] for r in results)
+        for result in results:
+            self.instrumentation.merge(result.get('rejections', {}), result.get('probe_rejections', {}))
+
+        with self.instrumentation.phase('uzlastirma'):
+            failed_courses = self._reconcile_components(results)
+        if failed_courses and backtracking and not self._should_stop():
+            with self.instrumentation.phase('geri_izleme'):
+                failed_courses = self._solve_backtracking(failed_courses)
+        self._record_improvement()
+        self.end_time = datetime.now()
+
+        self.decomposition_stats.update({
+            'grup_sayisi': len(groups),
+            'grup_boyutlari': [len(group) for group in groups],
+        })
+
+        if not failed_courses:
+            logger.info(f"\n✨ BAŞARILI! Tüm dersler yerleştirildi ({len(groups)} bağımsız grup)")
+            return True
+
+        logger.error(f"\n❌ BAŞARISIZ! {len(failed_courses)} ders yerleştirilemedi:")
+        for course in failed_courses:
+            logger.error(f"  • {course['code']} - {course.get('name', 'N/A')}")
+        return False
+
+    def _reconcile_components(self, results: List[Dict]) -> List[Dict]:
+        # Bileşen çözümleri birleştirilir. Grupların ortak öğrencisi olmadığından öğrenci kısıtları geçerli kalır;
+        # aynı seviyenin aynı güne düşen sınavları ve derslikler çakışabilir: seviyesi çakışan ders başka slota,
+        # dersliği çakışan ders önce aynı slotta başka dersliklere, olmazsa başka slota alınır
+        self._reset_assignments()
+        courses_by_id = {c['id']: c for c in self.courses}
+        classrooms_by_id = {c['id']: c for c in self.classrooms}
+
+        assignments = [
+            (course_id, slot_idx, classroom_ids)
+            for result in results
+            for course_id, (slot_idx, classroom_ids) in result['assignments'].items()
+        ]
+        assignments.sort(key=lambda a: (-self.course_student_counts.get(a[0], 0), a[0]))
+
+        repacked = 0
+        level_moved = 0
+        deferred: List[Dict] = []
+        for course_id, slot_idx, classroom_ids in assignments:
+            class_level = self.course_class_levels.get(course_id, '')
+            if class_level and (self.level_blocked_masks.get(class_level, 0) >> slot_idx) & 1:
+                level_moved += 1
+                deferred.append(courses_by_id[course_id])
+                continue
+            quanta = self.course_quanta.get(course_id, 1)
+            slot_date = self.slot_to_date[slot_idx]
+            span = self._room_span(slot_idx, quanta)
+            classrooms = [classrooms_by_id[cid] for cid in classroom_ids]
+            if any(self.room_busy.get((cid, slot_date), 0) & span for cid in classroom_ids):
+                classrooms = self._find_suitable_classrooms(
+                    slot_idx, self.course_student_counts.get(course_id, 0), quanta
+                )
+                if classrooms:
+                    repacked += 1
+            if not classrooms:
+                deferred.append(courses_by_id[course_id])
+                continue
+            self._place_course(course_id, slot_idx, self.time_slots[slot_idx][0], classrooms,
+                               class_level, slot_date)
+
+        # İşçide yerleşemeyenler ve derslik bulunamayanlar tüm program üzerinde yeniden denenir
+        deferred_ids = {course['id'] for course in deferred}
+        deferred.extend(c for c in self.courses if c['id'] not in self.course_assignments and c['id'] not in deferred_ids)
+        failed_courses = [course for course in deferred if not self._assign_course_to_slot(course)]
+
+        self.decomposition_stats = {
+            'derslik_yeniden_dagitilan': repacked,
+            'seviye_cakismasi': level_moved,
+            'yeniden_yerlestirilen': len(deferred) - len(failed_courses),
+        }
+        logger.info(
+            f"  ✓ Uzlaştırma: {level_moved} seviye çakışması, {repacked} ders başka dersliklere, "
+            f"{len(deferred) - len(failed_courses)} ders başka slota alındı"
+        )
+        return failed_courses
+
+    def result_score(self) -> Tuple:
+        soft_cost = ScheduleAnnealer(self).evaluate()['toplam']
+        return (len(self.course_assignments), -soft_cost)
+
+    def _solution_score(self) -> Tuple:
+        rooms_used = sum(len(a['classroom_ids']) for a in self.course_assignments.values())
+        return (len(self.course_assignments), -rooms_used)
+
+    def _record_improvement(self):
+        elapsed = time_module.perf_counter() - self._solve_started_at if self._solve_started_at else 0.0
+        placed, negative_rooms = self._solution_score()
+        self.improvements.append({
+            'sure': round(elapsed, 4),
+            'iterasyon': self.iterations,
+            'yerlestirildi': placed,
+            'kullanilan_derslik_atamasi': -negative_rooms,
+        })
+        self._report_progress(force=True)
+
+    def _report_progress(self, force: bool = False):
+        # Arayüz işçisine ilerleme bildirimi; sık çağrılan döngülerde PROGRESS_INTERVAL_SECONDS'ta bir
+        if self.progress_callback is None:
+            return
+        now = time_module.perf_counter()
+        if not force and now - self._last_progress_at < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._last_progress_at = now
+
+        placed, negative_rooms = self._solution_score()
+        self.progress_callback({
+            'sure': round(now - self._solve_started_at, 2) if self._solve_started_at else 0.0,
+            'yerlestirildi': placed,
+            'toplam_ders': len(self.courses),
+            'kullanilan_derslik_atamasi': -negative_rooms,
+            'en_iyi_yerlestirildi': max((i['yerlestirildi'] for i in self.improvements), default=placed),
+        })
+
+    def _snapshot_assignments(self) -> Dict[int, Dict]:
+        return {
+            course_id: {
+                'slot_idx': a['slot_idx'],
+                'datetime': a['datetime'],
+                'classroom_ids': list(a['classroom_ids']),
+            }
+            for course_id, a in self.course_assignments.items()
+        }
+
+    def _reset_assignments(self):
+        self.course_assignments = {}
+        self.slot_usage = defaultdict(set)
+        self.slot_students = defaultdict(set)
+        self.date_usage = defaultdict(set)
+        self.classroom_slot_usage = {}
+        self.room_busy = dict(self.reserved_room_busy)
+        self.date_class_level_usage = defaultdict(set)
+        self.slot_block_sources = {}
+        self.blocked_slot_masks = defaultdict(int)
+        self.level_blocked_masks = defaultdict(int)
+
+    @contextmanager
+    def _untracked_slot_masks(self):
+        # Çok sayıda yerleştir/geri al yapan aramalarda komşu maskeleri artımlı tutulmaz,
+        # sorgu anında komşulardan hesaplanır ve sonda bir kez yeniden kurulur
+        self.track_slot_masks = False
+        try:
+            yield
+        finally:
+            self.track_slot_masks = True
+            self._rebuild_slot_masks()
+
+    def _rebuild_slot_masks(self):
+        self.slot_block_sources = {}
+        self.blocked_slot_masks = defaultdict(int)
+        for course_id, assignment in self.course_assignments.items():
+            self._block_neighbor_slots(course_id, assignment['slot_idx'])
+
+    def _restore_assignments(self, snapshot: Dict[int, Dict]):
+        self._reset_assignments()
+        classrooms_by_id = {c['id']: c for c in self.classrooms}
+
+        for course_id, assignment in snapshot.items():
+            slot_idx = assignment['slot_idx']
+            self._place_course(
+                course_id,
+                slot_idx,
+                assignment['datetime'],
+                [classrooms_by_id[cid] for cid in assignment['classroom_ids']],
+                self.course_class_levels.get(course_id, ''),
+                self.slot_to_date[slot_idx]
+            )
+
+    def _solve_dsatur(self) -> List[Dict]:
+        # DSATUR: her adımda en çok kısıtlanmış (doymuşluğu en yüksek) ders seçilir. Renkler sınav günleridir:
+        # doymuşluk, yerleşmiş komşuların ve aynı sınıf seviyesindeki derslerin kullandığı farklı gün sayısıdır
+        # (kapalı 15 dakikalık dilimler sayılırsa uzun sınavlı komşular doymuşluğu şişirir). Eşitlikte ağırlıklı
+        # çakışma derecesi, sonra ders büyüklüğü belirler; yığın girdileri tembel olarak güncellenir.
+        courses_by_id = {c['id']: c for c in self.courses}
+
+        courses_by_level: Dict[str, List[int]] = defaultdict(list)
+        for course in self.courses:
+            class_level = self.course_class_levels.get(course['id'])
+            if class_level:
+                courses_by_level[class_level].append(course['id'])
+
+        colored_days: Dict[int, Set[date]] = {course_id: set() for course_id in courses_by_id}
+
+        def heap_entry(course_id: int):
+            return (
+                -len(colored_days[course_id]),
+                -self.conflict_graph.weighted_degree(course_id) * self._priority_jitter.get(course_id, 1.0),
+                -self.conflict_graph.size(course_id),
+                course_id
+            )
+
+        heap = [heap_entry(course_id) for course_id in courses_by_id]
+        heapq.heapify(heap)
+
+        done: Set[int] = set()
+        failed_courses = []
+        step = 0
+
+        self.placement_order = []
+
+        while heap:
+            if self._should_stop():
+                failed_courses.extend(c for cid, c in courses_by_id.items() if cid not in done)
+                break
+
+            negative_saturation, _, _, course_id = heapq.heappop(heap)
+            if course_id in done or -negative_saturation != len(colored_days[course_id]):
+                continue
+
+            done.add(course_id)
+            course = courses_by_id[course_id]
+            self.placement_order.append(course)
+            step += 1
+            logger.info(
+                f"\n[{step}/{len(courses_by_id)}] Ders yerleştiriliyor (DSATUR, doymuşluk {-negative_saturation}): "
+                f"{course['code']} ({course.get('name', 'N/A')})"
+            )
+
+            if not self._assign_course_to_slot(course):
+                logger.error(f"  ❌ Ders yerleştirilemedi: {course['code']}")
+                failed_courses.append(course)
+                continue
+
+            logger.info(f"  ✅ Yerleştirildi")
+            self._report_progress()
+
+            # Yerleştirilen dersin günü komşularına ve seviye arkadaşlarına yeni bir renk olabilir
+            slot_date = self.slot_to_date[self.course_assignments[course_id]['slot_idx']]
+            affected = set(self.conflict_graph.neighbors(course_id))
+            class_level = self.course_class_levels.get(course_id)
+            if class_level:
+                affected.update(courses_by_level[class_level])
+
+            for other_id in affected:
+                if other_id in done or other_id not in colored_days or slot_date in colored_days[other_id]:
+                    continue
+                colored_days[other_id].add(slot_date)
+                heapq.heappush(heap, heap_entry(other_id))
+
+        return failed_courses
+
+    def _solve_cpsat(self, workers: Optional[int]) -> List[Dict]:
+        # Slotlar CP-SAT ile seçilir, derslikler pack_rooms ile; derslik bulunamayan dersler açgözlü yerleştirilir.
+        # Açgözlü çözüm modele ipucu olarak verilir ve CP-SAT daha iyisini bulamazsa korunur
+        greedy_failed = self._solve_greedy(self._sort_courses_by_priority(), verbose=False)
+        if not greedy_failed:
+            logger.info("  ✓ Açgözlü çözüm tüm dersleri yerleştirdi, CP-SAT araması gerekmedi")
+            return []
+
+        greedy_snapshot = self._snapshot_assignments()
+        greedy_score = self._solution_score()
+        remaining = max(self.deadline - time_module.monotonic(), 1.0) if self.deadline is not None else None
+        with self.instrumentation.phase('cpsat'):
+            starts, status = solve_cpsat(
+                self, remaining, workers,
+                hint={course_id: a['slot_idx'] for course_id, a in greedy_snapshot.items()}
+            )
+        if len(starts) <= len(greedy_snapshot):
+            logger.warning(f"⚠️ CP-SAT açgözlü çözümü geçemedi ({status}), açgözlü yerleşim korunuyor")
+            return greedy_failed
+
+        self._reset_assignments()
+        self.placement_order = sorted(
+            self.courses, key=lambda c: (-self.course_student_counts.get(c['id'], 0), c['id'])
+        )
+        deferred = []
+        for course in self.placement_order:
+            course_id = course['id']
+            slot_idx = starts.get(course_id)
+            if slot_idx is None:
+                continue
+            classrooms = self._find_suitable_classrooms(
+                slot_idx, self.course_student_counts.get(course_id, 0), self.course_quanta.get(course_id, 1)
+            )
+            if not classrooms:
+                deferred.append(course)
+                continue
+            self._place_course(course_id, slot_idx, self.time_slots[slot_idx][0], classrooms,
+                               self.course_class_levels.get(course_id, ''), self.slot_to_date[slot_idx])
+
+        deferred.extend(course for course in self.placement_order if course['id'] not in starts)
+        failed_courses = [course for course in deferred if not self._assign_course_to_slot(course)]
+        logger.info(
+            f"  ✓ CP-SAT yerleşimi: {len(self.placement_order) - len(deferred)} ders modeldeki slotunda, "
+            f"{len(deferred) - len(failed_courses)} ders derslik için başka slota alındı"
+        )
+
+        # Model derslikleri görmez: derslik atamasından sonra açgözlü çözümün gerisinde kalabilir
+        if self._solution_score() < greedy_score:
+            logger.warning(
+                f"⚠️ Derslik atamasından sonra CP-SAT yerleşimi ({len(self.course_assignments)} ders) "
+                f"açgözlü çözümün ({len(greedy_snapshot)} ders) gerisinde kaldı, açgözlü yerleşim korunuyor"
+            )
+            self._restore_assignments(greedy_snapshot)
+            return greedy_failed
+        return failed_courses
+
+    def _min_days_window(self, slot_date: date) -> List[date]:
+        min_days = self.min_days_between
+        if min_days == 0:
+            return [slot_date]
+
+        # Sıralı gün dizisinde [gün - (min_days - 1), gün + (min_days - 1)] aralığı ikili aramayla bulunur
+        day = slot_date.toordinal()
+        low = bisect_left(self.exam_day_ordinals, day - min_days + 1)
+        high = bisect_right(self.exam_day_ordinals, day + min_days - 1)
+        return [date.fromordinal(ordinal) for ordinal in self.exam_day_ordinals[low:high]]
+
     def _sort_courses_by_priority(self) -> List[Dict]:
         def priority_key(course):
-            student_count = self.course_student_counts.get(course['id'], 0)
+            student_count = self.conflict_graph.size(course['id']) * self._priority_jitter.get(course['id'], 1.0)
+            conflict_weight = self.conflict_graph.weighted_degree(course['id'])
             is_mandatory = course.get('is_mandatory', 0)
 
             try:
@@ -183,9 +1111,10 @@ class ExamScheduler:
             except:
                 class_level = 0
 
-            return (-student_count, -is_mandatory, -class_level)
+            return (-student_count, -conflict_weight, -is_mandatory, -class_level)
         
-        sorted_courses = sorted(self.courses, key=priority_key)
+        with self.instrumentation.phase('siralama'):
+            sorted_courses = sorted(self.courses, key=priority_key)
         
         logger.info("\n📋 Derslerin öncelik sırası:")
         for i, course in enumerate(sorted_courses[:10], 1):
@@ -199,107 +1128,148 @@ class ExamScheduler:
     
     def _assign_course_to_slot(self, course: Dict) -> bool:
         course_id = course['id']
+        class_level = self.course_class_levels.get(course_id, '')
         student_count = self.course_student_counts.get(course_id, 0)
-        class_level = course.get('class_level', '')
+        quanta = self.course_quanta.get(course_id, 1)
 
-        for slot_datetime, slot_idx in self.time_slots:
+        # Sadece hâlâ uygun slotlar (maskedeki bitler) sırayla denenir
+        feasible = self.feasible_slot_mask(course_id)
+        candidates = feasible
+        while candidates:
+            low_bit = candidates & -candidates
+            candidates ^= low_bit
+            slot_idx = low_bit.bit_length() - 1
             self.total_attempts += 1
 
-            slot_date = self.slot_to_date[slot_idx]
-            if class_level:
-                if self._check_class_level_conflict(slot_date, class_level, course_id):
-                    continue
-
-            if self._check_student_conflict(slot_idx, course_id):
-                continue
-
-            if not self._check_min_days_between(slot_date, course_id):
-                continue
-
-            suitable_classrooms = self._find_suitable_classrooms(slot_idx, student_count)
-            
+            suitable_classrooms = self._find_suitable_classrooms(slot_idx, student_count, quanta)
             if not suitable_classrooms:
                 continue
 
-            self._place_course(course_id, slot_idx, slot_datetime, suitable_classrooms, class_level, slot_date)
+            self._record_mask_rejections(course_id, feasible, slot_idx)
+            self._place_course(course_id, slot_idx, self.time_slots[slot_idx][0], suitable_classrooms,
+                               class_level, self.slot_to_date[slot_idx])
             return True
         
+        self._record_mask_rejections(course_id, feasible, len(self.time_slots))
         return False
-    
-    def _check_class_level_conflict(self, slot_date, class_level: str, course_id: int) -> bool:
-        if (slot_date, class_level) in self.date_class_level_usage:
-            return True
-        return False
-    
-    def _check_student_conflict(self, slot_idx: int, course_id: int) -> bool:
-        courses_in_slot = self.slot_usage.get(slot_idx, set())
 
-        students_taking_this_course = {
-            student_id for student_id, course_ids in self.student_courses.items()
-            if course_id in course_ids
-        }
+    def _record_mask_rejections(self, course_id: int, feasible: int, before_slot: int):
+        # Seçilen slottan önce maskeyle elenen başlangıçlar ilk tutmayan kısıta göre sayılır
+        tried = self._course_start_mask(course_id) & ((1 << before_slot) - 1)
+        class_level = self.course_class_levels.get(course_id)
+        level_blocked = tried & self.level_blocked_masks.get(class_level, 0) if class_level else 0
+        blocked = tried & ~level_blocked & ~feasible
+        clash = blocked
+        if blocked and self.min_days_between:
+            # Gün penceresi sınav aralığından geniştir; kesişmeyen kısım min gün kuralından gelir
+            own_quanta = self.course_quanta.get(course_id, 1)
+            overlap = 0
+            for neighbor_id in self.conflict_graph.neighbors(course_id):
+                assignment = self.course_assignments.get(neighbor_id)
+                if assignment:
+                    overlap |= self._overlap_window(
+                        assignment['slot_idx'], self.course_quanta.get(neighbor_id, 1), own_quanta
+                    )
+            clash = blocked & overlap
 
-        for other_course_id in courses_in_slot:
-            students_taking_other_course = {
-                student_id for student_id, course_ids in self.student_courses.items()
-                if other_course_id in course_ids
-            }
+        instrumentation = self.instrumentation
+        instrumentation.reject('sinif_seviyesi', level_blocked.bit_count())
+        instrumentation.reject('ogrenci_cakismasi', clash.bit_count())
+        instrumentation.reject('min_gun', (blocked & ~clash).bit_count())
 
-            common_students = students_taking_this_course & students_taking_other_course
-            if common_students:
-                return True
-        
-        return False
-    
-    def _check_min_days_between(self, slot_date, course_id: int) -> bool:
-        min_days = self.exam_schedule.get('min_days_between_exams', 0)
-        
-        if min_days == 0:
-            return True
+    def feasible_slot_mask(self, course_id: int) -> int:
+        # Sınıf seviyesi, öğrenci çakışması ve min gün kısıtlarına göre hâlâ açık slotlar
+        if self.track_slot_masks:
+            blocked = self.blocked_slot_masks.get(course_id, 0)
+        else:
+            blocked = 0
+            own_quanta = self.course_quanta.get(course_id, 1)
+            for neighbor_id in self.conflict_graph.neighbors(course_id):
+                assignment = self.course_assignments.get(neighbor_id)
+                if assignment:
+                    blocked |= self._neighbor_window(
+                        assignment['slot_idx'], self.course_quanta.get(neighbor_id, 1), own_quanta
+                    )
 
-        students_taking_this_course = {
-            student_id for student_id, course_ids in self.student_courses.items()
-            if course_id in course_ids
-        }
-        
-        for student_id in students_taking_this_course:
-            other_courses = [cid for cid in self.student_courses[student_id] if cid != course_id]
-            
-            for other_course_id in other_courses:
-                if other_course_id in self.course_assignments:
-                    other_slot_idx = self.course_assignments[other_course_id]['slot_idx']
-                    other_date = self.slot_to_date[other_slot_idx]
-                    
-                    day_diff = abs((slot_date - other_date).days)
-                    
-                    if day_diff < min_days:
-                        return False
-        
+        mask = self._course_start_mask(course_id) & ~blocked
+        class_level = self.course_class_levels.get(course_id)
+        if class_level:
+            mask &= ~self.level_blocked_masks.get(class_level, 0)
+        return mask
+
+    def _slot_is_open(self, course_id: int, slot_idx: int, moving: Collection[int] = ()) -> bool:
+        # moving: birlikte yer değiştirecek dersler (tavlama ön kontrolü); engel sayılmazlar
+        if self.track_slot_masks and not moving:
+            return bool((self.feasible_slot_mask(course_id) >> slot_idx) & 1)
+
+        # Takip kapalıyken tek slot için: pencere günlerindeki komşu derslere bakılır
+        if not (self._course_start_mask(course_id) >> slot_idx) & 1:
+            return False
+
+        class_level = self.course_class_levels.get(course_id)
+        if class_level:
+            if moving:
+                level_courses = self.date_class_level_usage.get((self.slot_to_date[slot_idx], class_level), ())
+                level_blocked = any(other_id not in moving for other_id in level_courses)
+            else:
+                level_blocked = (self.level_blocked_masks.get(class_level, 0) >> slot_idx) & 1
+            if level_blocked:
+                self.instrumentation.reject('sinif_seviyesi')
+                return False
+
+        # Aynı slotta başlayan sınavlarla çakışma: komşu taramasına gerek kalmadan küme testi
+        # (slotta yer değiştirecek bir ders varsa birleşim onu da içerir; komşu taramasına kalır)
+        starting = self.slot_usage.get(slot_idx, ())
+        if starting and not any(other_id in moving for other_id in starting) \
+                and not self.course_students.get(course_id, frozenset()).isdisjoint(self.slot_students[slot_idx]):
+            self.instrumentation.reject('ogrenci_cakismasi')
+            return False
+
+        neighbors = self.conflict_graph.neighbors(course_id)
+        slot_date = self.slot_to_date[slot_idx]
+        own_quanta = self.course_quanta.get(course_id, 1)
+        reason = None
+        for other_date in self.window_dates[slot_date] if self.min_days_between else (slot_date,):
+            for other_course_id in self.date_usage.get(other_date, ()):
+                if other_course_id not in neighbors or other_course_id in moving:
+                    continue
+                other_slot = self.course_assignments[other_course_id]['slot_idx']
+                if other_slot < slot_idx + own_quanta and slot_idx < other_slot + self.course_quanta.get(other_course_id, 1):
+                    self.instrumentation.reject('ogrenci_cakismasi')
+                    return False
+                if self.min_days_between:
+                    reason = 'min_gun'
+
+        if reason:
+            self.instrumentation.reject(reason)
+            return False
         return True
 
-    def _find_suitable_classrooms(self, slot_idx: int, student_count: int) -> List[Dict]:
+    def _feasible_classrooms(self, course_id: int, slot_idx: int) -> List[Dict]:
+        if not self._slot_is_open(course_id, slot_idx):
+            return []
+        return self._find_suitable_classrooms(
+            slot_idx, self.course_student_counts.get(course_id, 0), self.course_quanta.get(course_id, 1)
+        )
+
+    def _find_suitable_classrooms(self, slot_idx: int, student_count: int, quanta: int = 1) -> List[Dict]:
+        # Derslik doluluğu gün başına dilim bitleri: sınav aralığıyla kesişim tek AND işlemi
+        slot_date = self.slot_to_date[slot_idx]
+        span = self._room_span(slot_idx, quanta)
         available_classrooms = [
             c for c in self.classrooms
-            if (c['id'], slot_idx) not in self.classroom_slot_usage
+            if not self.room_busy.get((c['id'], slot_date), 0) & span
         ]
         if not available_classrooms:
+            self.instrumentation.reject('kapasite')
             return []
 
-        available_classrooms.sort(key=lambda c: c['capacity'])
-
-        selected = []
-        total_capacity = 0
-
-        for c in available_classrooms:
-            selected.append(c)
-            total_capacity += c['capacity']
-
-            if total_capacity >= student_count:
-                break
-
-        if total_capacity < student_count:
+        selected = pack_rooms(available_classrooms, student_count)
+        if not selected:
+            self.instrumentation.reject('kapasite')
             return []
 
+        total_capacity = sum(c['capacity'] for c in selected)
         usage_rate = student_count / total_capacity
         logger.debug(
             f"🔹 Slot {slot_idx}: {student_count} öğrenci için {len(selected)} derslik seçildi "
@@ -307,6 +1277,7 @@ class ExamScheduler:
         )
 
         return selected
+
     def _place_course(self, course_id: int, slot_idx: int, slot_datetime: datetime,
                       classrooms: List[Dict], class_level: str, slot_date):
         
@@ -319,69 +1290,436 @@ class ExamScheduler:
         }
 
         self.slot_usage[slot_idx].add(course_id)
+        self.slot_students[slot_idx].update(self.course_students.get(course_id, ()))
+        self.date_usage[slot_date].add(course_id)
 
+        span = self._room_span(slot_idx, self.course_quanta.get(course_id, 1))
         for classroom_id in classroom_ids:
             self.classroom_slot_usage[(classroom_id, slot_idx)] = course_id
+            self.room_busy[(classroom_id, slot_date)] = self.room_busy.get((classroom_id, slot_date), 0) | span
 
         if class_level:
-            self.date_class_level_usage[(slot_date, class_level)].add(course_id)
+            key = (slot_date, class_level)
+            if key not in self.date_class_level_usage:
+                self.level_blocked_masks[class_level] |= self.day_slot_masks[slot_date]
+            self.date_class_level_usage[key].add(course_id)
+
+        if self.track_slot_masks:
+            self._block_neighbor_slots(course_id, slot_idx)
+
+    def _block_neighbor_slots(self, course_id: int, slot_idx: int):
+        # Komşu başına, hangi (slot, süre) kaynağından kaç komşunun engel koyduğu sayılır;
+        # yeni bir kaynak geldiğinde onun engel penceresi maskeye eklenir
+        placed_quanta = self.course_quanta.get(course_id, 1)
+        source = (slot_idx, placed_quanta)
+        block_sources = self.slot_block_sources
+        masks = self.blocked_slot_masks
+        for neighbor_id in self.conflict_graph.neighbors(course_id):
+            sources = block_sources.get(neighbor_id)
+            if sources is None:
+                sources = block_sources[neighbor_id] = {}
+            count = sources.get(source, 0)
+            sources[source] = count + 1
+            if not count:
+                masks[neighbor_id] |= self._neighbor_window(
+                    slot_idx, placed_quanta, self.course_quanta.get(neighbor_id, 1)
+                )
     
+    def _unplace_course(self, course_id: int):
+        assignment = self.course_assignments.pop(course_id)
+        slot_idx = assignment['slot_idx']
+
+        self.slot_usage[slot_idx].discard(course_id)
+        if self.slot_usage[slot_idx]:
+            # Birleşim, slotta kalan derslerden yeniden kurulur (ortak öğrenci yanlışlıkla silinmesin)
+            self.slot_students[slot_idx] = set().union(
+                *(self.course_students.get(other_id, ()) for other_id in self.slot_usage[slot_idx])
+            )
+        else:
+            del self.slot_usage[slot_idx]
+            self.slot_students.pop(slot_idx, None)
+
+        slot_date = self.slot_to_date[slot_idx]
+        self.date_usage[slot_date].discard(course_id)
+
+        span = self._room_span(slot_idx, self.course_quanta.get(course_id, 1))
+        for classroom_id in assignment['classroom_ids']:
+            self.classroom_slot_usage.pop((classroom_id, slot_idx), None)
+            busy = self.room_busy.get((classroom_id, slot_date), 0) & ~span
+            if busy:
+                self.room_busy[(classroom_id, slot_date)] = busy
+            else:
+                self.room_busy.pop((classroom_id, slot_date), None)
+
+        class_level = self.course_class_levels.get(course_id, '')
+        if class_level:
+            key = (self.slot_to_date[slot_idx], class_level)
+            self.date_class_level_usage[key].discard(course_id)
+            if not self.date_class_level_usage[key]:
+                del self.date_class_level_usage[key]
+                self.level_blocked_masks[class_level] &= ~self.day_slot_masks[key[0]]
+
+        if self.track_slot_masks:
+            self._release_neighbor_slots(course_id, slot_idx)
+
+    def _release_neighbor_slots(self, course_id: int, slot_idx: int):
+        # Kaynak tükenince komşunun maskesi kalan kaynakların pencerelerinden yeniden kurulur
+        source = (slot_idx, self.course_quanta.get(course_id, 1))
+        block_sources = self.slot_block_sources
+        masks = self.blocked_slot_masks
+        for neighbor_id in self.conflict_graph.neighbors(course_id):
+            sources = block_sources[neighbor_id]
+            count = sources[source] - 1
+            if count:
+                sources[source] = count
+                continue
+
+            del sources[source]
+            neighbor_quanta = self.course_quanta.get(neighbor_id, 1)
+            mask = 0
+            for other_slot, other_quanta in sources:
+                mask |= self._neighbor_window(other_slot, other_quanta, neighbor_quanta)
+            masks[neighbor_id] = mask
+
     def save_solution(self):
+        with self.instrumentation.phase('kaydetme'):
+            self._save_solution()
+
+    def _save_solution(self):
         logger.info("\n💾 Çözüm veritabanına kaydediliyor...")
-        
+
+        schedule_id = self.exam_schedule['id']
+        courses_by_id = {c['id']: c for c in self.courses}
+        classrooms_by_id = {c['id']: c for c in self.classrooms}
+
+        exam_rows = []
+        for course_id, assignment in self.course_assignments.items():
+            if course_id not in courses_by_id:
+                continue
+            slot_datetime = assignment['datetime']
+            exam_rows.append((
+                schedule_id,
+                course_id,
+                slot_datetime.date().isoformat(),
+                slot_datetime.time().isoformat(),
+                self._course_duration_minutes(course_id),
+                self.course_student_counts.get(course_id, 0)
+            ))
+
+        # Silme, ekleme ve kesinleştirme tek bağlantı ve tek işlemde: hata olursa hiçbiri yazılmaz
         try:
-            self.db.execute(
-                "DELETE FROM exams WHERE schedule_id = ?",
-                (self.exam_schedule['id'],)
-            )
+            with self.db.get_connection() as conn:
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("DELETE FROM exams WHERE schedule_id = ?", (schedule_id,))
+                    cursor.executemany("""
+                        INSERT INTO exams 
+                        (schedule_id, course_id, exam_date, start_time, duration, student_count, status)
+                        VALUES (?, ?, ?, ?, ?, ?, 'scheduled')
+                    """, exam_rows)
+
+                    exam_ids = {
+                        row['course_id']: row['id']
+                        for row in cursor.execute(
+                            "SELECT id, course_id FROM exams WHERE schedule_id = ?", (schedule_id,)
+                        )
+                    }
+
+                    session_rows = []
+                    for course_id, assignment in self.course_assignments.items():
+                        exam_id = exam_ids.get(course_id)
+                        if exam_id is None:
+                            continue
+                        student_count = self.course_student_counts.get(course_id, 0)
+                        for classroom_id in assignment['classroom_ids']:
+                            classroom = classrooms_by_id.get(classroom_id)
+                            if classroom:
+                                session_rows.append((
+                                    exam_id,
+                                    classroom_id,
+                                    min(student_count, classroom['capacity'])
+                                ))
+
+                    cursor.executemany("""
+                        INSERT INTO exam_sessions (exam_id, classroom_id, allocated_seats)
+                        VALUES (?, ?, ?)
+                    """, session_rows)
+
+                    cursor.execute(
+                        "UPDATE exam_schedules SET is_finalized = 1 WHERE id = ?",
+                        (schedule_id,)
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
 
             for course_id, assignment in self.course_assignments.items():
-                course = next((c for c in self.courses if c['id'] == course_id), None)
-                if not course:
-                    continue
-                
-                slot_datetime = assignment['datetime']
-                classroom_ids = assignment['classroom_ids']
-                student_count = self.course_student_counts.get(course_id, 0)
-
-                exam_id = self.db.execute("""
-                    INSERT INTO exams 
-                    (schedule_id, course_id, exam_date, start_time, duration, student_count, status)
-                    VALUES (?, ?, ?, ?, ?, ?, 'scheduled')
-                """, (
-                    self.exam_schedule['id'],
-                    course_id,
-                    slot_datetime.date().isoformat(),
-                    slot_datetime.time().isoformat(),
-                    self.exam_schedule['default_exam_duration'],
-                    student_count
-                ))
-
-                for classroom_id in classroom_ids:
-                    classroom = next((c for c in self.classrooms if c['id'] == classroom_id), None)
-                    if classroom:
-                        self.db.execute("""
-                            INSERT INTO exam_sessions (exam_id, classroom_id, allocated_seats)
-                            VALUES (?, ?, ?)
-                        """, (
-                            exam_id,
-                            classroom_id,
-                            min(student_count, classroom['capacity'])
-                        ))
-                
-                logger.info(f"  ✓ {course['code']}: {slot_datetime.strftime('%d.%m.%Y %H:%M')} - {len(classroom_ids)} derslik")
-            
-            
-            self.db.execute(
-                "UPDATE exam_schedules SET is_finalized = 1 WHERE id = ?",
-                (self.exam_schedule['id'],)
-            )
+                if course_id in courses_by_id:
+                    logger.debug(
+                        f"  ✓ {courses_by_id[course_id]['code']}: "
+                        f"{assignment['datetime'].strftime('%d.%m.%Y %H:%M')} - "
+                        f"{len(assignment['classroom_ids'])} derslik"
+                    )
+
+            self.conflict_graph.save(conflict_graph_path(schedule_id))
             
-            logger.info("✅ Çözüm başarıyla kaydedildi")
+            logger.info(f"✅ Çözüm başarıyla kaydedildi ({len(exam_rows)} sınav, {len(session_rows)} oturum)")
             
         except Exception as e:
             logger.error(f"Çözüm kaydetme hatası: {str(e)}")
             raise
+
+    def repair(self, schedule_id: int, changed_course_ids: List[int],
+               classroom_ids: Optional[List[int]] = None) -> bool:
+        # Kayıtlı programda sadece çakışmaları değişen dersler yeniden yerleştirilir,
+        # diğer sınavlar sabit kalır ve veritabanına sadece fark yazılır
+        logger.info(f"🩹 Program onarımı başlatılıyor: {len(changed_course_ids)} değişen ders")
+
+        exam_schedule_row = self.db.fetch_one(
+            "SELECT * FROM exam_schedules WHERE id = ?",
+            (schedule_id,)
+        )
+        if not exam_schedule_row:
+            raise ValueError(f"ExamSchedule ID {schedule_id} bulunamadı")
+
+        self.exam_schedule = dict(exam_schedule_row)
+        self._init_state()
+
+        saved_exams = self._load_saved_exams(schedule_id)
+        course_ids = list(dict.fromkeys(list(saved_exams) + list(changed_course_ids)))
+        if classroom_ids is None:
+            classroom_ids = sorted({cid for exam in saved_exams.values() for cid in exam['sessions']})
+
+        previous_graph = ConflictGraph.load(conflict_graph_path(schedule_id))
+        self.prepare_data(course_ids, classroom_ids)
+
+        self.start_time = datetime.now()
+        self._solve_started_at = time_module.perf_counter()
+
+        # Önceki çakışma grafı varsa, komşulukları ve mevcudu aynı kalan dersler de sabit tutulur;
+        # kayıtlı sınavı olmayan ders her durumda yerleştirilir
+        dirty = set(changed_course_ids)
+        if previous_graph is not None:
+            dirty = {
+                course_id for course_id in dirty
+                if course_id not in saved_exams
+                or course_id not in previous_graph.course_sizes
+                or previous_graph.size(course_id) != self.conflict_graph.size(course_id)
+                or previous_graph.neighbors(course_id) != self.conflict_graph.neighbors(course_id)
+            }
+
+        slot_by_datetime = {slot_datetime: slot_idx for slot_datetime, slot_idx in self.time_slots}
+        classrooms_by_id = {c['id']: c for c in self.classrooms}
+
+        pinned = 0
+        for course_id, exam in saved_exams.items():
+            if course_id in dirty or course_id not in self.course_student_counts:
+                continue
+
+            slot_idx = slot_by_datetime.get(exam['datetime'])
+            if slot_idx is None or any(cid not in classrooms_by_id for cid in exam['sessions']):
+                dirty.add(course_id)
+                continue
+
+            self._place_course(
+                course_id, slot_idx, exam['datetime'],
+                [classrooms_by_id[cid] for cid in exam['sessions']],
+                self.course_class_levels.get(course_id, ''),
+                self.slot_to_date[slot_idx]
+            )
+            pinned += 1
+
+        courses_by_id = {c['id']: c for c in self.courses}
+        to_place = sorted(
+            (course_id for course_id in dirty if course_id in courses_by_id),
+            key=lambda course_id: -self.course_student_counts.get(course_id, 0)
+        )
+
+        failed = []
+        with self.instrumentation.phase('cozum'):
+            for course_id in to_place:
+                self.total_attempts += 1
+                if self._place_in_saved_slot(course_id, saved_exams.get(course_id), slot_by_datetime):
+                    continue
+                if not self._assign_course_to_slot(courses_by_id[course_id]):
+                    failed.append(courses_by_id[course_id])
+
+        placed = [course_id for course_id in to_place if course_id in self.course_assignments]
+        with self.instrumentation.phase('kaydetme'):
+            written_rows = self._write_repair_diff(saved_exams, placed)
+            self.conflict_graph.save(conflict_graph_path(schedule_id))
+
+        self.end_time = datetime.now()
+        moved = sum(
+            1 for course_id in placed
+            if course_id not in saved_exams
+            or saved_exams[course_id]['datetime'] != self.course_assignments[course_id]['datetime']
+        )
+        self.repair_stats = {
+            'sabit': pinned,
+            'yeniden_yerlesen': len(placed),
+            'tasinan': moved,
+            'yerlestirilemeyen': [c['code'] for c in failed],
+            'degisen_satir': written_rows,
+        }
+
+        elapsed = (self.end_time - self.start_time).total_seconds()
+        logger.info(
+            f"  ✓ Onarım: {pinned} sabit, {len(placed)} ders yeniden yerleşti ({moved} taşındı), "
+            f"{written_rows} satır değişti, {elapsed:.2f} sn"
+        )
+        for course in failed:
+            logger.error(f"  ❌ Ders yerleştirilemedi, kayıtlı sınavı korunuyor: {course['code']}")
+
+        return not failed
+
+    def _load_saved_exams(self, schedule_id: int) -> Dict[int, Dict]:
+        rows = self.db.fetch_all("""
+            SELECT e.id AS exam_id, e.course_id, e.exam_date, e.start_time, e.duration, e.student_count,
+                   s.classroom_id, s.allocated_seats
+            FROM exams e
+            LEFT JOIN exam_sessions s ON s.exam_id = e.id
+            WHERE e.schedule_id = ?
+        """, (schedule_id,))
+
+        saved_exams: Dict[int, Dict] = {}
+        for row in rows:
+            exam = saved_exams.get(row['course_id'])
+            if exam is None:
+                try:
+                    exam_datetime = datetime.combine(
+                        self._to_date(row['exam_date']), time.fromisoformat(row['start_time'])
+                    )
+                except (TypeError, ValueError):
+                    exam_datetime = None
+
+                exam = saved_exams[row['course_id']] = {
+                    'exam_id': row['exam_id'],
+                    'datetime': exam_datetime,
+                    'duration': row['duration'],
+                    'student_count': row['student_count'],
+                    'sessions': {},
+                }
+
+            if row['classroom_id'] is not None:
+                exam['sessions'][row['classroom_id']] = row['allocated_seats']
+
+        return saved_exams
+
+    def _place_in_saved_slot(self, course_id: int, exam: Optional[Dict],
+                             slot_by_datetime: Dict[datetime, int]) -> bool:
+        # Kayıtlı slot hâlâ uygunsa ders yerinde kalır; derslikler yetiyorsa onlar da korunur
+        if not exam:
+            return False
+
+        slot_idx = slot_by_datetime.get(exam['datetime'])
+        if slot_idx is None or not self._slot_is_open(course_id, slot_idx):
+            return False
+
+        student_count = self.course_student_counts.get(course_id, 0)
+        quanta = self.course_quanta.get(course_id, 1)
+        classrooms_by_id = {c['id']: c for c in self.classrooms}
+        saved_rooms = [classrooms_by_id[cid] for cid in exam['sessions'] if cid in classrooms_by_id]
+        slot_date = self.slot_to_date[slot_idx]
+        span = self._room_span(slot_idx, quanta)
+        rooms_free = all(not self.room_busy.get((c['id'], slot_date), 0) & span for c in saved_rooms)
+
+        if saved_rooms and rooms_free and sum(c['capacity'] for c in saved_rooms) >= student_count:
+            classrooms = saved_rooms
+        else:
+            classrooms = self._find_suitable_classrooms(slot_idx, student_count, quanta)
+            if not classrooms:
+                return False
+
+        self._place_course(
+            course_id, slot_idx, exam['datetime'], classrooms,
+            self.course_class_levels.get(course_id, ''), self.slot_to_date[slot_idx]
+        )
+        return True
+
+    def _write_repair_diff(self, saved_exams: Dict[int, Dict], course_ids: List[int]) -> int:
+        written_rows = 0
+        classrooms_by_id = {c['id']: c for c in self.classrooms}
+
+        with self.db.get_connection() as conn:
+            # Fark tek işlemde yazılır: bir satır hata verirse hiçbiri uygulanmaz
+            try:
+                cursor = conn.cursor()
+
+                for course_id in course_ids:
+                    assignment = self.course_assignments[course_id]
+                    slot_datetime = assignment['datetime']
+                    student_count = self.course_student_counts.get(course_id, 0)
+                    exam = saved_exams.get(course_id)
+
+                    if exam is None:
+                        cursor.execute("""
+                            INSERT INTO exams
+                            (schedule_id, course_id, exam_date, start_time, duration, student_count, status)
+                            VALUES (?, ?, ?, ?, ?, ?, 'scheduled')
+                        """, (
+                            self.exam_schedule['id'],
+                            course_id,
+                            slot_datetime.date().isoformat(),
+                            slot_datetime.time().isoformat(),
+                            self._course_duration_minutes(course_id),
+                            student_count
+                        ))
+                        exam_id = cursor.lastrowid
+                        saved_sessions: Dict[int, int] = {}
+                        written_rows += 1
+                    else:
+                        exam_id = exam['exam_id']
+                        saved_sessions = exam['sessions']
+                        duration = self._course_duration_minutes(course_id)
+                        if (exam['datetime'] != slot_datetime or exam['student_count'] != student_count
+                                or exam['duration'] != duration):
+                            cursor.execute("""
+                                UPDATE exams SET exam_date = ?, start_time = ?, duration = ?, student_count = ?
+                                WHERE id = ?
+                            """, (
+                                slot_datetime.date().isoformat(),
+                                slot_datetime.time().isoformat(),
+                                duration,
+                                student_count,
+                                exam_id
+                            ))
+                            written_rows += 1
+
+                    sessions = {
+                        classroom_id: min(student_count, classrooms_by_id[classroom_id]['capacity'])
+                        for classroom_id in assignment['classroom_ids']
+                    }
+
+                    for classroom_id in saved_sessions:
+                        if classroom_id not in sessions:
+                            cursor.execute(
+                                "DELETE FROM exam_sessions WHERE exam_id = ? AND classroom_id = ?",
+                                (exam_id, classroom_id)
+                            )
+                            written_rows += 1
+
+                    for classroom_id, seats in sessions.items():
+                        if classroom_id not in saved_sessions:
+                            cursor.execute("""
+                                INSERT INTO exam_sessions (exam_id, classroom_id, allocated_seats)
+                                VALUES (?, ?, ?)
+                            """, (exam_id, classroom_id, seats))
+                            written_rows += 1
+                        elif saved_sessions[classroom_id] != seats:
+                            cursor.execute(
+                                "UPDATE exam_sessions SET allocated_seats = ? WHERE exam_id = ? AND classroom_id = ?",
+                                (seats, exam_id, classroom_id)
+                            )
+                            written_rows += 1
+
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        return written_rows
     
     def get_statistics(self) -> Dict:
         elapsed = 0
@@ -400,34 +1738,137 @@ class ExamScheduler:
             'toplam_slot': len(self.time_slots),
             'kullanilan_slot': len(self.slot_usage),
             'toplam_ogrenci': len(self.student_courses),
+            'cakisma_kenari': self.conflict_graph.edge_count(),
+            'max_cakisma_derecesi': self.conflict_graph.max_degree(),
+            'cakisma_yogunlugu': round(self.conflict_graph.density(), 4),
             'cozum_suresi': elapsed,
             'toplam_deneme': self.total_attempts,
+            'iterasyon_sayisi': self.iterations,
+            'yumusak_maliyet': dict(self.soft_cost),
+            'tavlama': dict(self.annealing_stats),
+            'cok_baslangic': dict(self.multi_start_stats),
+            'ayristirma': dict(self.decomposition_stats),
+            'onarim': dict(self.repair_stats),
+            'onbellek_isabeti': self.cache_hit,
+            'rezerve_derslik_gunu': len(self.reserved_room_busy),
+            'rezerve_ogrenci_dersi': len(self.reserved_start_masks),
+            'olanaksizlik_nedenleri': list(self.infeasibility_reasons),
+            'enstrumantasyon': self.instrumentation.to_dict(),
+            'iyilestirmeler': list(self.improvements),
+            'zaman_asimi': self.timed_out,
+            'iptal_edildi': self.cancel_event.is_set(),
             'durum': 'OPTIMAL' if len(self.course_assignments) == len(self.courses) else 'PARTIAL'
         }
 
+    def write_trace(self, path: Optional[Path] = None) -> Path:
+        # JSON çözücü izi varsayılan olarak logs/app.log yanına yazılır
+        stats = self.get_statistics()
+        stats.pop('enstrumantasyon', None)
+        return self.instrumentation.write_trace(path or solver_trace_path(self.exam_schedule['id']), stats)
+
 
 def schedule_exams(
     db: Database,
     exam_schedule_id: int,
     course_ids: List[int],
     classroom_ids: List[int],
-    time_limit_seconds: int = 300
+    time_limit_seconds: int = 300,
+    strategy: str = 'greedy',
+    anytime: bool = False,
+    cancel_event: Optional[threading.Event] = None,
+    anneal: bool = False,
+    workers: Optional[int] = None,
+    course_durations: Optional[Dict[int, int]] = None,
+    trace: bool = False,
+    use_cache: bool = False,
+    decompose: bool = True,
+    share_rooms: bool = False,
+    progress_callback: Optional[Callable[[Dict], None]] = None
 ) -> Tuple[bool, Optional[Dict]]:
 
     try:
         scheduler = ExamScheduler(db, exam_schedule_id)
-        scheduler.prepare_data(course_ids, classroom_ids)
-        
-        success = scheduler.solve(time_limit_seconds=time_limit_seconds)
+        if cancel_event is not None:
+            scheduler.cancel_event = cancel_event
+        scheduler.progress_callback = progress_callback
+        scheduler.prepare_data(course_ids, classroom_ids, course_durations)
+        if share_rooms:
+            scheduler.reserve_shared_rooms()
+            scheduler.reserve_shared_students()
+
+        if strategy == 'cpsat' and not HAS_ORTOOLS:
+            logger.warning("⚠️ OR-Tools kurulu değil, açgözlü çözücü kullanılıyor")
+            strategy = 'greedy'
+
+        # workers verilmezse CP-SAT tüm çekirdekleri kullanır; diğer stratejiler tek süreçte çözülür
+        processes = workers or 1
+        groups: List[List[int]] = []
+        if processes > 1 and decompose and strategy != 'cpsat':
+            groups = scheduler.parallel_groups()
+
+        cache = SolutionCache(db) if use_cache else None
+        if cache is not None and scheduler.restore_from_cache(cache, strategy=strategy, anneal=anneal):
+            success = True
+        elif strategy == 'cpsat':
+            # CP-SAT kendi arama işçilerini kullanır; çoklu başlangıç ve ayrıştırma gerekmez
+            success = scheduler.solve(
+                time_limit_seconds=time_limit_seconds,
+                strategy=strategy,
+                anytime=anytime,
+                anneal=anneal,
+                search_workers=workers
+            )
+        elif len(groups) > 1:
+            success = scheduler.solve_decomposed(
+                workers=workers,
+                groups=groups,
+                time_limit_seconds=time_limit_seconds,
+                strategy=strategy,
+                anneal=anneal
+            )
+        elif processes > 1:
+            success = scheduler.solve_multi_start(
+                workers=workers,
+                time_limit_seconds=time_limit_seconds,
+                strategy=strategy,
+                anytime=anytime,
+                anneal=anneal
+            )
+        else:
+            success = scheduler.solve(
+                time_limit_seconds=time_limit_seconds,
+                strategy=strategy,
+                anytime=anytime,
+                anneal=anneal
+            )
         
         if success:
             scheduler.save_solution()
-            stats = scheduler.get_statistics()
-            return True, stats
-        else:
-            stats = scheduler.get_statistics()
-            return False, stats
+            if cache is not None and not scheduler.cache_hit:
+                cache.put(scheduler.cache_key, scheduler)
+
+        if trace:
+            scheduler.write_trace()
+
+        return success, scheduler.get_statistics()
     
     except Exception as e:
         logger.error(f"Sınav zamanlama hatası: {e}", exc_info=True)
         return False, None
+
+
+def repair_schedule(
+    db: Database,
+    exam_schedule_id: int,
+    changed_course_ids: List[int],
+    classroom_ids: Optional[List[int]] = None
+) -> Tuple[bool, Optional[Dict]]:
+
+    try:
+        scheduler = ExamScheduler(db, exam_schedule_id)
+        success = scheduler.repair(exam_schedule_id, changed_course_ids, classroom_ids)
+        return success, scheduler.get_statistics()
+
+    except Exception as e:
+        logger.error(f"Program onarım hatası: {e}", exc_info=True)
+        return False, None
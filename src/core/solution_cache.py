@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Optional, TYPE_CHECKING
+from src.core.db_raw import Database
+
+if TYPE_CHECKING:
+    from src.core.scheduler import ExamScheduler
+
+logger = logging.getLogger(__name__)
+
+SOLUTION_CACHE_MAX_ENTRIES = 32
+
+# Çözümü etkileyen program parametreleri; ad, id ve oluşturulma zamanı anahtara girmez
+SCHEDULE_KEY_FIELDS = (
+    'start_date', 'end_date', 'allowed_days', 'default_exam_duration',
+    'default_break_duration', 'min_days_between_exams',
+)
+
+
+def enrollment_digest(course_students: Dict[int, frozenset]) -> str:
+    # Seçili derslerin kayıtlarının sıradan bağımsız özeti: ders başına sıralı öğrenci id'leri.
+    # Sayı/toplam gibi özetler farklı kayıt kümelerinde çakışabilir; o durumda önbellek çakışmalı bir program döndürürdü
+    digest = hashlib.sha256()
+    for course_id in sorted(course_students):
+        digest.update(f"{course_id}:".encode())
+        digest.update(",".join(map(str, sorted(course_students[course_id]))).encode())
+        digest.update(b";")
+    return digest.hexdigest()
+
+
+class SolutionCache:
+
+    def __init__(self, db: Database, max_entries: int = SOLUTION_CACHE_MAX_ENTRIES):
+        self.db = db
+        self.max_entries = max_entries
+
+    def key_for(self, scheduler: 'ExamScheduler', **solve_options) -> str:
+        payload = {
+            'program': {field: scheduler.exam_schedule.get(field) for field in SCHEDULE_KEY_FIELDS},
+            'dersler': sorted(
+                (c['id'], scheduler.course_class_levels.get(c['id'], ''), scheduler._course_duration_minutes(c['id']))
+                for c in scheduler.courses
+            ),
+            'derslikler': sorted((c['id'], c['capacity']) for c in scheduler.classrooms),
+            'kayitlar': enrollment_digest(scheduler.course_students),
+            'secenekler': solve_options,
+        }
+        # Başka programların derslik ve öğrenci rezervasyonları da sonucu belirler
+        if scheduler.reserved_room_busy:
+            payload['rezervasyonlar'] = sorted(
+                (classroom_id, day.isoformat(), mask)
+                for (classroom_id, day), mask in scheduler.reserved_room_busy.items()
+            )
+        if scheduler.reserved_start_masks:
+            payload['ogrenci_rezervasyonlari'] = sorted(scheduler.reserved_start_masks.items())
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def restore(self, cache_key: str, scheduler: 'ExamScheduler') -> bool:
+        row = self.db.fetch_one("SELECT payload FROM solution_cache WHERE cache_key = ?", (cache_key,))
+        if not row:
+            return False
+
+        assignments = json.loads(row['payload'])['assignments']
+        classroom_ids = {c['id'] for c in scheduler.classrooms}
+        course_ids = {c['id'] for c in scheduler.courses}
+        snapshot = {}
+        for course_id, (slot_idx, rooms) in assignments.items():
+            course_id = int(course_id)
+            if course_id not in course_ids or slot_idx >= len(scheduler.time_slots) \
+                    or any(room_id not in classroom_ids for room_id in rooms):
+                logger.warning("⚠️ Önbellekteki çözüm güncel verilerle uyuşmuyor, yeniden çözülecek")
+                self.db.execute("DELETE FROM solution_cache WHERE cache_key = ?", (cache_key,))
+                return False
+            snapshot[course_id] = {
+                'slot_idx': slot_idx,
+                'datetime': scheduler.time_slots[slot_idx][0],
+                'classroom_ids': rooms,
+            }
+
+        scheduler._restore_assignments(snapshot)
+        self.db.execute(
+            "UPDATE solution_cache SET last_used_at = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+            (time.time(), cache_key)
+        )
+        logger.info(f"⚡ Önbellekten çözüm yüklendi: {len(snapshot)} ders")
+        return True
+
+    def put(self, cache_key: str, scheduler: 'ExamScheduler'):
+        payload = json.dumps({
+            'assignments': {
+                str(course_id): [a['slot_idx'], list(a['classroom_ids'])]
+                for course_id, a in scheduler.course_assignments.items()
+            },
+        })
+
+        with self.db.get_connection() as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM solution_cache WHERE cache_key = ?", (cache_key,))
+                cursor.execute("""
+                    INSERT INTO solution_cache (cache_key, payload, course_count, created_at, last_used_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (cache_key, payload, len(scheduler.course_assignments),
+                      datetime.now().isoformat(timespec='seconds'), time.time()))
+                cursor.executemany(
+                    "INSERT INTO solution_cache_courses (cache_key, course_id) VALUES (?, ?)",
+                    [(cache_key, c['id']) for c in scheduler.courses]
+                )
+
+                # LRU: en uzun süredir kullanılmayan girdiler sınırın dışına çıkar
+                cursor.execute("""
+                    DELETE FROM solution_cache WHERE cache_key IN (
+                        SELECT cache_key FROM solution_cache
+                        ORDER BY last_used_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        logger.info("💾 Çözüm önbelleğe yazıldı")
+
+    def clear(self):
+        self.db.execute("DELETE FROM solution_cache")
+
+    def entry_count(self) -> int:
+        return self.db.fetch_one("SELECT COUNT(*) AS n FROM solution_cache")['n']
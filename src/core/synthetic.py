@@ -0,0 +1,179 @@
+import logging
+import math
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.core.db_raw import Database
+
+logger = logging.getLogger(__name__)
+
+FIRST_NAMES = [
+    "Ahmet", "Mehmet", "Ayşe", "Fatma", "Mustafa", "Zeynep", "Emre", "Elif", "Burak", "Merve",
+    "Can", "Selin", "Murat", "Ece", "Kerem", "Deniz", "Oğuz", "İrem", "Serkan", "Gizem",
+]
+LAST_NAMES = [
+    "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Yıldırım", "Öztürk", "Aydın", "Özdemir",
+    "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç", "Kurt", "Özkan", "Şimşek",
+]
+
+# (kapasite, sıra, sütun, yan yana oturma): oturma düzenine göre sınav kapasitesi tam olarak kapasiteye eşittir
+CLASSROOM_TEMPLATES = [
+    (30, 15, 4, 2),
+    (40, 10, 8, 2),
+    (60, 10, 12, 2),
+    (90, 15, 9, 3),
+    (100, 10, 20, 2),
+]
+
+EXAM_DURATIONS = (60, 75, 90, 120)
+
+# Derslik sayısı verilmezse havuzun boyutlandırıldığı sınav dönemi (4 hafta, hafta içi)
+DEFAULT_EXAM_DAYS = 20
+
+
+def _department_code(index: int) -> str:
+    # SA, SB, ..., SZ, SAA, ... — ders kodundaki ilk sayı sınıf seviyesi olarak kalır
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return f"S{letters}"
+
+
+def _weighted_sample(rng: random.Random, items: Sequence[int], weights: Sequence[float], k: int) -> List[int]:
+    # Ağırlıklı, tekrarsız seçim (Efraimidis–Spirakis anahtarları)
+    keys = [(rng.random() ** (1.0 / w), item) for item, w in zip(items, weights)]
+    return [item for _, item in sorted(keys, reverse=True)[:k]]
+
+
+def generate_university(db: Database, students: int = 1000, departments: int = 1,
+                        courses_per_level: int = 10, levels: int = 4,
+                        elective_ratio: float = 0.3, electives_per_student: int = 2,
+                        elective_spread: float = 1.0, enrollment_density: float = 0.9,
+                        retake_rate: float = 0.1, classrooms: Optional[int] = None,
+                        exam_days: int = DEFAULT_EXAM_DAYS, seed: int = 42) -> Dict:
+    # Boş bir veritabanına bölüm, ders, öğrenci, kayıt ve derslik üretir; aynı tohum aynı veriyi verir.
+    # elective_spread seçmeli ders popülerliğinin Zipf üssüdür: 0 düzgün dağılım, büyüdükçe birkaç ders öne çıkar.
+    rng = random.Random(seed)
+    logger.info(f"🧪 Sentetik üniversite üretiliyor: {students} öğrenci, {departments} bölüm (tohum {seed})")
+
+    electives_per_level = min(courses_per_level, round(courses_per_level * elective_ratio))
+    mandatory_per_level = courses_per_level - electives_per_level
+
+    with db.get_connection() as conn:
+        try:
+            cursor = conn.cursor()
+
+            department_rows = [
+                (_department_code(d), f"Sentetik Bölüm {d + 1}") for d in range(departments)
+            ]
+            cursor.executemany("INSERT INTO departments (code, name, is_active) VALUES (?, ?, 1)", department_rows)
+            department_by_code = {
+                row['code']: row['id'] for row in cursor.execute("SELECT id, code FROM departments")
+            }
+            department_ids = [department_by_code[code] for code, _ in department_rows]
+
+            # Dersler: her bölüm ve sınıf seviyesinde zorunlu + seçmeli dersler
+            course_rows = []
+            for department_id, (code, _) in zip(department_ids, department_rows):
+                for level in range(1, levels + 1):
+                    for k in range(courses_per_level):
+                        is_mandatory = 1 if k < mandatory_per_level else 0
+                        course_rows.append((
+                            f"{code}{level}{k + 1:02d}",
+                            f"{'Zorunlu' if is_mandatory else 'Seçmeli'} Ders {level}.{k + 1}",
+                            f"Öğr. Gör. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                            department_id, str(level), is_mandatory, rng.choice(EXAM_DURATIONS)
+                        ))
+            cursor.executemany("""
+                INSERT INTO courses (code, name, instructor, department_id, class_level, is_mandatory, default_duration)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, course_rows)
+
+            # (bölüm, seviye) → (zorunlu ders id'leri, popülerliğe göre sıralı seçmeli ders id'leri)
+            catalog: Dict[Tuple[int, int], Tuple[List[int], List[int]]] = {}
+            for row in cursor.execute("SELECT id, department_id, class_level, is_mandatory FROM courses ORDER BY id"):
+                mandatory, electives = catalog.setdefault((row['department_id'], int(row['class_level'])), ([], []))
+                (mandatory if row['is_mandatory'] else electives).append(row['id'])
+
+            student_rows = []
+            for i in range(students):
+                department_idx = i % departments
+                level = rng.randint(1, levels)
+                student_rows.append((
+                    f"{department_idx + 1:03d}{i + 1:07d}",
+                    f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    department_ids[department_idx], str(level)
+                ))
+            cursor.executemany("""
+                INSERT INTO students (student_number, full_name, department_id, class_level)
+                VALUES (?, ?, ?, ?)
+            """, student_rows)
+            student_ids = {
+                row['student_number']: row['id']
+                for row in cursor.execute("SELECT id, student_number FROM students")
+            }
+
+            enrollment_rows = []
+            course_sizes: Dict[int, int] = {}
+            for student_number, _, department_id, level in student_rows:
+                level = int(level)
+                mandatory, electives = catalog[(department_id, level)]
+                picks = {course_id for course_id in mandatory if rng.random() < enrollment_density}
+
+                # Alttan alınan ders: alt sınıflardan bir zorunlu ders
+                if level > 1 and rng.random() < retake_rate:
+                    lower_mandatory = catalog[(department_id, rng.randint(1, level - 1))][0]
+                    if lower_mandatory:
+                        picks.add(rng.choice(lower_mandatory))
+
+                if electives and electives_per_student:
+                    weights = [1.0 / (rank + 1) ** elective_spread for rank in range(len(electives))]
+                    picks.update(_weighted_sample(rng, electives, weights, min(electives_per_student, len(electives))))
+
+                student_id = student_ids[student_number]
+                for course_id in sorted(picks):
+                    enrollment_rows.append((student_id, course_id))
+                    course_sizes[course_id] = course_sizes.get(course_id, 0) + 1
+
+            cursor.executemany("INSERT INTO student_courses (student_id, course_id) VALUES (?, ?)", enrollment_rows)
+
+            # Derslik sayısı verilmezse havuz günlük koltuk talebinden kurulur: kayıtların sınav
+            # günlerine düşen payı aynı anda oturabilmeli, en kalabalık ders de tek slota sığmalı (%20 pay).
+            # Sadece en kalabalık derse göre kurulan havuz günde tek büyük sınava yetiyordu
+            if classrooms is None:
+                mean_capacity = sum(t[0] for t in CLASSROOM_TEMPLATES) / len(CLASSROOM_TEMPLATES)
+                largest = max(course_sizes.values(), default=0)
+                daily_seats = len(enrollment_rows) / max(1, exam_days)
+                classrooms = max(len(CLASSROOM_TEMPLATES), math.ceil(1.2 * max(largest, daily_seats) / mean_capacity))
+
+            classroom_rows = []
+            for r in range(classrooms):
+                capacity, rows, columns, seating = CLASSROOM_TEMPLATES[r % len(CLASSROOM_TEMPLATES)]
+                classroom_rows.append((
+                    f"{_department_code(r % departments)}-D{r + 1:04d}",
+                    department_ids[r % departments], capacity, rows, columns, seating
+                ))
+            cursor.executemany("""
+                INSERT INTO classrooms (code, department_id, capacity, rows, columns, seating_arrangement, is_active)
+                VALUES (?, ?, ?, ?, ?, ?, 1)
+            """, classroom_rows)
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    summary = {
+        'bolum_idleri': department_ids,
+        'ogrenci': len(student_rows),
+        'ders': len(course_rows),
+        'kayit': len(enrollment_rows),
+        'derslik': len(classroom_rows),
+        'en_kalabalik_ders': max(course_sizes.values(), default=0),
+    }
+    logger.info(
+        f"  ✓ {summary['ders']} ders, {summary['ogrenci']} öğrenci, {summary['kayit']} kayıt, "
+        f"{summary['derslik']} derslik üretildi"
+    )
+    return summary
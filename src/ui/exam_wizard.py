@@ -2,13 +2,20 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
     QWizard, QWizardPage, QDateEdit, QSpinBox, QListWidget,
-    QTextEdit, QMessageBox, QCheckBox, QListWidgetItem
+    QTextEdit, QMessageBox, QCheckBox, QListWidgetItem, QProgressDialog
 )
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QThread, pyqtSignal
 from src.core.db_raw import Database
 from src.core.scheduler import schedule_exams
+from src.core.room_packing import pack_rooms
+from src.core.room_occupancy import (
+    RoomCalendar, blocked_start_ranges, earliest_free_start, first_blocked_step
+)
 from datetime import datetime, timedelta
+from bisect import insort
 import logging
+import threading
+import time as time_module
 from src.utils.error_handler import (
     AppException, DatabaseException, ValidationException,
     validate_input, show_error_dialog, show_info_dialog, log_operation
@@ -17,6 +24,49 @@ from src.utils.error_handler import (
 logger = logging.getLogger(__name__)
 
 
+class SchedulingWorker(QThread):
+    progress = pyqtSignal(dict)
+    # QThread.finished ile karışmasın: iş parçacığının kendi bitiş sinyali korunur
+    completed = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+    def __init__(self, wizard: 'ExamWizard', exam_schedule_id: int, scheduling_args: dict):
+        super().__init__()
+        self.wizard = wizard
+        self.exam_schedule_id = exam_schedule_id
+        self.scheduling_args = scheduling_args
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        # Zamanlama GUI iş parçacığının dışında; iptal bayrağı zamanlama döngülerinde kontrol edilir
+        # Paralel sınavlı program zamanlama motoruyla, sıralı program sihirbazın kendi yerleştiricisiyle çözülür
+        try:
+            args = self.scheduling_args
+            if args.get('allow_parallel', True):
+                success_count = self.wizard.engine_scheduling(
+                    self.exam_schedule_id,
+                    args['course_ids'],
+                    args['classroom_ids'],
+                    course_durations=args.get('course_durations'),
+                    progress_callback=self.progress.emit,
+                    cancel_event=self.cancel_event
+                )
+            else:
+                success_count = self.wizard.simple_scheduling(
+                    self.exam_schedule_id,
+                    progress_callback=self.progress.emit,
+                    cancel_event=self.cancel_event,
+                    **args
+                )
+            self.completed.emit(success_count)
+        except Exception as e:
+            logger.error(f"Zamanlama işçisi hatası: {e}")
+            self.error.emit(str(e))
+
+
 class ExamWizard(QWizard):
     
     def __init__(self, current_user, parent=None):
@@ -26,6 +76,9 @@ class ExamWizard(QWizard):
         self.selected_courses = []
         self.selected_classrooms = []
         self.course_durations = {}
+        self.scheduling_worker = None
+        self.scheduling_progress = None
+        self.scheduling_context = {}
 
         self.setWindowTitle("📅 Sınav Programı Oluştur")
         self.setWizardStyle(QWizard.WizardStyle.ModernStyle)
@@ -37,7 +90,17 @@ class ExamWizard(QWizard):
         self.addPage(ClassroomSelectionPage(self.current_user, self))
         self.addPage(SummaryPage(self.current_user, self))
 
-        self.button(QWizard.WizardButton.FinishButton).clicked.connect(self.on_finish_clicked)
+    def accept(self):
+        # Finish: zamanlama arka planda çalışır, sihirbaz iş bitince kapanır
+        if self.scheduling_worker is not None and self.scheduling_worker.isRunning():
+            return
+        self.on_finish_clicked()
+
+    def reject(self):
+        if self.scheduling_worker is not None and self.scheduling_worker.isRunning():
+            self.scheduling_worker.cancel()
+            self.scheduling_worker.wait()
+        super().reject()
 
     def on_finish_clicked(self):
         try:
@@ -120,75 +183,125 @@ class ExamWizard(QWizard):
             log_operation(f"Sınav Programı DB Hatası: {str(db_error)}", success=False)
             raise
 
-        try:
-            logger.info("Otomatik zamanlama başlatılıyor...")
-            success_count = self.simple_scheduling(
-                exam_schedule_id,
-                selected_courses,
-                selected_classrooms,
-                start_date_py,
-                end_date_py,
-                default_duration,
-                wait_duration,
-                exclude_weekends,
-                    allow_parallel,
-                    course_durations
-                )
+        logger.info("Otomatik zamanlama başlatılıyor...")
+        self.scheduling_context = {
+            'exam_schedule_id': exam_schedule_id,
+            'date_range': f"{start_date.date().toString('dd.MM.yyyy')} - {end_date.date().toString('dd.MM.yyyy')}",
+            'course_count': len(selected_courses),
+        }
+        self.scheduling_worker = SchedulingWorker(self, exam_schedule_id, {
+            'course_ids': selected_courses,
+            'classroom_ids': selected_classrooms,
+            'start_date': start_date_py,
+            'end_date': end_date_py,
+            'default_duration': default_duration,
+            'wait_duration': wait_duration,
+            'exclude_weekends': exclude_weekends,
+            'allow_parallel': allow_parallel,
+            'course_durations': course_durations,
+        })
+
+        progress = QProgressDialog("Sınav programı oluşturuluyor...", "İptal", 0, len(selected_courses), self)
+        progress.setWindowTitle("Zamanlama")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.canceled.connect(self.cancel_scheduling)
+        self.scheduling_progress = progress
+
+        self.scheduling_worker.progress.connect(self.on_scheduling_progress)
+        self.scheduling_worker.completed.connect(self.on_scheduling_completed)
+        self.scheduling_worker.error.connect(self.on_scheduling_error)
+        self.scheduling_worker.start()
+        progress.show()
+
+    def cancel_scheduling(self):
+        if self.scheduling_worker is not None and self.scheduling_worker.isRunning():
+            logger.info("⏹️ Zamanlama iptal isteği gönderildi")
+            self.scheduling_worker.cancel()
+            self.scheduling_progress.setLabelText("⏹️ İptal ediliyor, yerleştirilen dersler korunuyor...")
+
+    def on_scheduling_progress(self, progress: dict):
+        if self.scheduling_progress is None or self.scheduling_worker.cancel_event.is_set():
+            return
+        self.scheduling_progress.setMaximum(progress['toplam_ders'])
+        self.scheduling_progress.setValue(progress['yerlestirildi'])
+        self.scheduling_progress.setLabelText(
+            f"📚 {progress['yerlestirildi']} / {progress['toplam_ders']} ders yerleştirildi\n"
+            f"🏆 En iyi: {progress['en_iyi_yerlestirildi']} ders, "
+            f"{progress['kullanilan_derslik_atamasi']} derslik ataması\n"
+            f"⏱️ {progress['sure']:.1f} sn"
+        )
+
+    def _close_scheduling_progress(self):
+        if self.scheduling_progress is not None:
+            self.scheduling_progress.close()
+            self.scheduling_progress = None
+
+    def on_scheduling_completed(self, success_count: int):
+        self._close_scheduling_progress()
+        context = self.scheduling_context
+        cancelled = self.scheduling_worker.cancel_event.is_set()
+        self.scheduling_worker.wait()
 
+        if cancelled:
+            show_info_dialog(
+                self,
+                "Zamanlama İptal Edildi",
+                f"Zamanlama kullanıcı tarafından durduruldu.\n\n"
+                f"📋 Program ID: {context['exam_schedule_id']}\n"
+                f"✅ Korunan: {success_count} / {context['course_count']} ders\n\n"
+                f"Kısmi programı görüntülemek için ana menüye dönün."
+            )
+            log_operation(f"Sınav Programı İptal Edildi: {success_count}/{context['course_count']} ders", success=False)
+        else:
             show_info_dialog(
                 self,
                 "Sınav Programı Oluşturuldu ✓",
                 f"Sınav programı başarıyla oluşturuldu!\n\n"
-                f"📋 Program ID: {exam_schedule_id}\n"
-                f"📅 Tarih: {start_date.date().toString('dd.MM.yyyy')} - {end_date.date().toString('dd.MM.yyyy')}\n"
-                f"✅ Zamanlanan: {success_count} / {len(selected_courses)} ders\n\n"
+                f"📋 Program ID: {context['exam_schedule_id']}\n"
+                f"📅 Tarih: {context['date_range']}\n"
+                f"✅ Zamanlanan: {success_count} / {context['course_count']} ders\n\n"
                 f"Sınav programını görüntülemek için ana menüye dönün."
             )
-            log_operation(f"Sınav Programı Tamamlandı: {success_count}/{len(selected_courses)} ders", success=True)
-
-        except Exception as sched_error:
-            logger.error(f"Zamanlama hatası: {str(sched_error)}")
-            log_operation(f"Zamanlama Hatası: {str(sched_error)}", success=False)
-
-            show_error_dialog(
-                self,
-                "Zamanlama Başarısız ❌",
-                f"Sınav programı oluşturulamadı!\n\n{str(sched_error)}"
-            )
-            return  # Wizard'ı açık bırak
+            log_operation(f"Sınav Programı Tamamlandı: {success_count}/{context['course_count']} ders", success=True)
+        super().accept()
+
+    def on_scheduling_error(self, message: str):
+        self._close_scheduling_progress()
+        self.scheduling_worker.wait()
+        logger.error(f"Zamanlama hatası: {message}")
+        log_operation(f"Zamanlama Hatası: {message}", success=False)
+
+        show_error_dialog(
+            self,
+            "Zamanlama Başarısız ❌",
+            f"Sınav programı oluşturulamadı!\n\n{message}"
+        )
+        # Wizard'ı açık bırak
 
     def _find_best_classrooms(self, available_classrooms: list, student_count: int) -> list:
-        import itertools
         import random
 
+        # Eşit kapasiteli derslikler arasında seçim karışık kalsın
         random.shuffle(available_classrooms)
-
-        for num_rooms in range(1, len(available_classrooms) + 1):
-            suitable_combos = []
-
-            for combo in itertools.combinations(available_classrooms, num_rooms):
-                total_capacity = sum(r['capacity'] for r in combo)
-                if total_capacity >= student_count:
-                    wasted_space = total_capacity - student_count
-                    suitable_combos.append((combo, wasted_space))
-
-            if suitable_combos:
-                min_waste = min(wasted_space for combo, wasted_space in suitable_combos)
-                best_combos = [combo for combo, wasted_space in suitable_combos if wasted_space == min_waste]
-                
-                return list(random.choice(best_combos))
-
-        return []
+        return pack_rooms(available_classrooms, student_count)
 
     def simple_scheduling(self, exam_schedule_id, course_ids, classroom_ids,
                           start_date, end_date, default_duration, wait_duration,
-                          exclude_weekends=True, allow_parallel=True, course_durations=None):
+                          exclude_weekends=True, allow_parallel=True, course_durations=None,
+                          progress_callback=None, cancel_event=None):
         from src.core.db_raw import Database
         from datetime import timedelta, datetime, time
         from collections import defaultdict
 
         db = Database()
         course_durations = course_durations or {}
+        started_at = time_module.perf_counter()
+
+        def cancelled():
+            return cancel_event is not None and cancel_event.is_set()
         
         logger.info(f"🔄 DİNAMİK ZAMANLAMA Başlatılıyor:")
         logger.info(f"  📚 Ders sayısı: {len(course_ids)}")
@@ -250,14 +363,23 @@ class ExamWizard(QWizard):
             raise Exception(
                 f"❌ Kapasite Yetersiz! Toplam kapasite ({total_classroom_capacity}), en kalabalık sınavı ({max_student_count} öğrenci) karşılamıyor.")
 
-        student_schedule = defaultdict(list)
-        classroom_schedule = {c['id']: [] for c in classrooms}
+        day_start_minute = DAY_START_TIME.hour * 60 + DAY_START_TIME.minute
+        day_end_minute = DAY_END_TIME.hour * 60 + DAY_END_TIME.minute
+
+        # Öğrenci → gün → sıralı (başlangıç, bitiş) dakika aralıkları
+        student_busy = defaultdict(dict)
+        busy_dates = set()
+        room_calendar = RoomCalendar({c['id']: c['capacity'] for c in classrooms})
         class_level_daily_count = defaultdict(int)
         class_level_used_dates = defaultdict(set)
         scheduled_courses = []
         failed_courses = []
+        room_assignments = 0
 
         for course in courses_data:
+            if cancelled():
+                break
+
             course_id = course['id']
             course_code = course['code']
             student_count = course['student_count']
@@ -272,7 +394,7 @@ class ExamWizard(QWizard):
             scheduled = False
             current_date = start_date
             
-            while current_date <= end_date and not scheduled:
+            while current_date <= end_date and not scheduled and not cancelled():
                 if exclude_weekends and current_date.weekday() >= 5:
                     current_date += timedelta(days=1)
                     continue
@@ -286,92 +408,64 @@ class ExamWizard(QWizard):
                     current_date += timedelta(days=1)
                     continue
                 
-                current_time = DAY_START_TIME
-                attempted_times = set()
+                # Dersin öğrencilerinin o günkü meşgul aralıklarının birleşimi tek seferde çıkarılır;
+                # aday başlangıçlar birleştirilmiş kapalı aralıklar üzerinde ikili aramayla ilerler
+                day_ranges = set()
+                if current_date in busy_dates:
+                    for sid in course_student_ids:
+                        ranges = student_busy[sid].get(current_date) if sid in student_busy else None
+                        if ranges:
+                            day_ranges.update(ranges)
+                blocked_lows, blocked_highs = blocked_start_ranges(day_ranges, duration, wait_duration)
+
+                current_minute = day_start_minute
                 
-                while current_time < DAY_END_TIME and not scheduled:
-                    current_dt = datetime.combine(current_date, current_time)
-                    exam_end_dt = current_dt + timedelta(minutes=duration)
-                    
-                    if exam_end_dt.time() > DAY_END_TIME:
+                while current_minute < day_end_minute and not scheduled and not cancelled():
+                    if current_minute + duration > day_end_minute:
                         break
-                    
-                    time_key = current_time.strftime('%H:%M')
-                    if time_key in attempted_times:
-                        current_time = (current_dt + timedelta(minutes=15)).time()
-                        continue
-                    attempted_times.add(time_key)
-                    
-                    student_conflict = False
-                    
-                    for sid in course_student_ids:
-                        for (start, end) in student_schedule[sid]:
-                            end_with_wait = end + timedelta(minutes=wait_duration)
-                            
-                            if current_dt < end_with_wait and exam_end_dt > start:
-                                student_conflict = True
-                                break
-                        if student_conflict:
-                            break
-                    
-                    if student_conflict:
+
+                    free_minute = earliest_free_start(blocked_lows, blocked_highs, current_minute)
+                    if free_minute != current_minute:
                         if allow_parallel:
-                            earliest_available = None
-                            for sid in course_student_ids:
-                                for (start, end) in student_schedule[sid]:
-                                    end_with_wait = end + timedelta(minutes=wait_duration)
-                                    if current_dt < end_with_wait and exam_end_dt > start:
-                                        if earliest_available is None or end_with_wait > earliest_available:
-                                            earliest_available = end_with_wait
-                            
-                            if earliest_available and earliest_available.time() < DAY_END_TIME:
-                                current_time = earliest_available.time()
-                            else:
-                                break
+                            # Çakışan en geç biten sınavın bekleme sonrası: aradaki her başlangıç da çakışır
+                            next_minute = free_minute
                         else:
-                            next_time = None
-                            for sid in course_student_ids:
-                                for (start, end) in student_schedule[sid]:
-                                    if start <= current_dt < end:
-                                        end_with_break = end + timedelta(minutes=wait_duration)
-                                        if next_time is None or end_with_break.time() < next_time:
-                                            next_time = end_with_break.time()
-                            
-                            if next_time and next_time < DAY_END_TIME:
-                                current_time = next_time
-                            else:
-                                break
+                            next_minute = min(
+                                (end + wait_duration for start, end in day_ranges if start <= current_minute < end),
+                                default=None
+                            )
+
+                        if next_minute is not None and next_minute < day_end_minute:
+                            current_minute = next_minute
+                        else:
+                            break
                         continue
-                    
-                    available_classrooms = []
-                    for classroom in classrooms:
-                        is_free = True
-                        for (start, end) in classroom_schedule[classroom['id']]:
-                            if current_dt < end and exam_end_dt > start:
-                                is_free = False
-                                break
-                        if is_free:
-                            available_classrooms.append(classroom)
-                    
-                    total_available_capacity = sum(c['capacity'] for c in available_classrooms)
-                    
-                    if total_available_capacity < student_count:
+
+                    end_minute = current_minute + duration
+                    if room_calendar.free_capacity(current_date, current_minute, end_minute) < student_count:
                         if allow_parallel:
-                            current_time = (current_dt + timedelta(minutes=15)).time()
+                            # 15 dakikalık adımlar yerine kapasitenin yettiği ilk adıma atlanır; arada öğrenci
+                            # çakışmasına düşen bir adım varsa önce o denenir (oradan çakışma sonuna atlanır)
+                            latest = day_end_minute - duration
+                            jumps = [m for m in (
+                                room_calendar.next_free_start(current_date, current_minute, duration,
+                                                              student_count, 15, latest),
+                                first_blocked_step(blocked_lows, blocked_highs, current_minute, 15, latest)
+                            ) if m is not None]
+                            if not jumps:
+                                break
+                            current_minute = min(jumps)
                         else:
-                            next_time = None
-                            for classroom in classrooms:
-                                for (start, end) in classroom_schedule[classroom['id']]:
-                                    if start <= current_dt < end:
-                                        end_with_break = end + timedelta(minutes=wait_duration)
-                                        if next_time is None or end_with_break.time() < next_time:
-                                            next_time = end_with_break.time()
-                            
-                            if next_time and next_time < DAY_END_TIME:
-                                current_time = next_time
+                            next_minute = room_calendar.earliest_end_covering(current_date, current_minute)
+                            if next_minute is not None and next_minute + wait_duration < day_end_minute:
+                                current_minute = next_minute + wait_duration
                             else:
                                 break
                         continue
+
+                    busy_rooms = room_calendar.busy_classrooms(current_date, current_minute, end_minute)
+                    available_classrooms = [c for c in classrooms if c['id'] not in busy_rooms]
+                    current_dt = datetime.combine(current_date, time(current_minute // 60, current_minute % 60))
                     
                     selected_classrooms = self._find_best_classrooms(available_classrooms, student_count)
                     
@@ -384,20 +478,25 @@ class ExamWizard(QWizard):
                              start_time_str, duration, student_count, 'scheduled'))
                         
                         for sid in course_student_ids:
-                            student_schedule[sid].append((current_dt, exam_end_dt))
+                            insort(student_busy[sid].setdefault(current_date, []),
+                                   (current_minute, current_minute + duration))
+                        busy_dates.add(current_date)
                         
                         remaining_students = student_count
+                        used_rooms = []
                         for room in selected_classrooms:
                             allocated = min(remaining_students, room['capacity'])
                             db.execute(
                                 "INSERT INTO exam_sessions (exam_id, classroom_id, allocated_seats) VALUES (?, ?, ?)",
                                 (exam_id, room['id'], allocated))
                             
-                            classroom_schedule[room['id']].append((current_dt, exam_end_dt))
+                            used_rooms.append(room['id'])
                             remaining_students -= allocated
+                            room_assignments += 1
                             
                             if remaining_students <= 0:
                                 break
+                        room_calendar.book(current_date, current_minute, end_minute, used_rooms)
                         
                         if class_level:
                             class_level_daily_count[(class_level, current_date)] += 1
@@ -419,12 +518,31 @@ class ExamWizard(QWizard):
                 if not scheduled:
                     current_date += timedelta(days=1)
             
+            if not scheduled and cancelled():
+                break
+
             if not scheduled:
                 failed_courses.append(course)
                 logger.warning(f"  ❌ {course_code}: Uygun zaman bulunamadı!")
+
+            if progress_callback is not None:
+                progress_callback({
+                    'sure': round(time_module.perf_counter() - started_at, 2),
+                    'yerlestirildi': len(scheduled_courses),
+                    'toplam_ders': len(courses_data),
+                    'kullanilan_derslik_atamasi': room_assignments,
+                    'en_iyi_yerlestirildi': len(scheduled_courses),
+                })
         
         success_count = len(scheduled_courses)
         failed_count = len(failed_courses)
+
+        if cancelled():
+            # İptalde yerleştirilen sınavlar veritabanında kalır (kısmi program)
+            logger.warning(
+                f"⏹️ Zamanlama iptal edildi: {success_count}/{len(courses_data)} ders yerleştirilmişti, korunuyor"
+            )
+            return success_count
         
         logger.info(f"\n{'='*60}")
         logger.info(f"✅ ZAMANLAMA TAMAMLANDI")
@@ -566,62 +684,43 @@ class ExamWizard(QWizard):
 
 
 
-    def run_scheduling(self, exam_schedule_id: int, course_ids: list, classroom_ids: list):
-        
-        try:
-            logger.info("🔄 Zamanlama başlatılıyor...")
-            logger.info(f"  ExamSchedule ID: {exam_schedule_id}")
-            logger.info(f"  Ders sayısı: {len(course_ids)}")
-            logger.info(f"  Derslik sayısı: {len(classroom_ids)}")
-
-            # Zamanlama motorunu çalıştır
-            success, stats = schedule_exams(
-                db=self.db,
-                exam_schedule_id=exam_schedule_id,
-                course_ids=course_ids,
-                classroom_ids=classroom_ids,
-                time_limit_seconds=300  # 5 dakika
-            )
-
-            logger.info(f"Zamanlama tamamlandı: success={success}")
-
-            if success:
-                logger.info("✓ Zamanlama başarılı!")
-                QMessageBox.information(
-                    self,
-                    "Başarılı",
-                    f"✓ Sınav programı başarıyla oluşturuldu!\n\n"
-                    f"📊 İstatistikler:\n"
-                    f"  • Zamanlanan Ders: {stats['toplam_ders']}\n"
-                    f"  • Kullanılan Derslik: {stats['toplam_derslik']}\n"
-                    f"  • Toplam Slot: {stats['toplam_slot']}\n"
-                    f"  • Çözüm Süresi: {stats['cozum_suresi']:.2f} saniye\n"
-                    f"  • Durum: {stats['durum']}\n\n"
-                    f"Sınav programını görüntülemek için ana menüye dönün."
-                )
-            else:
-                logger.warning("⚠ Zamanlama başarısız - Geçerli çözüm bulunamadı")
-                QMessageBox.warning(
-                    self,
-                    "Uyarı",
-                    "⚠️ Geçerli bir zamanlama bulunamadı!\n\n"
-                    "Olası nedenler:\n"
-                    "• Derslik kapasitesi yetersiz\n"
-                    "• Zaman dilimi sayısı yetersiz\n"
-                        "• Öğrenci çakışması çözülemedi\n\n"
-                        "Lütfen parametreleri gözden geçirip tekrar deneyin."
-                    )
-
-        except Exception as e:
-            logger.error(f"Zamanlama hatası: {str(e)}", exc_info=True)
-            import traceback
-            traceback.print_exc()
-            QMessageBox.critical(
-                self,
-                "Hata",
-                f"Zamanlama sırasında hata oluştu:\n\n{str(e)}\n\n"
-                f"Detaylar log dosyasında."
-            )
+    def engine_scheduling(self, exam_schedule_id, course_ids, classroom_ids, course_durations=None,
+                          progress_callback=None, cancel_event=None):
+        # Paralel sınavlı program zamanlama motoruyla çözülür: kayıtlı diğer programların derslik oturumları
+        # ve ortak öğrencilerinin sınavları dolu sayılır; aynı girdilerin önbellekteki çözümü yeniden kullanılır
+        logger.info("🔄 Zamanlama motoru başlatılıyor...")
+        logger.info(f"  ExamSchedule ID: {exam_schedule_id}")
+        logger.info(f"  Ders sayısı: {len(course_ids)}")
+        logger.info(f"  Derslik sayısı: {len(classroom_ids)}")
+
+        success, stats = schedule_exams(
+            db=Database(),
+            exam_schedule_id=exam_schedule_id,
+            course_ids=course_ids,
+            classroom_ids=classroom_ids,
+            time_limit_seconds=300,  # 5 dakika
+            cancel_event=cancel_event,
+            course_durations=course_durations,
+            use_cache=True,
+            share_rooms=True,
+            progress_callback=progress_callback
+        )
+        if stats is None:
+            raise Exception("❌ Zamanlama motoru hata verdi. Detaylar log dosyasında.")
+
+        logger.info(f"Zamanlama tamamlandı: success={success}")
+        if success:
+            return stats['yerlestirildi']
+        if stats['iptal_edildi']:
+            # Motor yalnızca tam çözümü kaydeder; iptalde program boş kalır
+            return 0
+
+        reasons = "\n".join(f"• {reason}" for reason in stats['olanaksizlik_nedenleri'])
+        raise Exception(
+            f"❌ Zamanlama Kısmen Başarısız!\n\n"
+            f"{stats['toplam_ders'] - stats['yerlestirildi']} / {stats['toplam_ders']} ders yerleştirilemedi.\n"
+            f"{reasons}\n\nÖneri: Tarih aralığını genişletin veya daha fazla derslik seçin."
+        )
 
 
 class DateSelectionPage(QWizardPage):
@@ -0,0 +1,137 @@
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import List, Tuple
+
+import pytest
+
+from src.core import conflict_graph
+from src.core.db_raw import Database
+from src.core.scheduler import ExamScheduler
+from src.core.synthetic import generate_university
+
+START_DATE = date(2026, 1, 5)
+WINDOW_DAYS = 16
+EXAM_DAYS = 12
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture(autouse=True)
+def conflict_graph_dir(tmp_path, monkeypatch):
+    # Kaydedilen çakışma grafları depo altındaki data/ yerine geçici dizine yazılır
+    directory = tmp_path / "conflict_graphs"
+    monkeypatch.setattr(conflict_graph, 'CONFLICT_GRAPH_DIR', directory)
+    return directory
+
+
+def create_schedule(db: Database, min_days_between: int = 0) -> int:
+    user_id = db.execute(
+        """INSERT INTO users (email, password_hash, full_name, role, is_active)
+           VALUES ('test@exam.com', '!', 'Test', 'admin', 1)"""
+    )
+    return db.execute("""
+        INSERT INTO exam_schedules
+        (name, start_date, end_date, allowed_days, default_exam_duration, default_break_duration,
+         min_days_between_exams, created_by)
+        VALUES (?, ?, ?, '0,1,2,3,4', 75, 15, ?, ?)
+    """, (
+        "Test Sınavı",
+        START_DATE.isoformat(),
+        (START_DATE + timedelta(days=WINDOW_DAYS - 1)).isoformat(),
+        min_days_between,
+        user_id
+    ))
+
+
+def copy_schedule(db: Database, schedule_id: int) -> int:
+    # Aynı tarih aralığında ikinci bir program
+    return db.execute("""
+        INSERT INTO exam_schedules
+        (name, start_date, end_date, allowed_days, default_exam_duration, default_break_duration,
+         min_days_between_exams, created_by)
+        SELECT name || ' (2)', start_date, end_date, allowed_days, default_exam_duration, default_break_duration,
+               min_days_between_exams, created_by
+        FROM exam_schedules WHERE id = ?
+    """, (schedule_id,))
+
+
+def make_university(path, min_days_between: int = 0, **options) -> Tuple[Database, int]:
+    db = Database(db_path=path)
+    db.create_tables()
+    options = {'students': 400, 'departments': 2, 'courses_per_level': 5, 'levels': 4,
+               'exam_days': EXAM_DAYS, 'seed': 7, **options}
+    generate_university(db, **options)
+    return db, create_schedule(db, min_days_between)
+
+
+def all_ids(db: Database) -> Tuple[List[int], List[int]]:
+    course_ids = [row['id'] for row in db.fetch_all("SELECT id FROM courses ORDER BY id")]
+    classroom_ids = [row['id'] for row in db.fetch_all("SELECT id FROM classrooms ORDER BY id")]
+    return course_ids, classroom_ids
+
+
+def hard_constraint_violations(scheduler: ExamScheduler) -> List[Tuple]:
+    # Yerleşimi zamanlayıcının iç tablolarından bağımsız olarak, sadece atamalardan denetler
+    violations = []
+    assignments = scheduler.course_assignments
+    break_minutes = timedelta(minutes=scheduler.exam_schedule.get('default_break_duration') or 0)
+    min_days = scheduler.exam_schedule.get('min_days_between_exams') or 0
+
+    def interval(course_id: int):
+        start = assignments[course_id]['datetime']
+        return start, start + timedelta(minutes=scheduler._course_duration_minutes(course_id))
+
+    # Öğrenci çakışması: ortak öğrencisi olan iki sınav arasında en az ara süresi kadar boşluk olmalı
+    for student_id, course_ids in scheduler.student_courses.items():
+        placed = sorted((c for c in course_ids if c in assignments), key=lambda c: assignments[c]['datetime'])
+        for i, first in enumerate(placed):
+            first_start, first_end = interval(first)
+            for second in placed[i + 1:]:
+                second_start, _ = interval(second)
+                if second_start < first_end + break_minutes:
+                    violations.append(('ogrenci', student_id, first, second))
+                if min_days and (second_start.date() - first_start.date()).days < min_days:
+                    violations.append(('min_gun', student_id, first, second))
+
+    # Aynı sınıf seviyesinden günde en fazla bir sınav
+    level_days = defaultdict(list)
+    for course_id, assignment in assignments.items():
+        class_level = scheduler.course_class_levels.get(course_id)
+        if class_level:
+            level_days[(assignment['datetime'].date(), class_level)].append(course_id)
+    violations.extend(('seviye', key, courses) for key, courses in level_days.items() if len(courses) > 1)
+
+    # Derslik kapasitesi ve aynı dersliğin üst üste binen iki sınava verilmemesi
+    capacities = {c['id']: c['capacity'] for c in scheduler.classrooms}
+    room_bookings = defaultdict(list)
+    for course_id, assignment in assignments.items():
+        if sum(capacities[room_id] for room_id in assignment['classroom_ids']) < scheduler.course_student_counts[course_id]:
+            violations.append(('kapasite', course_id))
+        start, end = interval(course_id)
+        for room_id in assignment['classroom_ids']:
+            for other, other_start, other_end in room_bookings[room_id]:
+                if start < other_end and other_start < end:
+                    violations.append(('derslik', room_id, course_id, other))
+            room_bookings[room_id].append((course_id, start, end))
+
+    return violations
+
+
+@pytest.fixture
+def university(tmp_path):
+    return make_university(tmp_path / "test.db")
+
+
+@pytest.fixture
+def scheduler(university):
+    db, schedule_id = university
+    course_ids, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids, classroom_ids)
+    return scheduler
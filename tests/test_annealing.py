@@ -0,0 +1,62 @@
+import pytest
+
+from src.core.annealing import MIN_TEMPERATURE, ScheduleAnnealer
+from src.core.scheduler import ExamScheduler
+from tests.conftest import all_ids, hard_constraint_violations, make_university
+
+MOVES = ('_move_one', '_swap_two', '_kempe_swap')
+
+
+def test_annealing_lowers_soft_cost_and_keeps_every_course(scheduler):
+    assert scheduler.solve(strategy='greedy')
+    placed = set(scheduler.course_assignments)
+    before = ScheduleAnnealer(scheduler).evaluate()['toplam']
+
+    scheduler._improve_with_annealing(seed=1, max_moves=5000)
+
+    assert set(scheduler.course_assignments) == placed
+    assert scheduler.soft_cost == ScheduleAnnealer(scheduler).evaluate()
+    assert scheduler.soft_cost['toplam'] <= before
+    # Artımlı maliyet tam hesaplamayla aynı olmalı
+    assert scheduler.annealing_stats['en_iyi_maliyet'] == pytest.approx(scheduler.soft_cost['toplam'])
+
+
+@pytest.mark.parametrize('min_days_between', [0, 1])
+@pytest.mark.parametrize('move', MOVES)
+def test_each_move_keeps_feasibility_and_incremental_cost(tmp_path, move, min_days_between):
+    db, schedule_id = make_university(tmp_path / "test.db", min_days_between)
+    course_ids, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids, classroom_ids)
+    assert scheduler.solve(strategy='greedy')
+
+    annealer = ScheduleAnnealer(scheduler, seed=3)
+    accepted = 0
+    most_moved = 0
+    with scheduler._untracked_slot_masks():
+        annealer._build_counters()
+        annealer.course_ids = list(scheduler.course_assignments)
+        assert annealer.cost == pytest.approx(annealer.evaluate()['toplam'])
+
+        for step in range(300):
+            before = dict(scheduler.course_assignments)
+            cost_before = annealer.cost
+            # Yüksek sıcaklık uygun her hareketi kabul eder; düşük sıcaklıkta derslik yerleştirildikten
+            # sonra reddedilen hareketlerin geri alınması da denenir
+            temperature = 1e6 if step % 2 else MIN_TEMPERATURE
+            if getattr(annealer, move)(temperature):
+                accepted += 1
+                assert set(scheduler.course_assignments) == set(before)
+                most_moved = max(most_moved, sum(
+                    scheduler.course_assignments[c]['slot_idx'] != before[c]['slot_idx'] for c in before
+                ))
+                assert hard_constraint_violations(scheduler) == []
+            else:
+                assert scheduler.course_assignments == before
+                assert annealer.cost == cost_before
+            assert annealer.cost == pytest.approx(annealer.evaluate()['toplam'])
+
+    assert accepted > 0
+    # Takas iki dersi, Kempe zinciri en az iki dersi birlikte taşır
+    assert most_moved == 1 if move == '_move_one' else most_moved >= 2
+    assert hard_constraint_violations(scheduler) == []
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from src.core.scheduler import ExamScheduler
+from tests.conftest import all_ids, hard_constraint_violations, make_university
+
+
+def prepared(db, schedule_id) -> ExamScheduler:
+    course_ids, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids, classroom_ids)
+    return scheduler
+
+
+@pytest.fixture
+def unsolvable(tmp_path):
+    # Seviye başına 16 sınav, 12 sınav günü: tam çözüm yok, arama süre dolana kadar sürer
+    db, schedule_id = make_university(tmp_path / "test.db", courses_per_level=8)
+    return prepared(db, schedule_id)
+
+
+def scores(improvements):
+    return [(i['yerlestirildi'], -i['kullanilan_derslik_atamasi']) for i in improvements]
+
+
+def test_anytime_improves_on_the_first_pass(tmp_path):
+    # Az derslik ve min gün kuralı: ilk açgözlü geçiş bazı dersleri yerleştiremez
+    db, schedule_id = make_university(tmp_path / "tight.db", 1, students=600, departments=1,
+                                      courses_per_level=6, levels=6, classrooms=5, seed=11)
+    scheduler = prepared(db, schedule_id)
+
+    assert scheduler.solve(time_limit_seconds=60, anytime=True, backtracking=False)
+
+    improvements = scheduler.get_statistics()['iyilestirmeler']
+    assert improvements == scheduler.improvements
+    assert improvements[0]['iterasyon'] == 0
+    assert improvements[0]['yerlestirildi'] < len(scheduler.courses)
+    assert scores(improvements) == sorted(set(scores(improvements)))
+    assert [i['sure'] for i in improvements] == sorted(i['sure'] for i in improvements)
+    assert scores(improvements)[-1] == scheduler._solution_score()
+    assert hard_constraint_violations(scheduler) == []
+
+
+def test_anytime_returns_the_best_solution_at_the_deadline(unsolvable):
+    started = time.monotonic()
+    assert not unsolvable.solve(time_limit_seconds=1, anytime=True, backtracking=False)
+
+    assert time.monotonic() - started < 3
+    stats = unsolvable.get_statistics()
+    assert stats['zaman_asimi'] and not stats['iptal_edildi']
+    assert unsolvable.iterations > 0
+    assert unsolvable._solution_score() == max(scores(unsolvable.improvements))
+    assert hard_constraint_violations(unsolvable) == []
+
+
+def test_cancel_returns_the_best_solution(unsolvable):
+    timer = threading.Timer(0.5, unsolvable.cancel)
+    timer.start()
+    started = time.monotonic()
+    try:
+        assert not unsolvable.solve(time_limit_seconds=60, anytime=True, backtracking=False)
+    finally:
+        timer.cancel()
+
+    assert time.monotonic() - started < 3
+    stats = unsolvable.get_statistics()
+    assert stats['iptal_edildi'] and not stats['zaman_asimi']
+    assert unsolvable._solution_score() == max(scores(unsolvable.improvements))
+    assert hard_constraint_violations(unsolvable) == []
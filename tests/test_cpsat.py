@@ -0,0 +1,68 @@
+import pytest
+
+from src.core.cpsat_backend import HAS_ORTOOLS
+from src.core import cpsat_backend
+from src.core.scheduler import ExamScheduler, schedule_exams
+from tests.conftest import all_ids, hard_constraint_violations, make_university
+
+pytestmark = pytest.mark.skipif(not HAS_ORTOOLS, reason="OR-Tools kurulu değil")
+
+
+@pytest.fixture
+def tight_university(tmp_path):
+    # Az derslik ve min gün kuralı: açgözlü sıralama bazı dersleri yerleştiremez
+    return make_university(tmp_path / "tight.db", 1, students=600, departments=1,
+                           courses_per_level=6, levels=6, classrooms=5, seed=11)
+
+
+def solve_without_backtracking(db, schedule_id, strategy: str) -> ExamScheduler:
+    course_ids, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids, classroom_ids)
+    scheduler.solve(time_limit_seconds=60, strategy=strategy, backtracking=False)
+    return scheduler
+
+
+def test_cpsat_never_places_fewer_than_greedy(tight_university):
+    db, schedule_id = tight_university
+    greedy = solve_without_backtracking(db, schedule_id, 'greedy')
+    cpsat = solve_without_backtracking(db, schedule_id, 'cpsat')
+
+    assert len(greedy.course_assignments) < len(greedy.courses)
+    assert len(cpsat.course_assignments) >= len(greedy.course_assignments)
+    assert hard_constraint_violations(cpsat) == []
+
+
+def test_greedy_placement_is_kept_when_room_packing_loses_courses(tight_university, monkeypatch):
+    db, schedule_id = tight_university
+    greedy = solve_without_backtracking(db, schedule_id, 'greedy')
+
+    # Model tüm dersleri aynı slota koyar ve derslik bulunamayanlar başka slota alınamazsa
+    # CP-SAT yerleşimi açgözlünün gerisinde kalır; açgözlü yerleşim korunmalı
+    def packed_into_one_slot(scheduler, *args, **kwargs):
+        scheduler._assign_course_to_slot = lambda course: False
+        return {c['id']: 0 for c in scheduler.courses}, 'FEASIBLE'
+
+    monkeypatch.setattr('src.core.scheduler.solve_cpsat', packed_into_one_slot)
+    cpsat = solve_without_backtracking(db, schedule_id, 'cpsat')
+
+    assert cpsat.course_assignments == greedy.course_assignments
+    assert hard_constraint_violations(cpsat) == []
+
+
+@pytest.mark.parametrize('workers, expected', [(None, None), (3, 3)])
+def test_cpsat_uses_all_cores_unless_workers_are_given(tight_university, monkeypatch, workers, expected):
+    db, schedule_id = tight_university
+    calls = []
+
+    def recording_solve_cpsat(scheduler, time_limit_seconds=None, workers=None, hint=None):
+        calls.append(workers)
+        return cpsat_backend.solve_cpsat(scheduler, time_limit_seconds, workers, hint)
+
+    monkeypatch.setattr('src.core.scheduler.solve_cpsat', recording_solve_cpsat)
+    course_ids, classroom_ids = all_ids(db)
+    schedule_exams(db, schedule_id, course_ids, classroom_ids, time_limit_seconds=30, strategy='cpsat',
+                   workers=workers)
+
+    # None, OR-Tools'ta num_workers = 0 (tüm çekirdekler) demektir
+    assert calls == [expected]
@@ -0,0 +1,57 @@
+import pytest
+
+from src.core.scheduler import ExamScheduler
+from tests.conftest import all_ids, hard_constraint_violations, make_university
+
+# Yoğun örnekler: az derslik ve min gün kuralı, açgözlü sıralama bazı dersleri yerleştiremez
+DENSE_INSTANCES = {
+    'min_gun_2': dict(min_days_between=2, students=800, departments=2, courses_per_level=6, levels=4,
+                      classrooms=3, seed=9),
+    'min_gun_1': dict(min_days_between=1, students=500, departments=2, courses_per_level=6, levels=6,
+                      classrooms=3, seed=16),
+}
+
+
+def solve_without_backtracking(db, schedule_id, strategy: str) -> ExamScheduler:
+    course_ids, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids, classroom_ids)
+    scheduler.solve(time_limit_seconds=60, strategy=strategy, backtracking=False)
+    return scheduler
+
+
+@pytest.mark.parametrize('name', DENSE_INSTANCES)
+def test_dsatur_places_at_least_as_many_as_greedy(tmp_path, name):
+    db, schedule_id = make_university(tmp_path / "dense.db", **DENSE_INSTANCES[name])
+    greedy = solve_without_backtracking(db, schedule_id, 'greedy')
+    dsatur = solve_without_backtracking(db, schedule_id, 'dsatur')
+
+    assert 0 < len(greedy.course_assignments) < len(greedy.courses)
+    assert len(dsatur.course_assignments) >= len(greedy.course_assignments)
+    assert hard_constraint_violations(dsatur) == []
+
+
+def test_each_pick_has_the_most_distinct_colored_days(tmp_path):
+    # Seçim sırası yeniden oynatılır: her adımda seçilen dersin, yerleşmiş komşularının ve seviye
+    # arkadaşlarının kullandığı farklı gün sayısı kalan dersler arasında en büyük olmalı
+    db, schedule_id = make_university(tmp_path / "dense.db", **DENSE_INSTANCES['min_gun_1'])
+    scheduler = solve_without_backtracking(db, schedule_id, 'dsatur')
+    assignments = scheduler.course_assignments
+
+    def colored_days(course_id, placed):
+        class_level = scheduler.course_class_levels.get(course_id)
+        return {
+            scheduler.slot_to_date[assignments[other_id]['slot_idx']]
+            for other_id in placed
+            if other_id in assignments and (
+                other_id in scheduler.conflict_graph.neighbors(course_id)
+                or (class_level and scheduler.course_class_levels.get(other_id) == class_level)
+            )
+        }
+
+    order = [course['id'] for course in scheduler.placement_order]
+    assert sorted(order) == sorted(c['id'] for c in scheduler.courses)
+    for step, course_id in enumerate(order):
+        placed = order[:step]
+        remaining = order[step:]
+        assert len(colored_days(course_id, placed)) == max(len(colored_days(other_id, placed)) for other_id in remaining)
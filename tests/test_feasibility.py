@@ -0,0 +1,61 @@
+from src.core.feasibility import check_feasibility, max_spaced_days
+from src.core.scheduler import ExamScheduler
+from tests.conftest import all_ids, hard_constraint_violations, make_university
+
+
+def prepared(db, schedule_id, classroom_ids=None, **prepare_options) -> ExamScheduler:
+    course_ids, all_classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids, classroom_ids or all_classroom_ids, **prepare_options)
+    return scheduler
+
+
+def test_max_spaced_days():
+    assert max_spaced_days([1, 2, 3, 4, 5], 1) == 5
+    assert max_spaced_days([1, 2, 3, 4, 5], 2) == 3
+    assert max_spaced_days([1, 2, 8, 9], 3) == 2
+    assert max_spaced_days([], 2) == 0
+
+
+def test_solvable_instance_has_no_reasons(scheduler):
+    assert check_feasibility(scheduler) == []
+
+
+def test_more_level_exams_than_days_is_reported_and_solved_partially(tmp_path):
+    # 2 bölüm × 8 ders: her seviyenin 16 sınavı, 12 sınav günü var; seviye başına en çok 12 ders yerleşir
+    db, schedule_id = make_university(tmp_path / "test.db", courses_per_level=8)
+    scheduler = prepared(db, schedule_id)
+
+    assert not scheduler.solve(time_limit_seconds=30)
+    assert any('sınav günü var' in reason for reason in scheduler.infeasibility_reasons)
+    assert len(scheduler.course_assignments) == 4 * 12
+    assert hard_constraint_violations(scheduler) == []
+    assert scheduler.get_statistics()['olanaksizlik_nedenleri'] == scheduler.infeasibility_reasons
+
+
+def test_course_larger_than_selected_rooms_is_rejected(university):
+    db, schedule_id = university
+    smallest = db.fetch_one("SELECT id FROM classrooms ORDER BY capacity LIMIT 1")['id']
+    scheduler = prepared(db, schedule_id, classroom_ids=[smallest])
+
+    assert any('toplam kapasitesi' in reason for reason in check_feasibility(scheduler))
+
+
+def test_exam_longer_than_a_day_is_rejected(university):
+    db, schedule_id = university
+    course_ids, _ = all_ids(db)
+    scheduler = prepared(db, schedule_id, course_durations={course_ids[0]: 24 * 60})
+
+    assert any('sığmıyor' in reason for reason in check_feasibility(scheduler))
+
+
+def test_clique_beyond_spaced_days_is_rejected(tmp_path):
+    # Her öğrenci 5 zorunlu dersin hepsini alır (5'lik klik): 2 gün arayla 7 gün seçilebilir,
+    # 7 gün arayla pencerede sadece 3 gün kalır
+    options = {'departments': 1, 'courses_per_level': 5, 'elective_ratio': 0.0, 'enrollment_density': 1.0,
+               'retake_rate': 0.0, 'levels': 1}
+    db, schedule_id = make_university(tmp_path / "spaced.db", 2, **options)
+    assert check_feasibility(prepared(db, schedule_id)) == []
+
+    db, schedule_id = make_university(tmp_path / "wide.db", 7, **options)
+    assert any('gün arayla' in reason for reason in check_feasibility(prepared(db, schedule_id)))
@@ -0,0 +1,29 @@
+import json
+
+from src.core.instrumentation import REJECTION_REASONS
+
+
+def test_phases_and_rejections_are_recorded(scheduler, tmp_path):
+    assert scheduler.solve(strategy='greedy')
+    instrumentation = scheduler.get_statistics()['enstrumantasyon']
+
+    assert {'on_kontrol', 'cozum', 'siralama'} <= set(instrumentation['fazlar'])
+    assert set(instrumentation['red_nedenleri']) == set(REJECTION_REASONS)
+    assert sum(instrumentation['red_nedenleri'].values()) > 0
+
+    trace = json.loads(scheduler.write_trace(tmp_path / "trace.json").read_text(encoding='utf-8'))
+    assert trace['red_nedenleri'] == instrumentation['red_nedenleri']
+    assert trace['ozet']['yerlestirildi'] == len(scheduler.courses)
+
+
+def test_annealing_probes_are_not_placement_rejections(scheduler):
+    assert scheduler.solve(strategy='greedy')
+    before = dict(scheduler.instrumentation.rejections)
+
+    scheduler._improve_with_annealing(seed=1, max_moves=2000)
+
+    assert dict(scheduler.instrumentation.rejections) == before
+    assert sum(scheduler.instrumentation.probe_rejections.values()) > 0
+    assert scheduler.instrumentation.to_dict()['tavlama_red_nedenleri'] == {
+        reason: scheduler.instrumentation.probe_rejections.get(reason, 0) for reason in REJECTION_REASONS
+    }
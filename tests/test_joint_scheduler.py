@@ -0,0 +1,110 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import combinations
+
+import pytest
+
+from src.core.cpsat_backend import HAS_ORTOOLS
+from src.core.joint_scheduler import JointScheduler, schedule_departments
+from src.core.scheduler import schedule_exams
+from tests.conftest import all_ids, copy_schedule, hard_constraint_violations, make_university
+
+
+def largest_classroom(db) -> int:
+    return db.fetch_one("SELECT id FROM classrooms ORDER BY capacity DESC LIMIT 1")['id']
+
+
+def cross_schedule_violations(db):
+    # Kayıtlı farklı programların sınavları: aynı derslik ya da ortak öğrenci (ara dahil) aynı anda olamaz,
+    # ortak öğrencinin sınav günleri min gün kuralına uyar
+    exams = db.fetch_all("""
+        SELECT e.id, e.schedule_id, e.course_id, e.exam_date, e.start_time, e.duration,
+               s.default_break_duration, s.min_days_between_exams
+        FROM exams e JOIN exam_schedules s ON s.id = e.schedule_id
+    """)
+    rooms = defaultdict(set)
+    for row in db.fetch_all("SELECT exam_id, classroom_id FROM exam_sessions"):
+        rooms[row['exam_id']].add(row['classroom_id'])
+    students = defaultdict(set)
+    for row in db.fetch_all("SELECT student_id, course_id FROM student_courses"):
+        students[row['course_id']].add(row['student_id'])
+
+    def interval(exam):
+        start = datetime.fromisoformat(f"{exam['exam_date']}T{exam['start_time']}")
+        return start, start + timedelta(minutes=exam['duration'] + exam['default_break_duration'])
+
+    violations = []
+    for a, b in combinations(exams, 2):
+        if a['schedule_id'] == b['schedule_id']:
+            continue
+        (start_a, end_a), (start_b, end_b) = interval(a), interval(b)
+        shared = students[a['course_id']] & students[b['course_id']]
+        if shared and abs((start_a.date() - start_b.date()).days) < a['min_days_between_exams']:
+            violations.append(('min_gun', a['course_id'], b['course_id']))
+        if start_a < end_b and start_b < end_a:
+            if rooms[a['id']] & rooms[b['id']]:
+                violations.append(('derslik', a['course_id'], b['course_id']))
+            if shared:
+                violations.append(('ogrenci', a['course_id'], b['course_id']))
+    return violations
+
+
+def test_schedules_compete_for_one_room(university):
+    # İki bölümün programı aynı günlerde tek dersliği paylaşır
+    db, first_id = university
+    second_id = copy_schedule(db, first_id)
+    courses = db.fetch_all("SELECT id, department_id FROM courses ORDER BY id")
+    schedule_courses = {
+        first_id: [c['id'] for c in courses if c['department_id'] == 1],
+        second_id: [c['id'] for c in courses if c['department_id'] == 2],
+    }
+
+    success, stats = schedule_departments(db, schedule_courses, [largest_classroom(db)], time_limit_seconds=60)
+
+    assert success
+    assert stats['yerlestirildi'] == len(courses)
+    assert db.fetch_one("SELECT COUNT(*) AS n FROM exams")['n'] == len(courses)
+    assert cross_schedule_violations(db) == []
+
+
+@pytest.mark.parametrize('strategy, min_days_between', [
+    ('greedy', 0),
+    ('greedy', 1),
+    pytest.param('cpsat', 0, marks=pytest.mark.skipif(not HAS_ORTOOLS, reason="OR-Tools kurulu değil")),
+    pytest.param('cpsat', 1, marks=pytest.mark.skipif(not HAS_ORTOOLS, reason="OR-Tools kurulu değil")),
+])
+def test_shared_students_are_not_double_booked(tmp_path, strategy, min_days_between):
+    # Dersler iki programa dönüşümlü dağıtılır: programlar öğrencilerin çoğunu paylaşır
+    db, first_id = make_university(tmp_path / "test.db", min_days_between)
+    second_id = copy_schedule(db, first_id)
+    course_ids, classroom_ids = all_ids(db)
+    joint = JointScheduler(db, {first_id: course_ids[::2], second_id: course_ids[1::2]}, classroom_ids)
+    joint.prepare_data()
+
+    assert joint.solve(time_limit_seconds=60, strategy=strategy)
+    later = joint.schedulers[joint.solve_order[1]]
+    assert later.reserved_start_masks
+    for course_id, assignment in later.course_assignments.items():
+        assert not (later.reserved_start_masks.get(course_id, 0) >> assignment['slot_idx']) & 1
+    for scheduler in joint.schedulers.values():
+        assert hard_constraint_violations(scheduler) == []
+    joint.save_solution()
+    assert cross_schedule_violations(db) == []
+
+
+def test_shared_rooms_and_students_respect_saved_schedule(university):
+    # Kaydedilmiş program, aynı dersleri tek derslikte çözen yeni programa engel olur
+    db, first_id = university
+    course_ids, _ = all_ids(db)
+    classroom_id = largest_classroom(db)
+    first_courses, second_courses = course_ids[::2], course_ids[1::2]
+    assert schedule_exams(db, first_id, first_courses, [classroom_id], time_limit_seconds=60)[0]
+
+    second_id = copy_schedule(db, first_id)
+    success, stats = schedule_exams(db, second_id, second_courses, [classroom_id],
+                                    time_limit_seconds=60, share_rooms=True)
+
+    assert success
+    assert stats['rezerve_derslik_gunu'] > 0
+    assert stats['rezerve_ogrenci_dersi'] > 0
+    assert cross_schedule_violations(db) == []
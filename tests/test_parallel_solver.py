@@ -0,0 +1,51 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from src.core.parallel_solver import run_components, run_multi_start
+
+
+def test_multi_start_keeps_the_best_scoring_start(scheduler):
+    best, results = run_multi_start(scheduler, workers=2, starts=4, time_limit_seconds=60, strategy='greedy')
+
+    assert sorted(r['seed'] or 0 for r in results) == [0, 1, 2, 3]
+    assert best['score'] == max(r['score'] for r in results)
+    assert len(best['assignments']) == len(scheduler.courses)
+
+
+def test_solve_multi_start_restores_the_best_result(scheduler, monkeypatch):
+    recorded = {}
+
+    def recording_run_multi_start(*args, **kwargs):
+        recorded['best'], results = run_multi_start(*args, **kwargs)
+        return recorded['best'], results
+
+    monkeypatch.setattr('src.core.scheduler.run_multi_start', recording_run_multi_start)
+    assert scheduler.solve_multi_start(workers=2, starts=3, time_limit_seconds=60)
+
+    assert scheduler.multi_start_stats['baslangic_sayisi'] == 3
+    assert scheduler.multi_start_stats['en_iyi_tohum'] == recorded['best']['seed']
+    assert scheduler.result_score() == recorded['best']['score']
+
+
+@pytest.mark.parametrize('runner', ['multi_start', 'components'])
+def test_cancel_stops_running_workers(scheduler, runner):
+    # Tavlama hamle sınırı süreyi aşacak kadar büyük: işçiler ancak iptal olayıyla durur
+    options = {'time_limit_seconds': 600, 'strategy': 'greedy', 'anneal': True, 'anneal_moves': 10 ** 9}
+    timer = threading.Timer(1.0, scheduler.cancel_event.set)
+    timer.start()
+    started = time.monotonic()
+    try:
+        if runner == 'multi_start':
+            best, results = run_multi_start(scheduler, workers=2, starts=2, **options)
+            assert best is not None and best['score'] == max(r['score'] for r in results)
+        else:
+            results = run_components(scheduler, scheduler.parallel_groups(), workers=2, **options)
+        assert results
+    finally:
+        timer.cancel()
+
+    assert time.monotonic() - started < 30
+    assert multiprocessing.active_children() == []
@@ -0,0 +1,42 @@
+from collections import Counter, defaultdict
+
+from src.core.scheduler import ExamScheduler
+from tests.conftest import all_ids
+
+
+def scanned_enrollments(db, course_ids):
+    # Eski yöntem: tüm kayıt tablosu okunup Python'da süzülür
+    selected = set(course_ids)
+    student_courses = defaultdict(set)
+    for row in db.fetch_all("SELECT * FROM student_courses"):
+        if row['course_id'] in selected:
+            student_courses[row['student_id']].add(row['course_id'])
+    return student_courses
+
+
+def test_selected_courses_are_filtered_and_counted_in_sql(university):
+    db, schedule_id = university
+    course_ids, classroom_ids = all_ids(db)
+    # Aynı veritabanında farklı ders seçimleriyle art arda hazırlık: geçici tablo her seferinde yenilenir
+    for selected in (course_ids[::3], course_ids[1::2]):
+        scheduler = ExamScheduler(db, schedule_id)
+        scheduler.prepare_data(selected, classroom_ids)
+
+        expected = scanned_enrollments(db, selected)
+        assert {student_id: set(courses) for student_id, courses in scheduler.student_courses.items()} == expected
+        counts = Counter(course_id for courses in expected.values() for course_id in courses)
+        assert scheduler.course_student_counts == {course_id: counts[course_id] for course_id in selected}
+
+
+def test_course_without_enrollments_counts_zero(university):
+    db, schedule_id = university
+    course_ids, classroom_ids = all_ids(db)
+    empty_id = db.execute(
+        "INSERT INTO courses (code, name, department_id, class_level) VALUES ('BOS101', 'Boş Ders', 1, '1')"
+    )
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids[:4] + [empty_id], classroom_ids)
+
+    assert scheduler.course_student_counts[empty_id] == 0
+    assert scheduler.course_students[empty_id] == frozenset()
+    assert scheduler.solve(strategy='greedy')
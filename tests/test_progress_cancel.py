@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+
+from src.core.scheduler import schedule_exams
+from tests.conftest import all_ids, make_university
+
+PROGRESS_KEYS = {'sure', 'yerlestirildi', 'toplam_ders', 'kullanilan_derslik_atamasi', 'en_iyi_yerlestirildi'}
+
+
+@pytest.fixture
+def unsolvable(tmp_path):
+    # Seviye başına 16 sınav, 12 sınav günü: anytime arama iptal edilene kadar sürer
+    return make_university(tmp_path / "test.db", courses_per_level=8)
+
+
+def saved_exam_count(db) -> int:
+    return db.fetch_one("SELECT COUNT(*) AS n FROM exams")['n']
+
+
+def test_progress_reports_placed_courses(university):
+    db, schedule_id = university
+    course_ids, classroom_ids = all_ids(db)
+    reports = []
+
+    success, stats = schedule_exams(db, schedule_id, course_ids, classroom_ids, time_limit_seconds=60,
+                                    progress_callback=reports.append)
+
+    assert success
+    assert reports and all(set(report) == PROGRESS_KEYS for report in reports)
+    assert reports[-1]['yerlestirildi'] == reports[-1]['toplam_ders'] == len(course_ids)
+    assert [r['sure'] for r in reports] == sorted(r['sure'] for r in reports)
+
+
+def test_cancel_from_progress_stops_and_keeps_the_best_partial(unsolvable):
+    db, schedule_id = unsolvable
+    course_ids, classroom_ids = all_ids(db)
+    cancel_event = threading.Event()
+    cancelled_at = []
+
+    def cancel_after_first_improvement(report):
+        # Arayüzdeki İptal düğmesi: ilk iyileştirmeden sonra basılır
+        if report['yerlestirildi'] and not cancelled_at:
+            cancelled_at.append(time.monotonic())
+            cancel_event.set()
+
+    success, stats = schedule_exams(db, schedule_id, course_ids, classroom_ids, time_limit_seconds=60,
+                                    anytime=True, cancel_event=cancel_event,
+                                    progress_callback=cancel_after_first_improvement)
+
+    # İptal 100 ms içinde sonuç döndürmeli
+    assert time.monotonic() - cancelled_at[0] < 0.1
+    assert not success
+    assert stats['iptal_edildi']
+    assert stats['yerlestirildi'] == max(i['yerlestirildi'] for i in stats['iyilestirmeler']) > 0
+    # Motor yalnızca tam çözümü kaydeder
+    assert saved_exam_count(db) == 0
+
+
+def test_worker_cancel_reaches_the_engine(unsolvable):
+    exam_wizard = pytest.importorskip('src.ui.exam_wizard')
+    db, schedule_id = unsolvable
+    course_ids, classroom_ids = all_ids(db)
+
+    class EngineWizard:
+        # Sihirbazın motor yolu, test veritabanıyla
+        def engine_scheduling(self, exam_schedule_id, course_ids, classroom_ids, course_durations=None,
+                              progress_callback=None, cancel_event=None):
+            success, stats = schedule_exams(db, exam_schedule_id, course_ids, classroom_ids,
+                                            time_limit_seconds=60, anytime=True, cancel_event=cancel_event,
+                                            course_durations=course_durations,
+                                            progress_callback=progress_callback)
+            return stats['yerlestirildi'] if success else 0
+
+    worker = exam_wizard.SchedulingWorker(EngineWizard(), schedule_id,
+                                          {'course_ids': course_ids, 'classroom_ids': classroom_ids})
+    reports, completed, errors = [], [], []
+    worker.progress.connect(lambda report: (reports.append(report), worker.cancel()))
+    worker.completed.connect(completed.append)
+    worker.error.connect(errors.append)
+
+    started = time.monotonic()
+    worker.run()
+
+    assert time.monotonic() - started < 5
+    assert reports and worker.cancel_event.is_set()
+    assert completed == [0] and errors == []
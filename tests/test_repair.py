@@ -0,0 +1,101 @@
+import sqlite3
+
+import pytest
+
+from src.core.scheduler import ExamScheduler
+from tests.conftest import all_ids, hard_constraint_violations
+
+
+def saved_state(db):
+    rows = db.fetch_all("""
+        SELECT e.course_id, e.exam_date, e.start_time, e.student_count, s.classroom_id, s.allocated_seats
+        FROM exams e LEFT JOIN exam_sessions s ON s.exam_id = e.id
+        ORDER BY e.course_id, s.classroom_id
+    """)
+    return [tuple(row) for row in rows]
+
+
+@pytest.fixture
+def saved(scheduler):
+    assert scheduler.solve(strategy='dsatur')
+    scheduler.save_solution()
+    return scheduler
+
+
+def add_shared_students(db, course_a: int, course_b: int, count: int = 5):
+    # course_a öğrencilerinin bir kısmı course_b'ye de kaydolur: iki ders arasında yeni çakışma
+    students = db.fetch_all(
+        "SELECT student_id FROM student_courses WHERE course_id = ? AND student_id NOT IN "
+        "(SELECT student_id FROM student_courses WHERE course_id = ?) LIMIT ?",
+        (course_a, course_b, count)
+    )
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO student_courses (student_id, course_id) VALUES (?, ?)",
+            [(row['student_id'], course_b) for row in students]
+        )
+        conn.commit()
+
+
+def repaired(db, schedule_id, changed) -> ExamScheduler:
+    _, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    assert scheduler.repair(schedule_id, changed, classroom_ids)
+    return scheduler
+
+
+def test_repair_without_changes_writes_nothing(saved):
+    db = saved.db
+    before = saved_state(db)
+    scheduler = repaired(db, saved.exam_schedule['id'], [])
+
+    assert scheduler.repair_stats['degisen_satir'] == 0
+    assert saved_state(db) == before
+
+
+def test_repair_resolves_new_conflict_and_keeps_others(saved):
+    db = saved.db
+    assignments = saved.course_assignments
+    # Aynı gün, farklı seviyeden iki ders: ortak öğrenci eklenince artık çakışırlar
+    course_a, course_b = next(
+        (a, b) for a in assignments for b in assignments
+        if a < b and assignments[a]['datetime'] == assignments[b]['datetime']
+        and saved.course_class_levels[a] != saved.course_class_levels[b]
+    )
+    add_shared_students(db, course_a, course_b)
+
+    scheduler = repaired(db, saved.exam_schedule['id'], [course_b])
+    assert hard_constraint_violations(scheduler) == []
+    assert scheduler.repair_stats['tasinan'] >= 1
+
+    # Değişmeyen derslerin yeri korunur; veritabanı bellekteki atamalarla aynıdır
+    for course_id, assignment in scheduler.course_assignments.items():
+        if course_id not in (course_a, course_b):
+            assert assignment['datetime'] == assignments[course_id]['datetime']
+
+    rows = {}
+    for course_id, exam_date, start_time, _, classroom_id, _ in saved_state(db):
+        exam = rows.setdefault(course_id, {'start': (exam_date, start_time), 'rooms': set()})
+        exam['rooms'].add(classroom_id)
+    for course_id, assignment in scheduler.course_assignments.items():
+        start = assignment['datetime']
+        assert rows[course_id]['start'] == (start.date().isoformat(), start.time().isoformat())
+        assert rows[course_id]['rooms'] == set(assignment['classroom_ids'])
+
+
+def test_repair_diff_rolls_back_on_error(saved):
+    db = saved.db
+    new_course = max(saved.course_assignments, key=lambda c: saved.course_student_counts[c])
+    # Sınavı silinen ders programa yeni eklenmiş gibi yeniden yerleştirilir: önce exams, sonra oturum satırları yazılır
+    db.execute("DELETE FROM exams WHERE course_id = ?", (new_course,))
+    db.execute("""
+        CREATE TRIGGER fail_session_insert BEFORE INSERT ON exam_sessions
+        BEGIN SELECT RAISE(ABORT, 'yazma hatası'); END
+    """)
+    before = saved_state(db)
+
+    _, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, saved.exam_schedule['id'])
+    with pytest.raises(sqlite3.DatabaseError):
+        scheduler.repair(saved.exam_schedule['id'], [new_course], classroom_ids)
+    assert saved_state(db) == before
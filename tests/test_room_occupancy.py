@@ -0,0 +1,141 @@
+import random
+from datetime import date
+
+import pytest
+
+from src.core.room_occupancy import RoomCalendar, blocked_start_ranges, earliest_free_start, first_blocked_step
+
+DAY_START, DAY_END = 9 * 60, 21 * 60
+DAY = date(2026, 1, 5)
+
+
+def random_busy_ranges(rng: random.Random):
+    ranges = set()
+    for _ in range(rng.randint(0, 8)):
+        start = rng.randrange(DAY_START - 60, DAY_END)
+        ranges.add((start, start + rng.randint(20, 180)))
+    return ranges
+
+
+def conflicts(busy_ranges, minute: int, duration: int, wait_duration: int) -> bool:
+    # Eski dakika taraması: sınav, bir meşgul aralığın bekleme süresi bitmeden başlar ve o aralık başlamadan biter
+    return any(minute < end + wait_duration and minute + duration > start for start, end in busy_ranges)
+
+
+def first_free_start_by_scan(busy_ranges, duration: int, wait_duration: int):
+    # Eski arama: 09:00'dan, çakışmada çakışan sınavların en geç bekleme sonuna atlanır
+    minute = DAY_START
+    while minute < DAY_END and minute + duration <= DAY_END:
+        ends = [end + wait_duration for start, end in busy_ranges
+                if minute < end + wait_duration and minute + duration > start]
+        if not ends:
+            return minute
+        minute = max(ends)
+    return None
+
+
+def first_free_start_by_index(busy_ranges, duration: int, wait_duration: int):
+    lows, highs = blocked_start_ranges(busy_ranges, duration, wait_duration)
+    minute = DAY_START
+    while minute < DAY_END and minute + duration <= DAY_END:
+        free_minute = earliest_free_start(lows, highs, minute)
+        if free_minute == minute:
+            return minute
+        minute = free_minute
+    return None
+
+
+LENGTHS = [(30, 0), (75, 15), (120, 30)]
+SEEDS = range(40)
+
+
+@pytest.mark.parametrize('duration, wait_duration', LENGTHS)
+def test_blocked_ranges_match_the_minute_scan(duration, wait_duration):
+    for seed in SEEDS:
+        busy_ranges = random_busy_ranges(random.Random(seed))
+        lows, highs = blocked_start_ranges(busy_ranges, duration, wait_duration)
+        minutes = range(DAY_START - 60, DAY_END + 60)
+        # Kapalı aralıklar günün dışına taşabilir: tarama en uzun aralığı kapsayacak kadar geniş
+        blocked = {m for m in range(DAY_START - 300, DAY_END + 300)
+                   if conflicts(busy_ranges, m, duration, wait_duration)}
+
+        assert lows == sorted(lows) and highs == sorted(highs)
+        for minute in minutes:
+            free_minute = earliest_free_start(lows, highs, minute)
+            # Kapalı dakikada aralığın sonu, taramayla bulunan ilk serbest dakikadır
+            expected = minute
+            while expected in blocked:
+                expected += 1
+            assert free_minute == expected, (seed, minute)
+
+        assert first_free_start_by_index(busy_ranges, duration, wait_duration) == \
+            first_free_start_by_scan(busy_ranges, duration, wait_duration), seed
+
+
+@pytest.mark.parametrize('duration, wait_duration', LENGTHS)
+def test_first_blocked_step_matches_the_minute_scan(duration, wait_duration):
+    latest = DAY_END - duration
+    for seed in SEEDS:
+        busy_ranges = random_busy_ranges(random.Random(seed))
+        lows, highs = blocked_start_ranges(busy_ranges, duration, wait_duration)
+        blocked = {m for m in range(DAY_START, latest + 1) if conflicts(busy_ranges, m, duration, wait_duration)}
+
+        for minute in range(DAY_START, latest + 1, 5):
+            expected = next((m for m in range(minute + 15, latest + 1, 15) if m in blocked), None)
+            assert first_blocked_step(lows, highs, minute, 15, latest) == expected, (seed, minute)
+
+
+def test_touching_ranges_leave_the_boundary_free():
+    # 10:00-11:00 ve 12:15'te başlayan sınav: 60 dakikalık sınav 11:15'te (bekleme sonu) başlayabilir
+    lows, highs = blocked_start_ranges({(600, 660), (735, 800)}, 60, 15)
+
+    assert (lows, highs) == ([540, 675], [675, 815])
+    assert earliest_free_start(lows, highs, 600) == 675
+    assert earliest_free_start(lows, highs, 675) == 675
+
+
+def random_calendar(rng: random.Random):
+    # Dersliklere çakışmadan rezervasyon yapılır; aynı derslik aynı anda iki kez kullanılmaz
+    capacities = {room_id: rng.choice((30, 40, 60, 120)) for room_id in range(1, 9)}
+    calendar = RoomCalendar(capacities)
+    bookings = []
+    for _ in range(rng.randint(0, 25)):
+        start = rng.randrange(DAY_START, DAY_END - 30)
+        end = min(DAY_END, start + rng.randint(30, 240))
+        rooms = [room_id for room_id in rng.sample(sorted(capacities), rng.randint(1, 3))
+                 if all(not (start < e and s < end) or room_id not in r for s, e, r in bookings)]
+        if rooms:
+            calendar.book(DAY, start, end, rooms)
+            bookings.append((start, end, set(rooms)))
+    return calendar, capacities, bookings
+
+
+def busy_by_scan(bookings, start: int, end: int):
+    # Eski yöntem: her dersliğin rezervasyon listesi taranır
+    return {room_id for s, e, rooms in bookings if start < e and s < end for room_id in rooms}
+
+
+def test_room_calendar_matches_a_scan_of_bookings():
+    for seed in range(40):
+        rng = random.Random(seed)
+        calendar, capacities, bookings = random_calendar(rng)
+        total = sum(capacities.values())
+        for _ in range(50):
+            start = rng.randrange(DAY_START, DAY_END - 30)
+            duration = rng.choice((30, 75, 120))
+            end = start + duration
+            busy = busy_by_scan(bookings, start, end)
+            assert calendar.busy_classrooms(DAY, start, end) == busy
+            assert calendar.free_capacity(DAY, start, end) == total - sum(capacities[r] for r in busy)
+            assert calendar.earliest_end_covering(DAY, start) == \
+                min((e for s, e, _ in bookings if s <= start < e), default=None)
+
+            # Kapasitenin yettiği ilk adım: 15 dakikalık adımlarla taramanın bulduğu başlangıç
+            seats = rng.choice((30, 100, 200, total))
+            latest = DAY_END - duration
+            expected = next((m for m in range(start + 15, latest + 1, 15)
+                             if total - sum(capacities[r] for r in busy_by_scan(bookings, m, m + duration)) >= seats),
+                            None)
+            assert calendar.next_free_start(DAY, start, duration, seats, 15, latest) == expected, (seed, start)
+
+    assert RoomCalendar({1: 50}).free_capacity(DAY, DAY_START, DAY_END) == 50
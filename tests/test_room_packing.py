@@ -0,0 +1,46 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from src.core.room_packing import pack_rooms
+
+
+def brute_force(rooms, student_count):
+    # En az derslik, eşitlikte en az toplam kapasite
+    for count in range(1, len(rooms) + 1):
+        totals = [sum(r['capacity'] for r in subset) for subset in combinations(rooms, count)]
+        fitting = [total for total in totals if total >= student_count]
+        if fitting:
+            return count, min(fitting)
+    return None
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_packing_matches_brute_force(seed):
+    rng = random.Random(seed)
+    rooms = [{'id': i, 'capacity': rng.choice([20, 30, 40, 60, 90, 100, 120])} for i in range(rng.randint(1, 9))]
+    student_count = rng.randint(1, sum(r['capacity'] for r in rooms) + 20)
+
+    selected = pack_rooms(rooms, student_count)
+    expected = brute_force(rooms, student_count)
+    if expected is None:
+        assert selected == []
+    else:
+        assert (len(selected), sum(r['capacity'] for r in selected)) == expected
+        assert len({r['id'] for r in selected}) == len(selected)
+
+
+def test_packing_prefers_fewest_rooms_then_least_waste():
+    rooms = [{'id': 1, 'capacity': 30}, {'id': 2, 'capacity': 40}, {'id': 3, 'capacity': 60},
+             {'id': 4, 'capacity': 100}]
+
+    assert [r['id'] for r in pack_rooms(rooms, 55)] == [3]
+    assert sorted(r['id'] for r in pack_rooms(rooms, 130)) == [1, 4]
+
+
+def test_packing_ignores_empty_rooms_and_rejects_overflow():
+    rooms = [{'id': 1, 'capacity': 0}, {'id': 2, 'capacity': 30}]
+
+    assert [r['id'] for r in pack_rooms(rooms, 0)] == [2]
+    assert pack_rooms(rooms, 31) == []
@@ -0,0 +1,67 @@
+import sqlite3
+
+import pytest
+
+from src.core.db_raw import Database
+
+
+def saved_exams(scheduler):
+    rows = scheduler.db.fetch_all("""
+        SELECT e.course_id, e.exam_date, e.start_time, e.student_count, s.classroom_id, s.allocated_seats
+        FROM exams e JOIN exam_sessions s ON s.exam_id = e.id
+        WHERE e.schedule_id = ?
+        ORDER BY e.course_id, s.classroom_id
+    """, (scheduler.exam_schedule['id'],))
+    return [tuple(row) for row in rows]
+
+
+def test_saving_twice_replaces_the_schedule_in_one_connection(scheduler, monkeypatch):
+    assert scheduler.solve(strategy='greedy')
+    scheduler.save_solution()
+    first = saved_exams(scheduler)
+
+    connections = []
+    get_connection = Database.get_connection
+
+    def counting_get_connection(self):
+        connections.append(self)
+        return get_connection(self)
+
+    monkeypatch.setattr(Database, 'get_connection', counting_get_connection)
+    scheduler.save_solution()
+
+    assert len(connections) == 1
+    assert saved_exams(scheduler) == first
+    schedule_id = scheduler.exam_schedule['id']
+    assert scheduler.db.fetch_one("SELECT COUNT(*) AS n FROM exams WHERE schedule_id = ?",
+                                  (schedule_id,))['n'] == len(scheduler.courses)
+    assert scheduler.db.fetch_one("SELECT is_finalized FROM exam_schedules WHERE id = ?",
+                                  (schedule_id,))['is_finalized'] == 1
+
+    capacities = {c['id']: c['capacity'] for c in scheduler.classrooms}
+    for course_id, _, _, student_count, classroom_id, allocated_seats in first:
+        assert student_count == scheduler.course_student_counts[course_id]
+        assert allocated_seats == min(student_count, capacities[classroom_id])
+
+
+def test_failed_save_leaves_the_previous_schedule(scheduler):
+    assert scheduler.solve(strategy='greedy')
+    scheduler.save_solution()
+    before = saved_exams(scheduler)
+
+    # Son derse veritabanında olmayan bir derslik eklenir: oturum eklemesi yabancı anahtarda düşer,
+    # önceki silme ve sınav eklemeleri geri alınmalı
+    scheduler.db.execute("UPDATE exam_schedules SET is_finalized = 0 WHERE id = ?", (scheduler.exam_schedule['id'],))
+    missing_room = {**scheduler.classrooms[0], 'id': 10 ** 6}
+    scheduler.classrooms.append(missing_room)
+    last_course = max(scheduler.course_assignments)
+    scheduler.course_assignments[last_course]['classroom_ids'].append(missing_room['id'])
+    for assignment in scheduler.course_assignments.values():
+        assignment['datetime'] = assignment['datetime'].replace(hour=20)
+
+    with pytest.raises(sqlite3.IntegrityError):
+        scheduler.save_solution()
+
+    assert saved_exams(scheduler) == before
+    assert scheduler.db.fetch_one("SELECT is_finalized FROM exam_schedules WHERE id = ?",
+                                  (scheduler.exam_schedule['id'],))['is_finalized'] == 0
@@ -0,0 +1,101 @@
+import pytest
+
+from src.core.cpsat_backend import HAS_ORTOOLS
+from src.core.scheduler import ExamScheduler
+from tests.conftest import all_ids, hard_constraint_violations, make_university
+
+
+def solved(db, schedule_id, **solve_options) -> ExamScheduler:
+    course_ids, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids, classroom_ids)
+    assert scheduler.solve(time_limit_seconds=60, **solve_options)
+    return scheduler
+
+
+STRATEGY_OPTIONS = [
+    pytest.param({'strategy': 'greedy'}, id='greedy'),
+    pytest.param({'strategy': 'dsatur'}, id='dsatur'),
+    pytest.param({'strategy': 'greedy', 'anytime': True, 'seed': 3}, id='anytime'),
+    pytest.param({'strategy': 'greedy', 'anneal': True, 'anneal_moves': 2000, 'seed': 1}, id='anneal'),
+    pytest.param({'strategy': 'cpsat'}, id='cpsat',
+                 marks=pytest.mark.skipif(not HAS_ORTOOLS, reason="OR-Tools kurulu değil")),
+]
+
+
+@pytest.mark.parametrize('min_days_between', [0, 1])
+@pytest.mark.parametrize('options', STRATEGY_OPTIONS)
+def test_strategy_respects_hard_constraints(tmp_path, options, min_days_between):
+    db, schedule_id = make_university(tmp_path / "test.db", min_days_between)
+    scheduler = solved(db, schedule_id, **options)
+    assert len(scheduler.course_assignments) == len(scheduler.courses)
+    assert hard_constraint_violations(scheduler) == []
+
+
+def test_backtracking_places_courses_greedy_could_not(tmp_path):
+    # Az derslik ve min gün kuralı: açgözlü sıralama bazı dersleri yerleştiremez, geri izleme tamamlar
+    db, schedule_id = make_university(tmp_path / "test.db", 1, students=600, departments=1,
+                                      courses_per_level=6, levels=6, classrooms=5, seed=11)
+    course_ids, classroom_ids = all_ids(db)
+
+    greedy = ExamScheduler(db, schedule_id)
+    greedy.prepare_data(course_ids, classroom_ids)
+    assert not greedy.solve(strategy='greedy', backtracking=False)
+    assert hard_constraint_violations(greedy) == []
+
+    searched = solved(db, schedule_id, strategy='greedy', backtracking=True)
+    assert len(searched.course_assignments) == len(course_ids)
+    assert hard_constraint_violations(searched) == []
+
+
+def test_multi_start_respects_hard_constraints(university):
+    db, schedule_id = university
+    course_ids, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids, classroom_ids)
+
+    assert scheduler.solve_multi_start(workers=2, starts=3, time_limit_seconds=60)
+    assert scheduler.multi_start_stats['baslangic_sayisi'] == 3
+    assert hard_constraint_violations(scheduler) == []
+
+
+@pytest.mark.parametrize('min_days_between', [0, 1])
+def test_decomposed_respects_hard_constraints(tmp_path, min_days_between):
+    # Bölümlerin ortak öğrencisi yok: iki bileşen aynı seviye günlerini ve derslik havuzunu paylaşır,
+    # çakışmalar uzlaştırmada giderilmeli
+    db, schedule_id = make_university(tmp_path / "test.db", min_days_between)
+    course_ids, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids, classroom_ids)
+
+    assert len(scheduler.parallel_groups()) > 1
+    assert scheduler.solve_decomposed(workers=2, time_limit_seconds=60)
+    assert scheduler.decomposition_stats['grup_sayisi'] > 1
+    assert scheduler.decomposition_stats['seviye_cakismasi'] > 0
+    assert hard_constraint_violations(scheduler) == []
+
+
+def test_saved_solution_matches_assignments(scheduler):
+    assert scheduler.solve(strategy='dsatur')
+    scheduler.save_solution()
+
+    rows = scheduler.db.fetch_all("""
+        SELECT e.course_id, e.exam_date, e.start_time, s.classroom_id
+        FROM exams e JOIN exam_sessions s ON s.exam_id = e.id
+        WHERE e.schedule_id = ?
+    """, (scheduler.exam_schedule['id'],))
+    saved = {}
+    for row in rows:
+        exam = saved.setdefault(row['course_id'], {'start': (row['exam_date'], row['start_time']), 'rooms': set()})
+        exam['rooms'].add(row['classroom_id'])
+
+    assert set(saved) == set(scheduler.course_assignments)
+    for course_id, assignment in scheduler.course_assignments.items():
+        start = assignment['datetime']
+        assert saved[course_id]['start'] == (start.date().isoformat(), start.time().isoformat())
+        assert saved[course_id]['rooms'] == set(assignment['classroom_ids'])
+
+
+def test_unknown_strategy_is_rejected(scheduler):
+    with pytest.raises(ValueError):
+        scheduler.solve(strategy='tabu')
@@ -0,0 +1,137 @@
+from datetime import timedelta
+
+import pytest
+
+from src.core.scheduler import ExamScheduler
+from tests.conftest import all_ids, make_university
+
+
+def partially_placed(db, schedule_id) -> ExamScheduler:
+    # Çözümden derslerin yarısı geri alınır: kalan yerleşim engel oluşturur
+    course_ids, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids, classroom_ids)
+    scheduler.solve(strategy='greedy', backtracking=False)
+    assert scheduler.course_assignments
+    for course_id in sorted(scheduler.course_assignments)[::2]:
+        scheduler._unplace_course(course_id)
+    return scheduler
+
+
+def scanned_neighbors(scheduler: ExamScheduler, course_id: int):
+    # Eski yöntem: ortak öğrencisi olan dersler tüm öğrenci → ders listesi taranarak bulunur
+    return {
+        other_id
+        for course_ids in scheduler.student_courses.values() if course_id in course_ids
+        for other_id in course_ids if other_id != course_id
+    }
+
+
+def scanned_slot_is_open(scheduler: ExamScheduler, course_id: int, slot_idx: int, neighbors) -> bool:
+    # Çakışma ve min gün, yerleşmiş komşuların dakika aralıklarıyla denetlenir
+    assignments = scheduler.course_assignments
+    start = scheduler.time_slots[slot_idx][0]
+    break_minutes = timedelta(minutes=scheduler.exam_schedule.get('default_break_duration') or 0)
+    min_days = scheduler.min_days_between
+
+    class_level = scheduler.course_class_levels.get(course_id)
+    for other_id, assignment in assignments.items():
+        if class_level and scheduler.course_class_levels.get(other_id) == class_level \
+                and assignment['datetime'].date() == start.date():
+            return False
+
+    end = start + timedelta(minutes=scheduler._course_duration_minutes(course_id))
+    for other_id in neighbors:
+        if other_id not in assignments:
+            continue
+        other_start = assignments[other_id]['datetime']
+        other_end = other_start + timedelta(minutes=scheduler._course_duration_minutes(other_id))
+        if start < other_end + break_minutes and other_start < end + break_minutes:
+            return False
+        if min_days and abs((start.date() - other_start.date()).days) < min_days:
+            return False
+    return True
+
+
+def compared_slots(scheduler: ExamScheduler):
+    # Yerleşmemiş her dersin gün içine sığan her başlangıcı, taramayla bulunan sonuçla birlikte
+    for course in scheduler.courses:
+        course_id = course['id']
+        if course_id in scheduler.course_assignments:
+            continue
+        neighbors = scanned_neighbors(scheduler, course_id)
+        start_mask = scheduler._course_start_mask(course_id)
+        for _, slot_idx in scheduler.time_slots:
+            if (start_mask >> slot_idx) & 1:
+                yield course_id, slot_idx, scanned_slot_is_open(scheduler, course_id, slot_idx, neighbors)
+
+
+def test_course_student_index_matches_enrollments(scheduler):
+    expected = {course['id']: set() for course in scheduler.courses}
+    for student_id, course_ids in scheduler.student_courses.items():
+        for course_id in course_ids:
+            expected[course_id].add(student_id)
+
+    assert scheduler.course_students == expected
+    assert all(len(students) == scheduler.course_student_counts[course_id]
+               for course_id, students in expected.items())
+
+
+@pytest.mark.parametrize('min_days_between', [0, 1])
+def test_slot_checks_match_a_scan_of_enrollments(tmp_path, min_days_between):
+    db, schedule_id = make_university(tmp_path / "test.db", min_days_between)
+    scheduler = partially_placed(db, schedule_id)
+
+    compared = open_slots = 0
+    with scheduler._untracked_slot_masks():
+        for course_id, slot_idx, expected in compared_slots(scheduler):
+            assert scheduler._slot_is_open(course_id, slot_idx) == expected, (course_id, slot_idx)
+            compared += 1
+            open_slots += expected
+
+    # Karşılaştırma boş değil: hem açık hem kapalı başlangıçlar denetlendi
+    assert 0 < open_slots < compared
+
+
+@pytest.mark.parametrize('min_days_between', [0, 1])
+def test_feasible_slot_masks_match_a_scan_of_enrollments(tmp_path, min_days_between):
+    # Maskeler yerleştirme ve geri almada artımlı güncellenir; sorgu anında hesaplanan maskeyle
+    # ve taramayla aynı olmalı
+    db, schedule_id = make_university(tmp_path / "test.db", min_days_between)
+    scheduler = partially_placed(db, schedule_id)
+    assert scheduler.track_slot_masks
+
+    tracked = {c['id']: scheduler.feasible_slot_mask(c['id']) for c in scheduler.courses}
+    for course_id, slot_idx, expected in compared_slots(scheduler):
+        assert bool((tracked[course_id] >> slot_idx) & 1) == expected, (course_id, slot_idx)
+        assert scheduler._slot_is_open(course_id, slot_idx) == expected
+
+    with scheduler._untracked_slot_masks():
+        assert {c['id']: scheduler.feasible_slot_mask(c['id']) for c in scheduler.courses} == tracked
+
+
+def test_incremental_masks_equal_a_rebuild(scheduler):
+    assert scheduler.solve(strategy='greedy')
+    for course_id in sorted(scheduler.course_assignments)[1::3]:
+        scheduler._unplace_course(course_id)
+    incremental = {course_id: mask for course_id, mask in scheduler.blocked_slot_masks.items() if mask}
+
+    scheduler._rebuild_slot_masks()
+
+    assert incremental == {course_id: mask for course_id, mask in scheduler.blocked_slot_masks.items() if mask}
+
+
+@pytest.mark.parametrize('min_days_between', [1, 2, 3])
+def test_min_days_windows_match_a_scan_of_exam_days(tmp_path, min_days_between):
+    # Pencere, hafta sonu boşlukları olan sıralı gün dizisinden ikili aramayla kesilir
+    db, schedule_id = make_university(tmp_path / "test.db", min_days_between)
+    scheduler = partially_placed(db, schedule_id)
+
+    exam_dates = sorted(scheduler.date_to_slots)
+    for slot_date in exam_dates:
+        window = [d for d in exam_dates if abs((d - slot_date).days) < min_days_between]
+        assert scheduler.window_dates[slot_date] == window
+        assert scheduler.day_window_masks[slot_date] == sum(scheduler.day_slot_masks[d] for d in window)
+
+    for course_id, slot_idx, expected in compared_slots(scheduler):
+        assert scheduler._slot_is_open(course_id, slot_idx) == expected, (course_id, slot_idx)
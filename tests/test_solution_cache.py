@@ -0,0 +1,108 @@
+from src.core.scheduler import ExamScheduler, schedule_exams
+from src.core.solution_cache import SolutionCache, enrollment_digest
+from tests.conftest import all_ids, copy_schedule, hard_constraint_violations
+
+
+def saved_exams(db):
+    return db.fetch_all("SELECT course_id, exam_date, start_time FROM exams ORDER BY course_id")
+
+
+def test_identical_inputs_hit_the_cache(university):
+    db, schedule_id = university
+    course_ids, classroom_ids = all_ids(db)
+
+    success, stats = schedule_exams(db, schedule_id, course_ids, classroom_ids, use_cache=True)
+    assert success and not stats['onbellek_isabeti']
+    first = [tuple(row) for row in saved_exams(db)]
+
+    success, stats = schedule_exams(db, schedule_id, course_ids, classroom_ids, use_cache=True)
+    assert success and stats['onbellek_isabeti']
+    assert [tuple(row) for row in saved_exams(db)] == first
+    assert SolutionCache(db).entry_count() == 1
+
+
+def test_saved_neighbour_schedule_changes_the_shared_room_key(university):
+    # Sihirbaz işçisinin modu: önbellek açık, derslikler ve öğrenciler kayıtlı diğer programlarla paylaşılır
+    db, schedule_id = university
+    course_ids, classroom_ids = all_ids(db)
+    options = {'use_cache': True, 'share_rooms': True}
+
+    assert not schedule_exams(db, schedule_id, course_ids, classroom_ids, **options)[1]['onbellek_isabeti']
+    assert schedule_exams(db, schedule_id, course_ids, classroom_ids, **options)[1]['onbellek_isabeti']
+
+    other_id = copy_schedule(db, schedule_id)
+    assert schedule_exams(db, other_id, course_ids[:5], classroom_ids)[0]
+    success, stats = schedule_exams(db, schedule_id, course_ids, classroom_ids, **options)
+    assert success and not stats['onbellek_isabeti']
+    assert stats['rezerve_derslik_gunu'] > 0 and stats['rezerve_ogrenci_dersi'] > 0
+
+
+def test_cache_is_off_by_default(university):
+    db, schedule_id = university
+    course_ids, classroom_ids = all_ids(db)
+
+    schedule_exams(db, schedule_id, course_ids, classroom_ids)
+    assert SolutionCache(db).entry_count() == 0
+
+
+def test_solve_options_are_part_of_the_key(university):
+    db, schedule_id = university
+    course_ids, classroom_ids = all_ids(db)
+
+    schedule_exams(db, schedule_id, course_ids, classroom_ids, use_cache=True)
+    success, stats = schedule_exams(db, schedule_id, course_ids, classroom_ids, use_cache=True, strategy='dsatur')
+    assert success and not stats['onbellek_isabeti']
+    assert SolutionCache(db).entry_count() == 2
+
+
+def test_enrollment_change_invalidates_entry(university):
+    db, schedule_id = university
+    course_ids, classroom_ids = all_ids(db)
+    schedule_exams(db, schedule_id, course_ids, classroom_ids, use_cache=True)
+    assert SolutionCache(db).entry_count() == 1
+
+    # Tetikleyici, kaydı değişen dersi içeren girdileri siler
+    db.execute(
+        "DELETE FROM student_courses WHERE course_id = ? AND student_id = "
+        "(SELECT MIN(student_id) FROM student_courses WHERE course_id = ?)",
+        (course_ids[0], course_ids[0])
+    )
+    assert SolutionCache(db).entry_count() == 0
+
+    success, stats = schedule_exams(db, schedule_id, course_ids, classroom_ids, use_cache=True)
+    assert success and not stats['onbellek_isabeti']
+
+
+def test_restored_solution_satisfies_hard_constraints(scheduler):
+    cache = SolutionCache(scheduler.db)
+    assert not scheduler.restore_from_cache(cache, strategy='greedy')
+    assert scheduler.solve()
+    cache.put(scheduler.cache_key, scheduler)
+
+    course_ids, classroom_ids = all_ids(scheduler.db)
+    restored = ExamScheduler(scheduler.db, scheduler.exam_schedule['id'])
+    restored.prepare_data(course_ids, classroom_ids)
+    assert restored.restore_from_cache(cache, strategy='greedy')
+    assert restored.course_assignments.keys() == scheduler.course_assignments.keys()
+    assert hard_constraint_violations(restored) == []
+
+
+def test_least_recently_used_entries_are_evicted(scheduler):
+    cache = SolutionCache(scheduler.db, max_entries=2)
+    assert scheduler.solve()
+    for key in ('a', 'b', 'c'):
+        cache.put(key, scheduler)
+
+    keys = {row['cache_key'] for row in scheduler.db.fetch_all("SELECT cache_key FROM solution_cache")}
+    assert keys == {'b', 'c'}
+    orphans = scheduler.db.fetch_one(
+        "SELECT COUNT(*) AS n FROM solution_cache_courses WHERE cache_key NOT IN (SELECT cache_key FROM solution_cache)"
+    )
+    assert orphans['n'] == 0
+
+
+def test_enrollment_digest_distinguishes_equal_sums():
+    # Aynı öğrenci sayısı ve id toplamı, farklı kayıt kümeleri
+    assert enrollment_digest({1: frozenset({1, 4}), 2: frozenset({2, 3})}) != \
+        enrollment_digest({1: frozenset({2, 3}), 2: frozenset({1, 4})})
+    assert enrollment_digest({1: frozenset({3, 1, 2})}) == enrollment_digest({1: frozenset({1, 2, 3})})
@@ -0,0 +1,64 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from src.core.scheduler import DAY_END_TIME, DAY_START_TIME, TIME_QUANTUM_MINUTES, ExamScheduler
+from tests.conftest import all_ids, hard_constraint_violations
+
+DURATIONS = (40, 75, 120, 180)
+
+
+def prepared(db, schedule_id, **prepare_options) -> ExamScheduler:
+    course_ids, classroom_ids = all_ids(db)
+    scheduler = ExamScheduler(db, schedule_id)
+    scheduler.prepare_data(course_ids, classroom_ids, **prepare_options)
+    return scheduler
+
+
+def test_days_are_split_into_quanta(scheduler):
+    per_day = defaultdict(list)
+    for slot_datetime, slot_idx in scheduler.time_slots:
+        assert scheduler.slot_to_date[slot_idx] == slot_datetime.date()
+        per_day[slot_datetime.date()].append(slot_datetime)
+
+    day_minutes = (DAY_END_TIME.hour - DAY_START_TIME.hour) * 60 + DAY_END_TIME.minute - DAY_START_TIME.minute
+    for day, starts in per_day.items():
+        first = datetime.combine(day, DAY_START_TIME)
+        assert starts == [first + timedelta(minutes=TIME_QUANTUM_MINUTES * i)
+                          for i in range(day_minutes // TIME_QUANTUM_MINUTES)]
+
+
+def test_long_exam_only_starts_where_it_ends_by_the_day_end(university):
+    db, schedule_id = university
+    course_ids, _ = all_ids(db)
+    # 11 saat 30 dakika: 09:00, 09:15 ve 09:30'da başlayabilir
+    scheduler = prepared(db, schedule_id, course_durations={course_ids[0]: 690})
+    start_mask = scheduler._course_start_mask(course_ids[0])
+
+    starts = {scheduler.time_slots[slot_idx][0].time()
+              for _, slot_idx in scheduler.time_slots if (start_mask >> slot_idx) & 1}
+    assert starts == {time(9, 0), time(9, 15), time(9, 30)}
+
+
+def test_mixed_durations_pack_into_shared_rooms(university):
+    db, schedule_id = university
+    course_ids, _ = all_ids(db)
+    durations = {course_id: DURATIONS[i % len(DURATIONS)] for i, course_id in enumerate(course_ids)}
+    scheduler = prepared(db, schedule_id, course_durations=durations)
+    break_minutes = scheduler.exam_schedule['default_break_duration']
+
+    assert scheduler.solve(strategy='greedy')
+    assert hard_constraint_violations(scheduler) == []
+
+    room_days = defaultdict(set)
+    for course_id, assignment in scheduler.course_assignments.items():
+        minutes = durations[course_id]
+        assert scheduler.course_quanta[course_id] == -(-(minutes + break_minutes) // TIME_QUANTUM_MINUTES)
+        start = assignment['datetime']
+        assert start.minute % TIME_QUANTUM_MINUTES == 0
+        assert DAY_START_TIME <= start.time()
+        assert start + timedelta(minutes=minutes) <= datetime.combine(start.date(), DAY_END_TIME)
+        for classroom_id in assignment['classroom_ids']:
+            room_days[(classroom_id, start.date())].add(minutes)
+
+    # Farklı uzunluktaki sınavlar aynı gün aynı dersliği sırayla kullanır
+    assert any(len(lengths) > 1 for lengths in room_days.values())